@@ -6,75 +6,177 @@ Cocos Creator 逆向工程工具主入口
 import os
 import sys
 import click
-from rich.console import Console
-from rich.theme import Theme
 
-# 添加src目录到Python路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+# 添加项目根目录到Python路径（以脚本方式运行时）
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
 
-# 导入核心模块
-from core.reverseEngine import reverseProject
+def splitList(ctx, param, value):
+    """把逗号分隔的选项值拆分为列表"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
 
-# 自定义主题
-custom_theme = Theme({
-    "info": "cyan",
-    "error": "bold red",
-    "success": "bold green",
-    "warn": "yellow",
-    "debug": "magenta"
-})
-
-console = Console(theme=custom_theme)
-
-def logger():
-    """日志工具"""
-    return {
-        "info": console.print,
-        "error": lambda x: console.print(f"[error]{x}[/error]"),
-        "success": lambda x: console.print(f"[success]{x}[/success]"),
-        "warn": lambda x: console.print(f"[warn]{x}[/warn]"),
-        "debug": lambda x: console.print(f"[debug]{x}[/debug]")
-    }
-
-@click.command()
+@click.group(invoke_without_command=True)
 @click.version_option("1.0.0")
 @click.option("-p", "--path", type=click.Path(exists=True), help="源项目路径")
 @click.option("-o", "--output", type=str, default="./output", help="输出路径")
 @click.option("-v", "--verbose", is_flag=True, default=False, help="显示详细日志")
 @click.option("-s", "--silent", is_flag=True, default=False, help="静默模式，不显示进度")
 @click.option("--version-hint", type=str, default="", help="提示Cocos Creator版本 (2.3.x|2.4.x)")
-def cli(path, output, verbose, silent, version_hint):
+@click.option("--output-format", type=click.Choice(["dir", "zip", "tar", "tar.gz", "tar.zst"]), default="dir", help="输出格式，归档格式直接流式写入单个文件")
+@click.option("--keep-temp", is_flag=True, default=False, help="保留临时文件")
+@click.option("--log-file", type=click.Path(dir_okay=False), default=None, help="同时将日志以 JSON Lines 格式写入文件")
+@click.option("--metrics-file", type=click.Path(dir_okay=False), default=None, help="定期导出运行指标（.json 结尾为 JSON 快照，否则为 Prometheus 文本格式）")
+@click.option("--memory-profile", is_flag=True, default=False, help="记录各阶段的峰值内存和主要分配位置")
+@click.option("--memory-budget", type=str, default=None, help="内存预算（如 2G，含子进程），接近时切换到低内存策略，达到 90% 时中止并输出报告")
+@click.option("--watch", is_flag=True, default=False, help="处理完成后监视源项目，只增量处理变化的文件")
+@click.option("--analyze-only", is_flag=True, default=False, help="只分析项目（版本、类列表、资源统计），写入 JSON 报告，不复制任何资源")
+@click.option("--include", multiple=True, help="只处理匹配的资源（通配符，可多次指定；含 / 时匹配相对资源目录的路径，否则匹配文件名）")
+@click.option("--exclude", multiple=True, help="排除匹配的资源（通配符，可多次指定）")
+@click.option("--types", callback=splitList, default=None, help="只处理这些类别的资源，逗号分隔 (texture,audio,animation,font,data,script,other)")
+@click.option("--stages", callback=splitList, default=None, help="只执行这些阶段，逗号分隔 (scripts,resources,atlases,sprites,project)")
+@click.pass_context
+def cli(ctx, path, output, verbose, silent, version_hint, output_format, keep_temp, log_file, metrics_file, memory_profile, memory_budget, watch, analyze_only, include, exclude, types, stages):
     """Cocos Creator 逆向工程工具"""
+    if ctx.invoked_subcommand is not None:
+        return
+    
+    from src.utils.logger import logger
+    logger().configure(verbose, silent, log_file)
     
     # 获取源路径
     source_path = path or os.environ.get("CC_SOURCE_PATH")
     if not source_path:
-        logger()["error"]("错误: 未指定源路径，请通过命令行参数 --path 或环境变量 CC_SOURCE_PATH 指定")
-        logger()["info"]("用法: python -m reverse.main --path <源项目路径>")
+        logger().error("错误: 未指定源路径，请通过命令行参数 --path 或环境变量 CC_SOURCE_PATH 指定")
+        logger().info("用法: cc-reverse --path <源项目路径>")
+        logger().flush()
         sys.exit(1)
     
     # 设置输出目录：不指定时默认使用本工程的output目录
     if output == "./output":
-        # 获取本工程的目录（当前文件是 reverse/main.py，所以需要向上两级）
-        project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        output = os.path.join(project_dir, "output")
+        output = os.path.join(PROJECT_DIR, "output")
     
     # 开始逆向工程过程
     try:
-        logger()["info"]("开始处理项目...")
+        logger().info("开始处理项目...")
         
-        # 调用核心逆向工程函数
-        reverseProject({
+        options = {
             "sourcePath": os.path.abspath(source_path),
             "outputPath": os.path.abspath(output),
             "verbose": verbose,
             "silent": silent,
-            "versionHint": version_hint
-        })
+            "versionHint": version_hint,
+            "outputFormat": output_format,
+            "keepTemp": keep_temp,
+            "logFile": log_file,
+            "metricsFile": metrics_file,
+            "memoryProfile": memory_profile,
+            "memoryBudget": memory_budget,
+            "include": list(include),
+            "exclude": list(exclude),
+            "types": types,
+            "stages": stages
+        }
+        if analyze_only:
+            from src.core.reverseEngine import analyzeProject
+            analyzeProject(options)
+            logger().flush()
+            return
+        if watch:
+            from src.core.watcher import ProjectWatcher
+            ProjectWatcher(options).run()
+            return
+        
+        # 导入核心逆向工程模块（放在这里，--help 和 --version 不需要加载）
+        from src.core.reverseEngine import reverseProject
+        reverseProject(options)
         
-        logger()["success"]("逆向工程完成！")
+        logger().success("逆向工程完成！")
+        logger().flush()
     except Exception as e:
-        logger()["error"](f"处理过程中出错: {e}")
+        logger().error(f"处理过程中出错: {e}")
+        logger().flush()
+        sys.exit(1)
+
+@cli.command()
+@click.option("--host", type=str, default=None, help="监听地址（默认 127.0.0.1）")
+@click.option("--port", type=int, default=None, help="端口（默认 8765）")
+@click.option("--workers", type=click.IntRange(min=1), default=None, help="工作进程数，即同时运行的任务数（默认 2）")
+@click.option("-v", "--verbose", is_flag=True, default=False, help="显示详细日志")
+def serve(host, port, workers, verbose):
+    """启动后台服务，接收逆向任务并在任务之间保留缓存"""
+    from src.utils.logger import logger
+    from src.core.server import serve as runServer
+    logger().configure(verbose=verbose)
+    try:
+        runServer(host, port, workers)
+    except OSError as e:
+        logger().error(f"启动服务失败: {e}")
+        logger().flush()
+        sys.exit(1)
+
+@cli.command()
+@click.option("-p", "--path", type=click.Path(exists=True, file_okay=False), required=True, help="源项目路径")
+@click.option("-o", "--output", type=str, required=True, help="输出路径")
+@click.option("-v", "--verbose", is_flag=True, default=False, help="服务端显示详细日志")
+@click.option("--version-hint", type=str, default="", help="提示Cocos Creator版本 (2.3.x|2.4.x)")
+@click.option("--output-format", type=click.Choice(["dir", "zip", "tar", "tar.gz", "tar.zst"]), default="dir", help="输出格式")
+@click.option("--keep-temp", is_flag=True, default=False, help="保留临时文件")
+@click.option("--memory-budget", type=str, default=None, help="内存预算（如 2G）")
+@click.option("--host", type=str, default=None, help="服务地址（默认 127.0.0.1）")
+@click.option("--port", type=int, default=None, help="服务端口（默认 8765）")
+@click.option("--detach", is_flag=True, default=False, help="提交后立即返回，不等待任务结束")
+@click.option("--include", multiple=True, help="只处理匹配的资源（通配符，可多次指定）")
+@click.option("--exclude", multiple=True, help="排除匹配的资源（通配符，可多次指定）")
+@click.option("--types", callback=splitList, default=None, help="只处理这些类别的资源，逗号分隔")
+@click.option("--stages", callback=splitList, default=None, help="只执行这些阶段，逗号分隔")
+def submit(path, output, verbose, version_hint, output_format, keep_temp, memory_budget, host, port, detach, include, exclude, types, stages):
+    """向后台服务提交任务并输出进度"""
+    from src.utils.logger import logger
+    from src.core.server import submitJob, ServerError
+    logger().configure()
+    
+    def onEvent(event):
+        if event["type"] == "progress":
+            logger().info(f"[{event['elapsed']:.1f}s] {event['stage']}  资源 {event['resources']}  写入 {event['files']} 个文件")
+        elif event["type"] == "cancelling":
+            logger().warn("正在取消任务...")
+    
+    try:
+        job = submitJob({
+            "sourcePath": os.path.abspath(path),
+            "outputPath": os.path.abspath(output),
+            "verbose": verbose,
+            "versionHint": version_hint,
+            "outputFormat": output_format,
+            "keepTemp": keep_temp,
+            "memoryBudget": memory_budget,
+            "include": list(include),
+            "exclude": list(exclude),
+            "types": types,
+            "stages": stages
+        }, host=host, port=port, follow=not detach, onEvent=onEvent)
+    except ServerError as e:
+        logger().error(f"提交任务失败: {e}")
+        logger().flush()
+        sys.exit(1)
+    except KeyboardInterrupt:
+        logger().warn("已中断，服务端任务已取消")
+        logger().flush()
+        sys.exit(130)
+    
+    if job["status"] == "done":
+        logger().success(f"任务 {job['id']} 已完成！")
+    elif job["status"] == "failed":
+        logger().error(f"任务 {job['id']} 失败: {job['error']}")
+    elif job["status"] == "cancelled":
+        logger().warn(f"任务 {job['id']} 已取消")
+    else:
+        logger().info(f"任务 {job['id']} 已提交")
+    logger().flush()
+    if job["status"] in ("failed", "cancelled"):
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+UUID 批量解码基准测试
+
+对比 UuidUtils.decodeUuid / compressUuid 的逐个调用与 decodeMany / compressMany
+的批量调用，并校验两者结果完全一致。
+
+用法: python scripts/bench_uuid.py [数量]
+"""
+
+import os
+import sys
+import time
+import random
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.uuidUtils import uuidUtils
+
+
+def bench(label, func):
+    """
+    执行并计时
+
+    Args:
+        label (str): 名称
+        func (callable): 待执行的函数
+
+    Returns:
+        any: 函数返回值
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<24} {elapsed * 1000:10.1f} ms')
+    return result
+
+
+def main():
+    """
+    基准测试入口
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    random.seed(0)
+    canonical = [str(uuid.UUID(int=random.getrandbits(128))) for _ in range(count)]
+
+    print(f'UUID 数量: {count}')
+    compressed_scalar = bench('compressUuid (逐个)', lambda: [uuidUtils.compressUuid(u) for u in canonical])
+    compressed_batch = bench('compressMany (批量)', lambda: uuidUtils.compressMany(canonical))
+    decoded_scalar = bench('decodeUuid (逐个)', lambda: [uuidUtils.decodeUuid(u) for u in compressed_batch])
+    decoded_batch = bench('decodeMany (批量)', lambda: uuidUtils.decodeMany(compressed_batch))
+
+    assert compressed_scalar == compressed_batch, 'compressMany 与 compressUuid 结果不一致'
+    assert decoded_scalar == decoded_batch, 'decodeMany 与 decodeUuid 结果不一致'
+    assert decoded_batch == canonical, '解码结果与原始 UUID 不一致'
+    print('结果一致')
+
+
+if __name__ == '__main__':
+    main()
@@ -87,7 +87,7 @@ def build():
         # 2. 复制源文件
         console.print("[info]复制源文件...[/info]")
         copy_dir(os.path.join(os.path.dirname(__file__), '../src'), os.path.join(BUILD_DIR, 'src'))
-        copy_dir(os.path.join(os.path.dirname(__file__), '../cc_reverse'), os.path.join(BUILD_DIR, 'cc_reverse'))
+        copy_dir(os.path.join(os.path.dirname(__file__), '../reverse'), os.path.join(BUILD_DIR, 'reverse'))
         copy_dir(os.path.join(os.path.dirname(__file__), '../bin'), os.path.join(BUILD_DIR, 'bin'))
         
         # 3. 复制配置文件
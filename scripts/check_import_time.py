@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+启动耗时检查
+
+在新的解释器中用 -X importtime 导入命令行入口和核心引擎，检查：
+1. 导入耗时不超过预算（取多次运行的最小值，减少抖动）
+2. 重量级依赖（esprima、PIL、filetype、tqdm、rich）没有在导入时被加载，
+   命令行入口也没有加载核心引擎
+
+超出预算或加载了不该加载的模块时以非零状态退出，可以直接放进构建流程。
+
+用法: python scripts/check_import_time.py [预算毫秒数] [运行次数]
+"""
+
+import os
+import re
+import sys
+import subprocess
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# 默认预算（毫秒）
+DEFAULT_BUDGET_MS = 100
+
+# 默认运行次数
+DEFAULT_RUNS = 5
+
+# 检查项：(导入的模块, 不应被加载的模块)
+CHECKS = [
+    ('reverse.main', ('src.core.reverseEngine', 'src.core.server', 'esprima', 'PIL', 'filetype', 'tqdm', 'rich')),
+    ('src.core.reverseEngine', ('esprima', 'PIL', 'filetype', 'tqdm', 'rich')),
+]
+
+IMPORT_TIME_RE = re.compile(r'^import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def measure(module):
+    """
+    在新的解释器中导入模块
+
+    Args:
+        module (str): 模块名
+
+    Returns:
+        tuple: (导入耗时毫秒数, 已加载的模块名集合)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    elapsed = 0.0
+    loaded = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        if not match:
+            continue
+        loaded.add(match.group(3))
+        if match.group(3) == module and not match.group(2):
+            elapsed = int(match.group(1)) / 1000
+    return elapsed, loaded
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RUNS
+
+    failed = False
+    for module, forbidden in CHECKS:
+        samples = [measure(module) for _ in range(runs)]
+        elapsed = min(sample[0] for sample in samples)
+        loaded = samples[0][1]
+
+        status = 'OK' if elapsed <= budget else 'FAIL'
+        print(f'{module:<28} {elapsed:8.1f} ms  (预算 {budget:.0f} ms)  {status}')
+        if elapsed > budget:
+            failed = True
+
+        unexpected = sorted(name for name in forbidden if name in loaded)
+        if unexpected:
+            print(f'  导入时加载了: {", ".join(unexpected)}')
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,7 +23,7 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.7",
+    python_requires=">=3.9",
     install_requires=[
         "colorama",
         "rich",
@@ -32,6 +32,9 @@ setup(
         "pillow",
         "click",
     ],
+    extras_require={
+        "zstd": ["zstandard"],
+    },
     entry_points={
         "console_scripts": [
             "cc-reverse=reverse.main:cli",
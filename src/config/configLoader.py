@@ -30,8 +30,16 @@ def loadConfig():
             "extractTextures": True,
             "extractAudio": True,
             "extractAnimations": True,
-            "optimizeSprites": False
-        }
+            "extractSpriteFrames": True,
+            "optimizeSprites": False,
+            # 资源过滤：通配符列表，含 / 时匹配相对资源目录的路径，否则匹配文件名
+            "include": [],
+            "exclude": [],
+            # 只处理这些类别的资源（texture、audio、animation、font、data、script、other），为空时处理全部
+            "types": []
+        },
+        # 执行的阶段（scripts、resources、atlases、sprites、project）
+        "stages": ["scripts", "resources", "atlases", "sprites", "project"]
     }
     
     # 检查项目根目录的配置文件
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+异步接口
+
+在 asyncio 程序中调用逆向流程。引擎使用模块级状态，同一进程同时只能运行一个任务，所以任务在进程池中
+执行；进程的启动、停止等阻塞操作放在默认线程池中，事件循环只负责分发进度事件，并发任务较多时也不会被阻塞。
+
+用法:
+    async with AsyncReverser(workers=4) as reverser:
+        job = await reverser.submit({'sourcePath': '...', 'outputPath': '...'})
+        async for event in job.events():
+            print(event['type'], event.get('stage'))
+        result = await job.result()
+
+    # 单个任务
+    result = await reverseProjectAsync({'sourcePath': '...', 'outputPath': '...'})
+
+任务结果见 reverseEngine.getResult；取消任务（job.cancel() 或取消等待 job.result() 的协程）时，
+工作进程在下一个检查点停止，job.result() 抛出 ReverseCancelledError。
+"""
+
+import os
+import uuid
+import asyncio
+import threading
+from src.core.server import (
+    runJob, ignoreInterrupt, JOB_OPTIONS, DEFAULT_WORKERS,
+    QUEUED, RUNNING, CANCELLING, DONE, FAILED, CANCELLED, FINISHED_STATES
+)
+
+
+class AsyncJob:
+    """异步任务类，属性只在事件循环线程中修改"""
+
+    def __init__(self, job_id, options):
+        """
+        初始化
+
+        Args:
+            job_id (str): 任务ID
+            options (dict): reverseProject 选项
+        """
+        self.id = job_id
+        self.options = options
+        self.status = QUEUED
+        self.stage = ''
+        self.error = None
+        self.future = None
+        self.cancel_event = None
+        self._history = []
+        self._changed = asyncio.Event()
+        self._result = asyncio.get_running_loop().create_future()
+
+    def cancel(self):
+        """
+        请求取消任务：排队中的任务直接取消，运行中的任务在下一个检查点停止
+        """
+        if self.status in FINISHED_STATES or self.future is None:
+            return
+        self.cancel_event.set()
+        if not self.future.cancel() and self.status != CANCELLING:
+            self.status = CANCELLING
+            self._deliver('cancelling', {})
+
+    async def events(self):
+        """
+        进度事件流，从第一个事件开始，到 finished 事件结束
+
+        Yields:
+            dict: 事件（type 为 started、progress、cancelling 或 finished）
+        """
+        index = 0
+        while True:
+            while index < len(self._history):
+                event = self._history[index]
+                index += 1
+                yield event
+                if event['type'] == 'finished':
+                    return
+            await self._changed.wait()
+
+    async def result(self):
+        """
+        等待任务结束
+
+        Returns:
+            dict: 运行结果（见 reverseEngine.getResult）
+
+        Raises:
+            ReverseCancelledError: 任务已取消
+        """
+        try:
+            return await asyncio.shield(self._result)
+        except asyncio.CancelledError:
+            # 等待方被取消时同时取消任务
+            self.cancel()
+            raise
+
+    def _deliver(self, kind, data):
+        """
+        记录一个事件并唤醒等待的事件流（在事件循环线程中调用）
+
+        Args:
+            kind (str): 事件类型
+            data (dict): 事件数据
+        """
+        if kind == 'started' and self.status == QUEUED:
+            self.status = RUNNING
+        elif kind == 'progress':
+            self.stage = data.get('stage', self.stage)
+        elif kind == 'finished':
+            self.status = data['status']
+            self.error = data['error']
+            self._settle()
+
+        self._history.append(dict(data, seq=len(self._history), type=kind))
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _settle(self):
+        """
+        根据进程池中的 Future 设置任务结果
+        """
+        from src.core.reverseEngine import ReverseCancelledError
+
+        if self._result.done():
+            return
+        if self.future.cancelled():
+            self._result.set_exception(ReverseCancelledError('任务已取消'))
+        elif self.future.exception() is not None:
+            self._result.set_exception(self.future.exception())
+        else:
+            self._result.set_result(self.future.result())
+        # 没有调用方等待结果时不提示未获取的异常
+        self._result.exception()
+
+
+class AsyncReverser:
+    """异步任务执行器类"""
+
+    def __init__(self, workers=None):
+        """
+        初始化
+
+        Args:
+            workers (int): 工作进程数，即同时运行的任务数
+        """
+        self.workers = workers or DEFAULT_WORKERS
+        self.jobs = {}
+        self._loop = None
+        self._manager = None
+        self._events = None
+        self._pool = None
+        self._pump = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    async def start(self):
+        """
+        启动进程池和事件分发线程
+        """
+        self._loop = asyncio.get_running_loop()
+        await self._loop.run_in_executor(None, self._startSync)
+
+    async def close(self):
+        """
+        取消未结束的任务，等待工作进程退出
+        """
+        for job in self.jobs.values():
+            job.cancel()
+        if self._loop is not None:
+            await self._loop.run_in_executor(None, self._closeSync)
+
+    async def submit(self, options):
+        """
+        提交任务
+
+        Args:
+            options (dict): 任务选项，必须包含 sourcePath 和 outputPath
+
+        Returns:
+            AsyncJob: 任务
+
+        Raises:
+            ValueError: 选项无效或输出路径正被其他任务使用
+        """
+        source_path = options.get('sourcePath')
+        output_path = options.get('outputPath')
+        if not source_path or not output_path:
+            raise ValueError('必须指定 sourcePath 和 outputPath')
+        if not os.path.isdir(source_path):
+            raise ValueError(f'源路径不存在: {source_path}')
+
+        job_options = {key: options[key] for key in JOB_OPTIONS if key in options}
+        job_options['sourcePath'] = os.path.abspath(source_path)
+        job_options['outputPath'] = os.path.abspath(output_path)
+        # 进度通过事件流返回，工作进程中不显示进度行
+        job_options.setdefault('silent', True)
+
+        # 已结束的任务由调用方持有，不再需要分发事件
+        self.jobs = {job_id: job for job_id, job in self.jobs.items() if job.status not in FINISHED_STATES}
+        for other in self.jobs.values():
+            if other.options['outputPath'] == job_options['outputPath']:
+                raise ValueError(f'输出路径正被任务 {other.id} 使用: {output_path}')
+
+        job = AsyncJob(uuid.uuid4().hex[:12], job_options)
+        self.jobs[job.id] = job
+        # 创建取消标记和提交任务都需要与其他进程通信，放到线程池中
+        try:
+            await self._loop.run_in_executor(None, self._submitSync, job)
+        except BaseException:
+            del self.jobs[job.id]
+            raise
+        return job
+
+    def _startSync(self):
+        """
+        启动共享的事件队列、进程池和事件分发线程（在线程池中调用）
+        """
+        from multiprocessing.managers import SyncManager
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._manager = SyncManager()
+        self._manager.start(ignoreInterrupt)
+        self._events = self._manager.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=ignoreInterrupt)
+        self._pump = threading.Thread(target=self._pumpEvents, name='cc-reverse-async-events', daemon=True)
+        self._pump.start()
+
+    def _closeSync(self):
+        """
+        停止进程池、事件分发线程和共享队列（在线程池中调用）
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._events is not None:
+            self._events.put(None)
+            self._pump.join()
+            self._events = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def _submitSync(self, job):
+        """
+        把任务提交到进程池（在线程池中调用）
+
+        Args:
+            job (AsyncJob): 任务
+        """
+        job.cancel_event = self._manager.Event()
+        job.future = self._pool.submit(runJob, job.id, job.options, self._events, job.cancel_event)
+        job.future.add_done_callback(lambda future, job=job: self._onJobDone(job, future))
+
+    def _onJobDone(self, job, future):
+        """
+        进程池中的任务结束时调用；结束事件放入同一个事件队列，保证排在工作进程的进度事件之后
+
+        Args:
+            job (AsyncJob): 任务
+            future (Future): 任务的 Future
+        """
+        from src.core.reverseEngine import ReverseCancelledError
+
+        if future.cancelled() or isinstance(future.exception(), ReverseCancelledError):
+            status, error = CANCELLED, None
+        elif future.exception() is None:
+            status, error = DONE, None
+        else:
+            status, error = FAILED, str(future.exception())
+
+        events = self._events
+        if events is not None:
+            try:
+                events.put((job.id, 'finished', {'status': status, 'error': error}))
+                return
+            except Exception:
+                pass
+        self._dispatch(job.id, 'finished', {'status': status, 'error': error})
+
+    def _pumpEvents(self):
+        """
+        后台线程：把工作进程发来的事件转交给事件循环
+        """
+        events = self._events
+        while True:
+            try:
+                item = events.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            self._dispatch(*item)
+
+    def _dispatch(self, job_id, kind, data):
+        """
+        在事件循环线程中把事件交给对应的任务
+
+        Args:
+            job_id (str): 任务ID
+            kind (str): 事件类型
+            data (dict): 事件数据
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(job._deliver, kind, data)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+
+async def reverseProjectAsync(options, onProgress=None, workers=1):
+    """
+    异步运行一个逆向任务
+
+    Args:
+        options (dict): 与 reverseProject 相同的配置选项（回调除外）
+        onProgress (callable): 每个进度事件调用 onProgress(事件)，可以是协程函数（可选）
+        workers (int): 工作进程数
+
+    Returns:
+        dict: 运行结果（见 reverseEngine.getResult）
+
+    Raises:
+        ReverseCancelledError: 任务已取消
+    """
+    async with AsyncReverser(workers=workers) as reverser:
+        job = await reverser.submit(options)
+        if onProgress is not None:
+            async for event in job.events():
+                outcome = onProgress(event)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+        return await job.result()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+资源包处理器
+
+Cocos Creator 2.4.x 把资源拆分为多个资源包（assets/<包名>/），每个包含 config*.json（路径、UUID、类型表）、
+import/（序列化数据）、native/（原生资源）和 index*.js（包内脚本）。
+
+解析各包的配置得到包内 UUID -> (资源路径, 类型) 的映射；资源处理器据此把原生资源还原到包内的原始路径
+（assets/<包名>/<路径><扩展名>），并沿用原始 UUID 生成meta。资源较多时各包的资源划分为工作单元在进程池中
+并发处理，各包的结果合并到同一个输出项目中。
+"""
+
+import os
+import json
+import fnmatch
+
+# 资源包配置文件
+CONFIG_PATTERN = 'config*.json'
+
+# 资源包脚本
+SCRIPT_PATTERN = 'index*.js'
+
+# 原生资源目录
+NATIVE_DIR = 'native'
+
+# 资源包中的资源少于该数量时不启动进程池（进程启动和结果传输的开销超过并行收益）
+MIN_PARALLEL_FILES = 2000
+
+# 每个进程平均分到的工作单元数：单元较小时本进程可以边计算边写入，取消时未开始的单元直接丢弃
+UNITS_PER_WORKER = 4
+
+
+class BundleProcessor:
+    """资源包处理器类"""
+
+    def __init__(self):
+        """初始化"""
+        self.bundles = []
+        self.asset_path = None
+        self._by_dir = {}
+        # 输出相对路径 -> 占用它的构建中路径
+        self._targets = {}
+
+    def reset(self):
+        """
+        清空上一次运行发现的资源包
+        """
+        self.bundles = []
+        self.asset_path = None
+        self._by_dir = {}
+        self._targets = {}
+
+    def findBundles(self, asset_path):
+        """
+        查找资源目录下的资源包（含 config*.json 的子目录），只列目录，不读取文件
+
+        Args:
+            asset_path (str): 资源目录
+
+        Returns:
+            list: 资源包列表，每项包含 name、path、config、script（可能为None）
+        """
+        from src.utils.fileInventory import FileInventory
+        from src.core.reverseEngine import global_inventory
+
+        inventory = global_inventory
+        rel_dir = inventory.relativeTo(asset_path) if inventory is not None else None
+        if rel_dir is None:
+            inventory = FileInventory(asset_path)
+            rel_dir = ''
+        prefix = rel_dir.replace(os.sep, '/') + '/' if rel_dir else ''
+
+        bundles = []
+        for entry in sorted(inventory.listDir(rel_dir), key=lambda entry: entry.name):
+            if not entry.is_dir:
+                continue
+            configs = inventory.glob(f'{prefix}{entry.name}/{CONFIG_PATTERN}')
+            if not configs:
+                continue
+            scripts = inventory.glob(f'{prefix}{entry.name}/{SCRIPT_PATTERN}')
+            bundles.append({
+                'name': entry.name,
+                'path': entry.path,
+                'config': sorted(configs)[0],
+                'script': sorted(scripts)[0] if scripts else None
+            })
+        return bundles
+
+    def loadBundles(self, asset_path):
+        """
+        查找并解析全部资源包（配置解析很快，放到进程池中反而会被结果传输拖慢）
+
+        Args:
+            asset_path (str): 资源目录
+
+        Returns:
+            list: 资源包列表，在 findBundles 的基础上增加 assets、scenes、types
+        """
+        from src.utils.logger import logger
+
+        self.reset()
+        self.asset_path = asset_path
+        bundles = self.findBundles(asset_path)
+        if not bundles:
+            return []
+
+        logger().info(f'解析资源包配置，共 {len(bundles)} 个: {", ".join(bundle["name"] for bundle in bundles)}')
+        for bundle in bundles:
+            bundle.update(self.parseConfig(bundle['config']))
+            self._by_dir[bundle['name']] = bundle
+            logger().debug(f'资源包 {bundle["name"]}: {len(bundle["assets"])} 个资源，{len(bundle["scenes"])} 个场景')
+        self.bundles = bundles
+        return bundles
+
+    def parseConfig(self, config_path):
+        """
+        解析资源包配置，建立包内 UUID 到资源路径的映射（子资源没有独立文件，不计入）
+
+        Args:
+            config_path (str): 配置文件路径
+
+        Returns:
+            dict: assets（UUID -> (资源路径, 类型)）、scenes（场景URL列表）、types（类型 -> 资源数）
+        """
+        from src.utils.logger import logger
+        from src.utils.uuidUtils import uuidUtils
+
+        try:
+            with open(config_path, 'rb') as f:
+                config = json.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger().error(f'解析资源包配置 {config_path} 失败: {e}')
+            return {'assets': {}, 'scenes': [], 'types': {}}
+
+        uuids = uuidUtils.decodeMany([str(item).split('@', 1)[0] for item in config.get('uuids', [])])
+        types = config.get('types', [])
+        assets = {}
+        type_counts = {}
+        for index, info in (config.get('paths') or {}).items():
+            if not isinstance(info, list) or not info:
+                continue
+            # [路径, 类型序号, 是否为子资源]
+            if len(info) > 2 and info[2]:
+                continue
+            try:
+                uuid_str = uuids[int(index)]
+            except (ValueError, IndexError):
+                continue
+            asset_type = types[info[1]] if len(info) > 1 and isinstance(info[1], int) and info[1] < len(types) else ''
+            assets[uuid_str.lower()] = (info[0], asset_type)
+            type_counts[asset_type] = type_counts.get(asset_type, 0) + 1
+
+        return {'assets': assets, 'scenes': sorted(config.get('scenes') or {}), 'types': type_counts}
+
+    def resolveResource(self, rel_path):
+        """
+        计算资源在输出项目中的相对路径：资源包中的原生资源还原到包内的原始路径，其他资源保持构建中的路径
+
+        Args:
+            rel_path (str): 资源相对于资源目录的路径
+
+        Returns:
+            tuple: (输出相对路径, 原始UUID或None)
+        """
+        parts = rel_path.split(os.sep)
+        bundle = self._by_dir.get(parts[0]) if len(parts) > 2 else None
+        if bundle is None or parts[1] != NATIVE_DIR:
+            return rel_path, None
+
+        # 原生资源以 UUID 命名，2.4.x 中可能带有 md5 后缀
+        name = parts[-1]
+        uuid_str = name.split('.', 1)[0].lower()
+        asset = bundle['assets'].get(uuid_str)
+        if asset is None:
+            return rel_path, None
+
+        target = os.path.join(parts[0], *asset[0].split('/')) + os.path.splitext(name)[1]
+        # 同一路径已被其他资源占用时保留构建中的路径
+        if self._targets.setdefault(target, rel_path) != rel_path:
+            return rel_path, uuid_str
+        return target, uuid_str
+
+    def planUnits(self, rel_paths, workers):
+        """
+        把资源包中的资源划分为进程池工作单元：每个单元只包含同一个资源包的资源，
+        较大的资源包再按 总数/(进程数*UNITS_PER_WORKER) 切分，使各进程的负载大致均衡
+
+        Args:
+            rel_paths (list): 资源相对于资源目录的路径
+            workers (int): 进程数
+
+        Returns:
+            list: 工作单元列表，每个单元是 rel_paths 中的下标列表；资源太少或只有一个进程时为空列表
+        """
+        groups = {}
+        for index, rel_path in enumerate(rel_paths):
+            name = rel_path.split(os.sep, 1)[0]
+            if name in self._by_dir and os.sep in rel_path:
+                groups.setdefault(name, []).append(index)
+
+        total = sum(len(indices) for indices in groups.values())
+        if workers < 2 or total < MIN_PARALLEL_FILES:
+            return []
+
+        unit_size = -(-total // (workers * UNITS_PER_WORKER))
+        return [
+            indices[start:start + unit_size]
+            for indices in groups.values()
+            for start in range(0, len(indices), unit_size)
+        ]
+
+    def isConfig(self, path):
+        """
+        检查文件是否为资源包的配置文件（包括新增的资源包）
+
+        Args:
+            path (str): 文件路径
+
+        Returns:
+            bool: 是配置文件返回True
+        """
+        if self.asset_path is None:
+            return False
+        bundle_dir, name = os.path.split(os.path.normpath(path))
+        return (os.path.dirname(bundle_dir) == os.path.normpath(self.asset_path)
+                and fnmatch.fnmatch(name, CONFIG_PATTERN))
+
+    def getScripts(self):
+        """
+        获取资源包的脚本文件
+
+        Returns:
+            list: index*.js 路径列表
+        """
+        return [bundle['script'] for bundle in self.bundles if bundle.get('script')]
+
+    def getSummary(self):
+        """
+        获取资源包概况（用于分析报告）
+
+        Returns:
+            list: 每个资源包的名称、资源数、场景和类型统计
+        """
+        return [
+            {
+                'name': bundle['name'],
+                'config': bundle['config'],
+                'script': bundle['script'],
+                'assets': len(bundle['assets']),
+                'scenes': bundle['scenes'],
+                'types': bundle['types']
+            }
+            for bundle in self.bundles
+        ]
+
+
+# 创建全局实例
+bundleProcessor = BundleProcessor()
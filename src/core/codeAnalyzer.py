@@ -4,7 +4,8 @@
 """
 
 import os
-import esprima
+import time
+from src.utils.metrics import metrics
 
 class CodeAnalyzer:
     """代码分析器类"""
@@ -17,27 +18,51 @@ class CodeAnalyzer:
             "components": [],
             "nodes": []
         }
+        self._current_file = None
+        self._scripts_analyzed = metrics.counter('scripts_analyzed_total', '已分析的脚本数')
+        self._source_bytes = metrics.counter('source_bytes_total', '已分析的脚本字符数')
+        self._classes_found = metrics.counter('classes_found_total', '检测到的cc.Class定义数')
+        self._parse_seconds = metrics.histogram('parse_seconds', '单个脚本的解析耗时', (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0))
     
-    def analyze(self, code):
+    def reset(self):
+        """
+        清空上一次运行的分析结果
+        """
+        self.analyzed_data = {
+            "scripts": [],
+            "resources": [],
+            "components": [],
+            "nodes": []
+        }
+    
+    def analyze(self, code, file_path=None):
         """
         分析代码
         
         Args:
             code (str): JavaScript代码
+            file_path (str): 代码所在的文件路径（可选，记录在检测到的组件中）
         """
+        import esprima
         from src.utils.logger import logger
+        from src.utils.memoryTracker import memoryTracker
         logger().debug("开始分析代码...")
         
+        self._scripts_analyzed.inc()
+        self._source_bytes.inc(len(code))
+        start = time.perf_counter()
         try:
-            # 使用esprima解析JavaScript代码
+            # 使用esprima解析JavaScript代码（低内存策略下不生成位置信息，AST 约小一半）
             ast = esprima.parseScript(code, {
-                "range": True,
-                "loc": True,
+                "range": not memoryTracker.low_memory,
+                "loc": not memoryTracker.low_memory,
                 "tolerant": True
             })
             
-            # 遍历AST提取cc.Class定义
-            self._traverseAST(ast.body)
+            # 遍历AST提取cc.Class定义（esprima 返回的节点不是 dict，先转换）
+            self._current_file = file_path
+            self._traverseAST(ast.toDict()["body"])
+            self._parse_seconds.observe(time.perf_counter() - start)
             
             scripts_count = len(self.analyzed_data["components"])
             logger().info(f"代码分析完成，检测到 {scripts_count} 个cc.Class定义")
@@ -93,13 +118,14 @@ class CodeAnalyzer:
         Args:
             class_data (dict): 类数据AST节点
         """
-        from src.utils.logger import logger
+        from src.utils.logger import logger, DEBUG
         
         if class_data.get("type") == "ObjectExpression":
             class_info = {
                 "name": "",
                 "extends": "",
-                "properties": {}
+                "properties": {},
+                "file": self._current_file
             }
             
             # 提取类的属性
@@ -135,8 +161,10 @@ class CodeAnalyzer:
                 else:
                     class_info["properties"][key_name] = self._extractPropertyValue(prop_value)
             
-            logger().info(f"找到cc.Class定义: {class_info['name']} 继承自 {class_info['extends']}")
+            if logger().isEnabledFor(DEBUG):
+                logger().debug(f"找到cc.Class定义: {class_info['name']} 继承自 {class_info['extends']}")
             self.analyzed_data["components"].append(class_info)
+            self._classes_found.inc()
     
     def _extractPropertyValue(self, value_node):
         """
@@ -196,38 +224,95 @@ class CodeAnalyzer:
         from src.utils.logger import logger
         from src.utils.fileManager import fileManager
         
+        from src.utils.memoryTracker import memoryTracker
+        from src.core.reverseEngine import checkCancelled
+        
         for file_path in file_paths:
+            checkCancelled()
+            memoryTracker.checkBudget()
             try:
                 logger().info(f"分析文件: {file_path}")
                 code = fileManager.readFile(file_path)
-                self.analyze(code)
+                self.analyze(code, file_path)
             except Exception as e:
                 logger().error(f"分析文件 {file_path} 失败: {e}")
     
-    def generateScripts(self, output_path):
+    def removeFiles(self, file_paths):
+        """
+        移除从指定文件中检测到的组件（文件变化后重新分析前调用）
+        
+        Args:
+            file_paths (list): 文件路径列表
+        
+        Returns:
+            list: 被移除的组件
+        """
+        files = set(file_paths)
+        components = self.analyzed_data["components"]
+        self.analyzed_data["components"] = [c for c in components if c.get("file") not in files]
+        return [c for c in components if c.get("file") in files]
+    
+    def removeScripts(self, output_path, components):
+        """
+        删除组件对应的脚本文件及其meta文件
+        
+        Args:
+            output_path (str): 输出目录路径
+            components (list): 组件列表
+        """
+        from src.core.reverseEngine import global_output
+        
+        scripts_dir = os.path.join(output_path, "assets", "scripts")
+        for component in components:
+            script_path = os.path.join(scripts_dir, component.get("name", "Unknown") + ".js")
+            global_output.removeFile(script_path)
+            global_output.removeFile(script_path + ".meta")
+    
+    def generateScripts(self, output_path, components=None):
         """
         生成脚本文件
         
         Args:
             output_path (str): 输出目录路径
+            components (list): 只生成这些组件的脚本（可选，默认全部）
         """
         from src.utils.logger import logger
-        from src.utils.fileManager import fileManager
+        from src.utils.workerPool import workerPool
+        from src.core.reverseEngine import global_output
         
         logger().info(f"生成脚本文件到: {output_path}")
         
         # 确保输出目录存在
         scripts_dir = os.path.join(output_path, "assets", "scripts")
-        os.makedirs(scripts_dir, exist_ok=True)
+        global_output.makedirs(scripts_dir)
         
-        # 生成每个组件的脚本文件
-        for component in self.analyzed_data["components"]:
+        # 生成每个组件的脚本文件，写入和meta生成在共享线程池中进行
+        tasks = []
+        for component in (self.analyzed_data["components"] if components is None else components):
             script_content = self._generateScriptContent(component)
             script_name = component.get("name", "Unknown") + ".js"
             script_path = os.path.join(scripts_dir, script_name)
-            
-            fileManager.writeFile(script_path, script_content)
-            logger().info(f"生成脚本: {script_path}")
+            tasks.append((script_path, "scripts/" + script_name, script_content))
+        
+        workerPool.map(self._writeScript, tasks)
+    
+    def _writeScript(self, script_path, rel_path, script_content):
+        """
+        写入单个脚本文件及其meta文件
+        
+        Args:
+            script_path (str): 脚本输出路径
+            rel_path (str): 脚本相对于assets目录的路径
+            script_content (str): 脚本内容
+        """
+        from src.utils.logger import logger, DEBUG
+        from src.core.reverseEngine import global_output
+        from src.core.projectGenerator import projectGenerator
+        
+        global_output.writeFile(script_path, script_content)
+        projectGenerator.generateMeta(script_path, rel_path)
+        if logger().isEnabledFor(DEBUG):
+            logger().debug(f"生成脚本: {script_path}")
     
     def _generateScriptContent(self, component):
         """
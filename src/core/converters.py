@@ -6,26 +6,122 @@
 import os
 import json
 import uuid
-import xml.etree.ElementTree as ET
-from PIL import Image
+from xml.sax.saxutils import escape
 from src.utils.logger import logger
 from src.utils.fileManager import fileManager
+from src.utils.imageProbe import imageProbe
+
+# plist 文档头
+PLIST_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<!DOCTYPE plist PUBLIC "-//Apple Computer//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">\n'
+)
+
+# 以 {x,y},{w,h} 字符串形式写入的键
+RECT_KEYS = ('frame', 'offset', 'sourceColorRect', 'sourceSize', 'spriteSourceSize')
+
+
+def _convertAtlasWorker(json_path, png_path, key=None):
+    """
+    进程池任务：将单个图集 JSON 转换为 plist 内容
+
+    Args:
+        json_path (str): 图集 JSON 路径
+        png_path (str): 图集纹理路径
+        key (str): plist 相对于assets目录的路径（用于生成稳定的 smartupdate）
+
+    Returns:
+        str: plist 内容，不是图集或转换失败时返回 None
+    """
+    try:
+        return converters.buildPlist(json_path, png_path, key=key)
+    except Exception as e:
+        logger().error(f'转换图集 {json_path} 时出错: {e}')
+        return None
+
 
 class Converters:
     """资源格式转换工具类"""
     
     def convertSpriteAtlas(self, spriteFrames):
         """
-        转换精灵图集
+        批量转换精灵图集为 plist
+        
+        图集在进程池中并发转换，转换结果通过输出后端写入。
         
         Args:
-            spriteFrames (dict): 精灵帧对象
+            spriteFrames (list): 图集列表，每项为 (JSON 路径, 纹理路径, plist 输出路径)
+        
+        Returns:
+            int: 成功转换的图集数量
         """
+        from src.core.reverseEngine import global_output, global_paths
+        from src.core.projectGenerator import projectGenerator
+        
+        atlases = list(spriteFrames or [])
+        if not atlases:
+            return 0
+        
+        logger().info(f'处理精灵图集，共 {len(atlases)} 个候选文件...')
+        assets_path = os.path.join(global_paths.get('output', ''), 'assets')
+        converted = 0
         try:
-            # 转换逻辑
-            logger().info('处理精灵图集...')
+            for (json_path, _, plist_path), content in zip(atlases, self._runAtlasTasks(atlases, assets_path)):
+                if content is None:
+                    continue
+                # 内容只取决于图集本身，未变化的 plist 不重写
+                global_output.writeFileIfChanged(plist_path, content)
+                projectGenerator.generateMeta(plist_path, os.path.relpath(plist_path, assets_path))
+                converted += 1
+                logger().debug(f'转换完成: {json_path} -> {plist_path}')
         except Exception as e:
             logger().error(f'转换精灵图集时出错: {e}')
+        
+        logger().info(f'精灵图集转换完成，共 {converted} 个')
+        return converted
+    
+    def _runAtlasTasks(self, atlases, assets_path):
+        """
+        执行图集转换任务，数量较多时使用进程池
+        
+        Args:
+            atlases (list): 图集列表
+            assets_path (str): 输出的assets目录
+        
+        Returns:
+            iterable: 按输入顺序排列的 plist 内容
+        """
+        json_paths = [item[0] for item in atlases]
+        png_paths = [item[1] for item in atlases]
+        keys = [os.path.relpath(item[2], assets_path) for item in atlases]
+        if len(atlases) < 4:
+            return [_convertAtlasWorker(j, p, k) for j, p, k in zip(json_paths, png_paths, keys)]
+        
+        from src.utils.workerPool import createProcessPool
+        with createProcessPool() as executor:
+            return list(executor.map(_convertAtlasWorker, json_paths, png_paths, keys, chunksize=16))
+    
+    def findAtlases(self, resources):
+        """
+        从已处理的资源中查找图集候选文件（同名的 .json 和 .png）
+        
+        Args:
+            resources (list): 已处理的资源列表
+        
+        Returns:
+            list: 图集列表，每项为 (JSON 路径, 纹理路径, plist 输出路径)
+        """
+        pngs = set()
+        for resource in resources:
+            if resource['source'].lower().endswith('.png'):
+                pngs.add(resource['source'][:-4])
+        
+        atlases = []
+        for resource in resources:
+            source = resource['source']
+            if source.lower().endswith('.json') and source[:-5] in pngs:
+                atlases.append((source, source[:-5] + '.png', resource['target'][:-5] + '.plist'))
+        return atlases
     
     def jsonToPlist(self, fileName):
         """
@@ -35,17 +131,7 @@ class Converters:
             fileName (str): 文件名（不含扩展名）
         """
         try:
-            # 读取 JSON 文件
-            with open(f'{fileName}.json', 'r', encoding='utf-8') as f:
-                data = f.read()
-            
-            json_data = json.loads(data)
-            
-            # 添加必要的属性
-            enhanced_json = self.addProperties(json_data, fileName)
-            
-            # 创建 XML 文档
-            xml_content = self.createXmlDocument(enhanced_json)
+            xml_content = self.buildPlist(f'{fileName}.json', f'{fileName}.png', require_atlas=False)
             
             # 写入 PLIST 文件
             fileManager.writeFile(f'{fileName}.plist', xml_content)
@@ -54,102 +140,118 @@ class Converters:
         except Exception as e:
             logger().error(f'转换文件 {fileName} 时出错: {e}')
     
-    def createXmlDocument(self, json_data):
+    def buildPlist(self, json_path, png_path, require_atlas=True, key=None):
         """
-        创建 XML 文档
+        读取图集 JSON 并生成 plist 内容
         
         Args:
-            json_data (dict): JSON 对象
+            json_path (str): 图集 JSON 路径
+            png_path (str): 图集纹理路径
+            require_atlas (bool): 是否要求 JSON 为图集格式（包含 frames）
+            key (str): plist 相对于assets目录的路径（可选，默认使用纹理路径）
         
         Returns:
-            str: XML 文档内容
+            str: plist 内容，不是图集时返回 None
         """
-        # 创建根元素
-        plist = ET.Element('plist')
-        plist.set('version', '1.0')
+        with open(json_path, 'rb') as f:
+            data = f.read()
         
-        # 创建 doctype
-        doctype = '<!DOCTYPE plist PUBLIC "-//Apple Computer//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">'
+        # 先做廉价的字节检查，避免解析非图集 JSON
+        if require_atlas and b'"frames"' not in data:
+            return None
         
-        # 创建主字典
-        root_dict = ET.SubElement(plist, 'dict')
-        self.parsetoXML(root_dict, json_data)
+        json_data = json.loads(data)
+        if require_atlas and not (isinstance(json_data, dict) and isinstance(json_data.get('frames'), dict)):
+            return None
+        
+        # 添加必要的属性
+        enhanced_json = self.addProperties(json_data, os.path.splitext(png_path)[0], key)
+        
+        # 创建 XML 文档
+        return self.createXmlDocument(enhanced_json)
+    
+    def createXmlDocument(self, json_data):
+        """
+        创建 XML 文档
         
-        # 生成 XML 字符串
-        xml_str = ET.tostring(plist, encoding='utf-8', method='xml')
+        直接拼接字符串输出，不构建 DOM 树。
         
-        # 组合完整的 XML 文档
-        xml_content = f'<?xml version="1.0" encoding="UTF-8"?>{doctype}\n{xml_str.decode("utf-8")}'
+        Args:
+            json_data (dict): JSON 对象
         
-        return xml_content
+        Returns:
+            str: XML 文档内容
+        """
+        out = [PLIST_HEADER, '<plist version="1.0"><dict>']
+        self.parsetoXML(out, json_data)
+        out.append('</dict></plist>')
+        return ''.join(out)
     
-    def parsetoXML(self, parent, json_data):
+    def parsetoXML(self, out, json_data):
         """
         将 JSON 对象解析为 XML
         
         Args:
-            parent (xml.etree.ElementTree.Element): 父元素
+            out (list): 输出片段列表
             json_data (dict): JSON 对象
         """
         for key, value in json_data.items():
             # 写入键
-            key_elem = ET.SubElement(parent, 'key')
-            key_elem.text = key
+            out.append(f'<key>{escape(str(key))}</key>')
             
             if isinstance(value, dict):
                 # 处理特殊格式的对象
-                if key in ['frame', 'offset', 'sourceColorRect', 'sourceSize', 'spriteSourceSize']:
-                    self.parsetoJson(parent, value)
+                if key in RECT_KEYS:
+                    self.parsetoJson(out, value)
                 else:
                     # 处理一般对象
-                    dict_elem = ET.SubElement(parent, 'dict')
-                    self.parsetoXML(dict_elem, value)
+                    out.append('<dict>')
+                    self.parsetoXML(out, value)
+                    out.append('</dict>')
             elif isinstance(value, list):
                 # 处理数组
-                array_elem = ET.SubElement(parent, 'array')
+                out.append('<array>')
                 for item in value:
                     if isinstance(item, dict):
-                        item_dict = ET.SubElement(array_elem, 'dict')
-                        self.parsetoXML(item_dict, item)
+                        out.append('<dict>')
+                        self.parsetoXML(out, item)
+                        out.append('</dict>')
                     else:
                         # 简单类型
-                        self.toXML(array_elem, '', item)
+                        self.toXML(out, '', item)
+                out.append('</array>')
             else:
                 # 处理基本类型值
-                self.toXML(parent, '', value)
+                self.toXML(out, '', value)
     
-    def toXML(self, parent, key, value):
+    def toXML(self, out, key, value):
         """
         将基本类型的键值对写入 XML
         
         Args:
-            parent (xml.etree.ElementTree.Element): 父元素
+            out (list): 输出片段列表
             key (str): 键
             value: 值
         """
         # 写入值
         if isinstance(value, bool):
             # 布尔值
-            bool_elem = ET.SubElement(parent, str(value).lower())
+            out.append('<true />' if value else '<false />')
         elif isinstance(value, int) or isinstance(value, float):
             # 数字
-            integer_elem = ET.SubElement(parent, 'integer')
-            integer_elem.text = str(int(value))
+            out.append(f'<integer>{int(value)}</integer>')
         else:
             # 字符串或其他
-            string_elem = ET.SubElement(parent, 'string')
-            string_elem.text = str(value)
+            out.append(f'<string>{escape(str(value))}</string>')
     
-    def parsetoJson(self, parent, value):
+    def parsetoJson(self, out, value):
         """
         将对象解析为特定格式的 JSON 字符串
         
         Args:
-            parent (xml.etree.ElementTree.Element): 父元素
+            out (list): 输出片段列表
             value (dict): 值对象
         """
-        string_elem = ET.SubElement(parent, 'string')
-        
         if 'x' in value and 'w' in value:
             # 包含位置和尺寸的对象
             json_str = f'{{{{{value["x"]},{value["y"]}}},{{{value["w"]},{value["h"]}}}}}'
@@ -157,19 +259,26 @@ class Converters:
             # 仅包含尺寸的对象
             json_str = f'{{{value["w"]},{value["h"]}}}'
         
-        string_elem.text = json_str
+        out.append(f'<string>{escape(json_str)}</string>')
     
-    def addProperties(self, json_data, fileName):
+    def addProperties(self, json_data, fileName, key=None):
         """
         添加必要的属性到 JSON 对象
         
         Args:
             json_data (dict): JSON 对象
             fileName (str): 文件名
+            key (str): plist 相对于assets目录的路径（可选，默认使用文件名）
         
         Returns:
             dict: 增强后的 JSON 对象
         """
+        from src.core.projectGenerator import META_UUID_NAMESPACE
+        
+        # smartupdate 由路径生成（与meta的UUID相同），重复运行时 plist 内容保持不变
+        key = (key or fileName).replace(os.sep, '/')
+        smartupdate = ':'.join(str(uuid.uuid5(META_UUID_NAMESPACE, f'{key}#smartupdate{i}')) for i in range(3))
+        
         # 创建元数据
         metadata = {
             'format': 3,
@@ -177,7 +286,7 @@ class Converters:
             'premultiplyAlpha': False,
             'realTextureFileName': f'{os.path.basename(fileName)}.png',
             'size': self.getImageSize(fileName),
-            'smartupdate': f'$TexturePacker:SmartUpdate:{uuid.uuid4()}:{uuid.uuid4()}:{uuid.uuid4()}$',
+            'smartupdate': f'$TexturePacker:SmartUpdate:{smartupdate}$',
             'textureFileName': f'{os.path.basename(fileName)}.png'
         }
         
@@ -201,14 +310,12 @@ class Converters:
         Returns:
             str: 格式化的尺寸字符串
         """
-        try:
-            # 使用 PIL 获取图像尺寸
-            with Image.open(f'{fileName}.png') as img:
-                width, height = img.size
-            return f'{{{width},{height}}}'
-        except Exception as e:
-            logger().error(f'读取图像文件 {fileName}.png 时出错: {e}')
+        # 只读取文件头，结果在各阶段之间共享缓存
+        size = imageProbe.getSize(f'{fileName}.png')
+        if size is None:
+            logger().error(f'读取图像文件 {fileName}.png 时出错: 无法识别的图像格式')
             return '{0,0}'
+        return f'{{{size[0]},{size[1]}}}'
 
 # 创建全局实例
 converters = Converters()
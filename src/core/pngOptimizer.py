@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+PNG 无损重新压缩
+
+由 assets.optimizeSprites 开启。每张 PNG 在进程池中用最高 zlib 压缩级别重新编码，
+颜色数不超过 256 时额外尝试调色板模式（仅在像素完全一致时采用），
+新文件不比原文件小时保留原文件。
+
+Pillow 按每通道 8 位读取图像，16 位及 1/2/4 位灰度的 PNG 不做处理；元数据块（文本、色彩空间、
+pHYs 等）原样写回，重新编码后元数据与原文件不一致的候选结果直接丢弃。
+"""
+
+import io
+import zlib
+import struct
+
+# 每个进程任务处理的文件数
+OPTIMIZE_CHUNK_SIZE = 8
+
+# 与像素编码无关、原样复制到新文件的辅助块（pHYs、iCCP、eXIf 通过 Pillow 的保存参数写回）
+COPIED_CHUNKS = frozenset([b'gAMA', b'cHRM', b'sRGB', b'cICP', b'sBIT', b'tIME', b'tEXt', b'zTXt', b'iTXt'])
+
+# 像素数据相关的块，不参与元数据比较（tRNS 随颜色类型变化）
+IMAGE_CHUNKS = frozenset([b'IHDR', b'PLTE', b'IDAT', b'IEND', b'tRNS'])
+
+
+def _optimizeWorker(path):
+    """
+    进程池任务：重新压缩单个 PNG
+
+    Args:
+        path (str): PNG 文件路径
+
+    Returns:
+        tuple: (压缩后的数据或 None, 原始大小, 压缩后大小)
+    """
+    return pngOptimizer.optimizeFile(path)
+
+
+class PngOptimizer:
+    """PNG 无损重新压缩类"""
+
+    def __init__(self):
+        """初始化"""
+        self.original_bytes = 0
+        self.optimized_bytes = 0
+        self.optimized_count = 0
+
+    def optimizeMany(self, paths):
+        """
+        在进程池中批量重新压缩 PNG，按输入顺序逐个返回结果
+
+        Args:
+            paths (list): PNG 文件路径列表
+
+        Yields:
+            bytes: 压缩后的数据，未变小或失败时为 None
+        """
+        from src.utils.logger import logger, DEBUG
+
+        if not paths:
+            return
+
+        self.original_bytes = 0
+        self.optimized_bytes = 0
+        self.optimized_count = 0
+        logger().info(f'开始重新压缩 {len(paths)} 个 PNG 文件...')
+        from src.utils.workerPool import createProcessPool
+        with createProcessPool() as executor:
+            for path, (data, original_size, new_size) in zip(
+                    paths, executor.map(_optimizeWorker, paths, chunksize=OPTIMIZE_CHUNK_SIZE)):
+                self.original_bytes += original_size
+                self.optimized_bytes += new_size
+                if data is not None:
+                    self.optimized_count += 1
+                    if logger().isEnabledFor(DEBUG):
+                        logger().debug(
+                            f'重新压缩: {path} {original_size} -> {new_size} 字节 '
+                            f'(-{(original_size - new_size) * 100 / original_size:.1f}%)'
+                        )
+                yield data
+
+        saved = self.original_bytes - self.optimized_bytes
+        ratio = saved * 100 / self.original_bytes if self.original_bytes else 0
+        logger().info(
+            f'PNG 重新压缩完成: {self.optimized_count}/{len(paths)} 个文件变小，'
+            f'共节省 {saved / 1024 / 1024:.2f} MB ({ratio:.1f}%)'
+        )
+
+    def optimizeFile(self, path):
+        """
+        无损重新压缩单个 PNG
+
+        Args:
+            path (str): PNG 文件路径
+
+        Returns:
+            tuple: (压缩后的数据或 None, 原始大小, 压缩后大小)
+        """
+        try:
+            with open(path, 'rb') as f:
+                original = f.read()
+        except OSError:
+            return None, 0, 0
+
+        try:
+            best = self.optimizeData(original)
+        except Exception:
+            best = None
+
+        if best is None or len(best) >= len(original):
+            return None, len(original), len(original)
+        return best, len(original), len(best)
+
+    def optimizeData(self, data):
+        """
+        无损重新编码 PNG 数据，返回候选结果中最小的一个
+
+        Args:
+            data (bytes): 原始 PNG 数据
+
+        Returns:
+            bytes: 重新编码后的数据，不支持的图片或无法保留全部元数据时返回 None
+        """
+        from PIL import Image
+        from PIL.PngImagePlugin import PngInfo
+
+        chunks = self._readChunks(data)
+        if not chunks or chunks[0][0] != b'IHDR':
+            return None
+        bit_depth, color_type = chunks[0][1][8], chunks[0][1][9]
+        # 只处理每通道 8 位的图像和调色板图像，其他位深读入后会丢失精度
+        if bit_depth != 8 and color_type != 3:
+            return None
+        metadata = self._metadataChunks(chunks)
+        pnginfo = PngInfo()
+        for cid, payload in chunks:
+            if cid in COPIED_CHUNKS:
+                pnginfo.add(cid, payload)
+
+        with Image.open(io.BytesIO(data)) as img:
+            # 动画 PNG 重新保存会丢失帧
+            if getattr(img, 'is_animated', False):
+                return None
+            img.load()
+
+            save_args = {'optimize': True, 'pnginfo': pnginfo}
+            for key in ('transparency', 'icc_profile', 'dpi', 'exif'):
+                if key in img.info:
+                    save_args[key] = img.info[key]
+
+            candidates = [self._encode(img, save_args)]
+
+            palette_img = self._toExactPalette(img)
+            if palette_img is not None:
+                palette_args = dict(save_args)
+                palette_args.pop('transparency', None)
+                if 'transparency' in palette_img.info:
+                    palette_args['transparency'] = palette_img.info['transparency']
+                candidates.append(self._encode(palette_img, palette_args))
+
+        # 元数据与原文件不一致的候选结果不采用（如调色板模式下的 sBIT、无单位的 pHYs）
+        candidates = [c for c in candidates if self._metadataChunks(self._readChunks(c)) == metadata]
+        return min(candidates, key=len) if candidates else None
+
+    def _readChunks(self, data):
+        """
+        拆分 PNG 数据块
+
+        Args:
+            data (bytes): PNG 数据
+
+        Returns:
+            list: (块类型, 块内容) 列表，不是 PNG 时返回空列表
+
+        Raises:
+            ValueError: 数据块不完整
+        """
+        if data[:8] != b'\x89PNG\r\n\x1a\n':
+            return []
+        chunks = []
+        offset = 8
+        while offset + 8 <= len(data):
+            length, cid = struct.unpack('>I4s', data[offset:offset + 8])
+            end = offset + 8 + length
+            if end + 4 > len(data):
+                raise ValueError('PNG 数据块不完整')
+            chunks.append((cid, data[offset + 8:end]))
+            offset = end + 4
+            if cid == b'IEND':
+                break
+        return chunks
+
+    def _metadataChunks(self, chunks):
+        """
+        提取用于比较的元数据块
+
+        Args:
+            chunks (list): _readChunks 的结果
+
+        Returns:
+            list: 排序后的 (块类型, 块内容) 列表，iCCP 取解压后的配置文件
+        """
+        metadata = []
+        for cid, payload in chunks:
+            if cid in IMAGE_CHUNKS:
+                continue
+            if cid == b'iCCP':
+                payload = zlib.decompress(payload[payload.index(b'\0') + 2:])
+            metadata.append((cid, payload))
+        return sorted(metadata)
+
+    def _encode(self, img, save_args):
+        """
+        以最高压缩级别编码为 PNG
+
+        Args:
+            img (PIL.Image.Image): 图像
+            save_args (dict): 保存参数
+
+        Returns:
+            bytes: PNG 数据
+        """
+        buffer = io.BytesIO()
+        img.save(buffer, 'PNG', compress_level=9, **save_args)
+        return buffer.getvalue()
+
+    def _toExactPalette(self, img):
+        """
+        颜色数不超过 256 时转换为调色板模式，转换结果必须与原图逐像素一致
+
+        Args:
+            img (PIL.Image.Image): 图像
+
+        Returns:
+            PIL.Image.Image: 调色板模式图像，无法无损转换时返回 None
+        """
+        from PIL import Image
+
+        if img.mode not in ('RGBA', 'RGB', 'LA', 'L'):
+            return None
+        if img.getcolors(256) is None:
+            return None
+
+        rgba = img.convert('RGBA')
+        fast_octree = getattr(Image, 'Quantize', Image).FASTOCTREE
+        try:
+            palette_img = rgba.quantize(colors=256, method=fast_octree, dither=0)
+        except (ValueError, TypeError):
+            return None
+
+        # 只在逐像素一致时采用
+        if palette_img.convert('RGBA').tobytes() != rgba.tobytes():
+            return None
+        return palette_img
+
+
+# 创建全局实例
+pngOptimizer = PngOptimizer()
@@ -5,6 +5,11 @@
 
 import os
 import json
+import uuid
+from src.utils.metrics import metrics
+
+# 根据资源路径生成稳定meta UUID时使用的命名空间
+META_UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'https://github.com/Crain99/cc-reverse')
 
 class ProjectGenerator:
     """项目生成器类"""
@@ -12,6 +17,14 @@ class ProjectGenerator:
     def __init__(self):
         """初始化"""
         self.generated_files = []
+        self._metas_generated = metrics.counter('metas_generated_total', '生成的meta文件数')
+        self._metas_unchanged = metrics.counter('metas_unchanged_total', '内容未变化而跳过写入的meta文件数')
+    
+    def reset(self):
+        """
+        清空上一次运行生成的文件列表
+        """
+        self.generated_files = []
     
     def generateProject(self, paths=None):
         """
@@ -21,7 +34,7 @@ class ProjectGenerator:
             paths (dict): 路径字典，包含output等路径
         """
         from src.utils.logger import logger
-        from src.core.reverseEngine import global_paths as global_paths_global, global_config
+        from src.core.reverseEngine import global_paths as global_paths_global
         
         # 使用传入的paths或全局global_paths
         current_paths = paths if paths is not None else global_paths_global
@@ -37,10 +50,6 @@ class ProjectGenerator:
         # 生成assets目录下的资源
         self._generateAssets()
         
-        # 生成meta文件
-        if global_config.get('output', {}).get('createMeta', True):
-            self._generateMetaFiles(current_paths)
-        
         logger().debug(f"项目生成完成，共生成 {len(self.generated_files)} 个文件")
     
     def _createProjectStructure(self, paths):
@@ -50,16 +59,21 @@ class ProjectGenerator:
         Args:
             paths (dict): 路径字典
         """
+        from src.core.reverseEngine import global_output
+        from src.utils.outputBackend import ArchiveBackend
+        
         # 创建主要目录结构
         directories = [
             os.path.join(paths.get('output', ''), 'assets'),
             os.path.join(paths.get('output', ''), 'settings'),
             os.path.join(paths.get('output', ''), 'library'),
-            os.path.join(paths.get('output', ''), 'temp'),
         ]
+        # 归档中不需要空的 temp 目录（Cocos Creator 打开项目时会自行创建）
+        if not isinstance(global_output, ArchiveBackend):
+            directories.append(os.path.join(paths.get('output', ''), 'temp'))
         
         for directory in directories:
-            os.makedirs(directory, exist_ok=True)
+            global_output.makedirs(directory)
     
     def _generateProjectJson(self, paths):
         """
@@ -68,7 +82,7 @@ class ProjectGenerator:
         Args:
             paths (dict): 路径字典
         """
-        from src.utils.fileManager import fileManager
+        from src.core.reverseEngine import global_output
         from src.utils.logger import logger
         
         # 生成project.json内容
@@ -86,11 +100,11 @@ class ProjectGenerator:
         # 写入文件
         output_path = os.path.join(paths.get('output', ''), 'project.json')
         logger().debug(f"写入project.json文件到: {output_path}")
-        fileManager.writeFile(output_path, json.dumps(project_json, indent=2, ensure_ascii=False))
+        global_output.writeFile(output_path, json.dumps(project_json, indent=2, ensure_ascii=False))
         
         # 检查文件是否存在
-        if os.path.exists(output_path):
-            logger().debug(f"project.json文件已成功创建，大小: {os.path.getsize(output_path)} 字节")
+        if global_output.exists(output_path):
+            logger().debug("project.json文件已成功创建")
         else:
             logger().error(f"project.json文件创建失败，路径: {output_path}")
         
@@ -104,52 +118,133 @@ class ProjectGenerator:
         logger().debug("生成assets目录下的资源...")
         
         # 这里可以添加更多资源生成逻辑
-        # 目前资源已经在resourceProcessor中处理
+        # 目前资源已经在resourceProcessor中处理，meta文件随资源写入时一并生成
     
-    def _generateMetaFiles(self, paths):
+    def generateMeta(self, file_path, rel_path, uuid_hint=None, source_path=None, stat_result=None, data=None):
         """
-        生成meta文件
+        为刚写入assets目录的资源生成meta文件
+        
+        由资源处理器和脚本生成器在写入资源的同时调用，无需在最后再遍历一次输出目录。
         
         Args:
-            paths (dict): 路径字典
+            file_path (str): 资源输出路径
+            rel_path (str): 资源相对于assets目录的路径
+            uuid_hint (str): 已知的资源原始UUID（任意格式）
+            source_path (str): 资源的源文件路径（输出不落盘时用于读取图像尺寸）
+            stat_result (os.stat_result): 源文件状态（可选，来自文件清单）
+            data (bytes): 资源内容（可选，资源仍在后台写入队列中时用于读取图像尺寸）
+        
+        Returns:
+            bool: 写入了新内容返回True，内容未变化或未生成返回False
         """
-        from src.utils.logger import logger
-        from src.utils.fileManager import fileManager
-        
-        logger().debug("生成meta文件...")
-        
-        # 遍历assets目录，为每个文件生成meta文件
-        assets_path = os.path.join(paths.get('output', ''), 'assets')
-        if os.path.exists(assets_path):
-            for root, _, files in os.walk(assets_path):
-                for file in files:
-                    if not file.endswith('.meta'):  # 跳过已存在的meta文件
-                        file_path = os.path.join(root, file)
-                        meta_path = file_path + '.meta'
-                        self._generateSingleMetaFile(file_path, meta_path)
+        content = self.buildMeta(file_path, rel_path, uuid_hint, source_path, stat_result, data)
+        if content is None:
+            return False
+        return self.writeMeta(file_path + '.meta', content)
     
-    def _generateSingleMetaFile(self, file_path, meta_path):
+    def buildMeta(self, file_path, rel_path=None, uuid_hint=None, source_path=None, stat_result=None, data=None, create_meta=None):
         """
-        生成单个文件的meta文件
+        生成资源meta文件的内容，不写入文件（可以在工作进程中调用）
+        
+        内容只取决于资源本身，重复运行时生成完全相同的meta文件。
         
         Args:
-            file_path (str): 资源文件路径
-            meta_path (str): meta文件路径
+            file_path (str): 资源输出路径
+            rel_path (str): 资源相对于assets目录的路径
+            uuid_hint (str): 已知的资源原始UUID（任意格式）
+            source_path (str): 资源的源文件路径（可选）
+            stat_result (os.stat_result): 源文件状态（可选）
+            data (bytes): 资源内容（可选）
+            create_meta (bool): 是否生成meta，为None时读取配置 output.createMeta
+        
+        Returns:
+            str: meta文件内容，不需要生成时返回None
         """
-        from src.utils.fileManager import fileManager
-        import uuid
+        from src.utils.imageProbe import imageProbe, IMAGE_EXTENSIONS
+        
+        if create_meta is None:
+            from src.core.reverseEngine import global_config
+            create_meta = global_config.get('output', {}).get('createMeta', True)
+        # 跳过构建产物中本身就是meta的文件
+        if not create_meta or file_path.endswith('.meta'):
+            return None
         
-        # 生成meta文件内容
         meta_content = {
             "ver": "1.0.3",
-            "uuid": str(uuid.uuid4()),
+            "uuid": self._resolveMetaUuid(file_path, rel_path, uuid_hint),
             "asyncLoadAssets": False,
             "subMetas": {}
         }
         
-        # 写入文件
-        fileManager.writeFile(meta_path, json.dumps(meta_content, indent=2, ensure_ascii=False))
+        # 纹理meta记录图像尺寸（只读取文件头）
+        if os.path.splitext(file_path)[1].lower() in IMAGE_EXTENSIONS:
+            if data is not None:
+                image_info = imageProbe.probeData(data)
+            elif source_path:
+                image_info = imageProbe.probe(source_path, stat_result)
+            else:
+                image_info = imageProbe.probe(file_path)
+            if image_info:
+                meta_content["width"] = image_info["width"]
+                meta_content["height"] = image_info["height"]
+        
+        return json.dumps(meta_content, indent=2, ensure_ascii=False)
+    
+    def writeMeta(self, meta_path, content):
+        """
+        写入meta文件，内容未变化的meta文件不会被重写，Cocos Creator 可以增量导入
+        
+        Args:
+            meta_path (str): meta文件路径
+            content (str): meta文件内容（见 buildMeta）
+        
+        Returns:
+            bool: 写入了新内容返回True，内容未变化返回False
+        """
+        from src.core.reverseEngine import global_output
+        
+        changed = global_output.writeFileIfChanged(meta_path, content)
         self.generated_files.append(meta_path)
+        self._metas_generated.inc()
+        if changed is False:
+            self._metas_unchanged.inc()
+        return changed
+    
+    def _resolveMetaUuid(self, file_path, rel_path=None, uuid_hint=None):
+        """
+        计算资源meta文件的UUID
+        
+        优先使用资源的原始UUID（调用方提供，或从构建产物的文件名中识别），
+        否则根据资源相对路径生成稳定的UUID。
+        
+        Args:
+            file_path (str): 资源文件路径
+            rel_path (str): 资源相对于assets目录的路径
+            uuid_hint (str): 已知的资源原始UUID（任意格式）
+        
+        Returns:
+            str: 标准格式的UUID
+        """
+        from src.utils.uuidRegistry import uuidRegistry
+        
+        if uuid_hint:
+            canonical = uuidRegistry.toCanonical(uuid_hint)
+            if canonical:
+                return canonical
+        
+        key = (rel_path or file_path).replace(os.sep, '/')
+        
+        # 构建产物中原生资源以UUID命名（如 raw-assets/fc/fc991dd7-....png，
+        # 2.4.x 中可能带有md5后缀）；import目录下的序列化文件与原生资源共用UUID，
+        # 为避免重复只对原生资源使用原始UUID
+        if 'import' not in key.split('/')[:-1]:
+            name = os.path.basename(file_path).split('.', 1)[0].split('@', 1)[0]
+            if len(name) == 36:
+                canonical = uuidRegistry.toCanonical(name)
+                if canonical:
+                    return canonical
+        
+        return str(uuid.uuid5(META_UUID_NAMESPACE, key))
     
     def getGeneratedFiles(self):
         """
@@ -4,7 +4,74 @@
 """
 
 import os
-import filetype
+import time
+from src.utils.metrics import metrics
+
+# 资源类别（按扩展名），用于统计
+RESOURCE_CATEGORIES = {
+    'texture': ('.png', '.jpg', '.jpeg', '.webp', '.pvr', '.pkm', '.astc'),
+    'audio': ('.mp3', '.ogg', '.wav', '.m4a', '.aac'),
+    'animation': ('.anim', '.skel', '.atlas'),
+    'font': ('.ttf', '.otf', '.fnt'),
+    'data': ('.json', '.plist', '.bin', '.cconb'),
+    'script': ('.js',)
+}
+
+# 可以通过配置关闭的资源类别
+CATEGORY_SWITCHES = {
+    'texture': 'extractTextures',
+    'audio': 'extractAudio',
+    'animation': 'extractAnimations'
+}
+
+def classifyResource(file_name):
+    """
+    按扩展名判断资源类别
+    
+    Args:
+        file_name (str): 文件名或路径
+    
+    Returns:
+        str: 资源类别，未知扩展名返回 'other'
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    for category, extensions in RESOURCE_CATEGORIES.items():
+        if extension in extensions:
+            return category
+    return 'other'
+
+def _describeUnitWorker(tasks, assets_root, create_meta):
+    """
+    进程池任务：识别一个工作单元（同一资源包中的一批资源）的文件类型并生成meta内容，不写入任何文件
+    
+    Args:
+        tasks (list): (资源文件路径, 资源输出相对路径, 文件状态, 原始UUID) 列表
+        assets_root (str): 输出的 assets 目录
+        create_meta (bool): 是否生成meta
+    
+    Returns:
+        list: 按任务顺序排列的 (MIME类型或None, meta内容或None)
+    """
+    return [
+        resourceProcessor.describeResource(file_path, rel_path, stat_result, uuid_hint,
+                                           assets_root=assets_root, create_meta=create_meta)
+        for file_path, rel_path, stat_result, uuid_hint in tasks
+    ]
+
+def validateCategories(types):
+    """
+    检查资源类别名称
+    
+    Args:
+        types (list): 资源类别名称列表
+    
+    Raises:
+        ValueError: 类别名称无效
+    """
+    known = set(RESOURCE_CATEGORIES) | {'other'}
+    unknown = [name for name in types or () if name not in known]
+    if unknown:
+        raise ValueError(f"未知的资源类别: {', '.join(unknown)}（可选: {', '.join(sorted(known))}）")
 
 class ResourceProcessor:
     """资源处理器类"""
@@ -12,17 +79,102 @@ class ResourceProcessor:
     def __init__(self):
         """初始化"""
         self.processed_resources = []
+        self.asset_path = None
+        self._path_filter = None
+        self._categories = None
+        self._skipped = metrics.counter('resources_skipped_total', '被过滤器排除的资源数')
+        self._processed = metrics.counter('resources_processed_total', '已处理的资源数')
+        self._process_seconds = metrics.histogram('resource_seconds', '单个资源的处理耗时（复制及生成meta）')
+    
+    def reset(self):
+        """
+        清空上一次运行处理的资源列表
+        """
+        self.processed_resources = []
+        self.asset_path = None
+        self._path_filter = None
+        self._categories = None
     
     def processResources(self):
         """
         处理资源
         """
         from src.utils.logger import logger
-        from src.core.reverseEngine import global_paths, global_settings
+        from src.utils.imageProbe import IMAGE_EXTENSIONS
+        from src.core.reverseEngine import global_paths, global_output
+        from src.core.bundleProcessor import bundleProcessor
         import os
         
         logger().debug("开始处理资源...")
         
+        valid_asset_path = self.findAssetPath()
+        if not valid_asset_path:
+            logger().warn("未找到资源目录")
+            return
+        self.asset_path = valid_asset_path
+        
+        tasks = []
+        for entry, rel_path in self._walkAssets(valid_asset_path):
+            # 图像的文件状态随任务传递，生成meta时无需再次查询
+            stat_result = entry.stat() if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS else None
+            # 资源包中的原生资源还原到包内的原始路径（过滤器仍按构建中的路径匹配）
+            target_rel, uuid_hint = bundleProcessor.resolveResource(rel_path)
+            tasks.append((entry.path, target_rel, stat_result, uuid_hint))
+        
+        # 目标目录集合已知，先按排序一次性创建
+        output_assets = os.path.join(global_paths.get('output', ''), 'assets')
+        global_output.makedirsMany(os.path.dirname(os.path.join(output_assets, task[1])) for task in tasks)
+        
+        self.processed_resources.extend(self._runTasks(tasks))
+    
+    def configureFilters(self, assets_config):
+        """
+        根据配置设置资源过滤器（include/exclude 通配符、types 类别以及各类别的开关）
+        
+        Args:
+            assets_config (dict): 配置中的 assets 部分
+        
+        Raises:
+            ValueError: 类别名称无效
+        """
+        from src.utils.pathFilter import PathFilter
+        
+        known = set(RESOURCE_CATEGORIES) | {'other'}
+        types = list(assets_config.get('types') or [])
+        validateCategories(types)
+        
+        categories = set(types) if types else set(known)
+        for category, switch in CATEGORY_SWITCHES.items():
+            if not assets_config.get(switch, True):
+                categories.discard(category)
+        
+        self._path_filter = PathFilter(assets_config.get('include'), assets_config.get('exclude'))
+        self._categories = None if categories == known else categories
+    
+    def accepts(self, rel_path):
+        """
+        检查资源是否通过过滤器（只看路径，不读取文件）
+        
+        Args:
+            rel_path (str): 相对于资源目录的路径
+        
+        Returns:
+            bool: 通过返回True
+        """
+        if self._categories is not None and classifyResource(rel_path) not in self._categories:
+            return False
+        return self._path_filter is None or self._path_filter.matches(rel_path)
+    
+    def findAssetPath(self):
+        """
+        查找资源目录
+        
+        Returns:
+            str: 第一个存在的资源目录，未找到时返回None
+        """
+        from src.utils.logger import logger
+        from src.core.reverseEngine import global_paths
+        
         # 获取资源目录路径
         res_path = global_paths.get('res', '')
         source_path = global_paths.get('source', '')
@@ -35,59 +187,290 @@ class ResourceProcessor:
         ]
         
         # 找到第一个存在的资源目录
-        valid_asset_path = None
         for path in asset_paths:
             if path and os.path.exists(path):
-                valid_asset_path = path
-                logger().info(f"使用资源目录: {valid_asset_path}")
-                break
+                logger().info(f"使用资源目录: {path}")
+                return path
+        return None
+    
+    def inventoryResources(self):
+        """
+        统计资源目录下的文件数量和大小，只查询文件状态，不读取或复制文件
         
-        if not valid_asset_path:
-            logger().warn("未找到资源目录")
-            return
+        Returns:
+            dict: 资源统计（path、files、bytes、categories、extensions、directories），未找到资源目录时返回None
+        """
+        from src.core.reverseEngine import checkCancelled
+        
+        asset_path = self.findAssetPath()
+        if not asset_path:
+            return None
+        
+        summary = {'path': asset_path, 'files': 0, 'bytes': 0, 'categories': {}, 'extensions': {}, 'directories': {}}
+        for entry, rel_path in self._walkAssets(asset_path):
+            if summary['files'] % 1000 == 0:
+                checkCancelled()
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            extension = os.path.splitext(entry.name)[1].lower() or '(none)'
+            directory = rel_path.split(os.sep, 1)[0] if os.sep in rel_path else '.'
+            for group, key in (('categories', classifyResource(entry.name)), ('extensions', extension), ('directories', directory)):
+                counts = summary[group].setdefault(key, {'files': 0, 'bytes': 0})
+                counts['files'] += 1
+                counts['bytes'] += size
+            summary['files'] += 1
+            summary['bytes'] += size
+        return summary
+    
+    def _walkAssets(self, asset_path):
+        """
+        从共享的文件清单中遍历资源目录下的文件，相对路径由清单给出
+        
+        Args:
+            asset_path (str): 资源目录
+        
+        Yields:
+            tuple: (清单条目, 相对于资源目录的路径)
+        """
+        from src.utils.fileInventory import FileInventory
+        from src.core.reverseEngine import global_inventory
+        
+        inventory = global_inventory
+        rel_dir = inventory.relativeTo(asset_path) if inventory is not None else None
+        if rel_dir is None:
+            inventory = FileInventory(asset_path)
+            rel_dir = ''
+        prefix_len = len(rel_dir) + 1 if rel_dir else 0
         
-        # 遍历资源目录
-        for root, _, files in os.walk(valid_asset_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                # 计算相对于资源目录的路径
-                rel_path = os.path.relpath(file_path, valid_asset_path)
+        for entry in inventory.walkFiles(rel_dir):
+            rel_path = entry.rel_path[prefix_len:]
+            # 在清单阶段过滤，被排除的文件不会被探测类型、读取或复制
+            if self.accepts(rel_path):
+                yield entry, rel_path
+            else:
+                self._skipped.inc()
+    
+    def updateResources(self, changed, removed):
+        """
+        增量更新：重新处理新增或修改的资源，删除已移除资源的输出文件
+        
+        Args:
+            changed (list): 新增或修改的资源文件路径（位于资源目录下）
+            removed (list): 已删除的资源文件路径
+        
+        Returns:
+            list: 重新处理的资源信息
+        """
+        from src.utils.imageProbe import IMAGE_EXTENSIONS
+        from src.core.reverseEngine import global_paths, global_output
+        from src.core.bundleProcessor import bundleProcessor
+        
+        changed = [p for p in changed if self.accepts(os.path.relpath(p, self.asset_path))]
+        removed_set = set(removed)
+        stale = removed_set.union(changed)
+        for record in self.processed_resources:
+            if record['source'] in removed_set:
+                global_output.removeFile(record['target'])
+                global_output.removeFile(record['target'] + '.meta')
+            # 图集的 JSON 或纹理变化时，由它们转换出的 plist 需要重新生成
+            if record['source'] in stale and os.path.splitext(record['target'])[1].lower() in ('.json', '.png'):
+                plist_path = os.path.splitext(record['target'])[0] + '.plist'
+                global_output.removeFile(plist_path)
+                global_output.removeFile(plist_path + '.meta')
+        self.processed_resources = [r for r in self.processed_resources if r['source'] not in stale]
+        
+        tasks = []
+        for file_path in changed:
+            stat_result = os.stat(file_path) if os.path.splitext(file_path)[1].lower() in IMAGE_EXTENSIONS else None
+            target_rel, uuid_hint = bundleProcessor.resolveResource(os.path.relpath(file_path, self.asset_path))
+            tasks.append((file_path, target_rel, stat_result, uuid_hint))
+        output_assets = os.path.join(global_paths.get('output', ''), 'assets')
+        global_output.makedirsMany(os.path.dirname(os.path.join(output_assets, task[1])) for task in tasks)
+        
+        records = self._runTasks(tasks)
+        self.processed_resources.extend(records)
+        return records
+    
+    def _runTasks(self, tasks):
+        """
+        执行资源处理任务
+        
+        Args:
+            tasks (list): (资源文件路径, 资源输出相对路径, 文件状态, 原始UUID) 列表
+        
+        Returns:
+            list: 按任务顺序排列的资源信息
+        """
+        from src.utils.workerPool import workerPool
+        from src.core.reverseEngine import global_config
+        
+        # 开启 optimizeSprites 时 PNG 先在进程池中重新压缩，再写入输出
+        if global_config.get('assets', {}).get('optimizeSprites', False):
+            return self._processWithOptimizedPngs(tasks)
+        
+        # 2.4.x 资源包中的资源按包划分为工作单元，在进程池中并发处理（低内存策略下只有一个进程，不启用）
+        from src.core.bundleProcessor import bundleProcessor
+        from src.utils.workerPool import processCount
+        units = bundleProcessor.planUnits([task[1] for task in tasks], processCount())
+        if units:
+            return self._processBundleUnits(tasks, units)
+        
+        # 在共享线程池中并发处理资源（复制文件并生成meta）
+        return workerPool.map(self._processResource, tasks)
+    
+    def _processBundleUnits(self, tasks, units):
+        """
+        按资源包工作单元处理资源：工作进程识别文件类型并生成meta内容（占用CPU的部分），
+        本进程在线程池中复制资源并写入meta，输出后端（包括归档）仍只在本进程中写入
+        
+        Args:
+            tasks (list): (资源文件路径, 资源输出相对路径, 文件状态, 原始UUID) 列表
+            units (list): 工作单元列表，每个单元是同一资源包中资源的任务下标列表
+        
+        Returns:
+            list: 按任务顺序排列的资源信息
+        """
+        from concurrent.futures import as_completed
+        from src.utils.logger import logger
+        from src.utils.workerPool import workerPool, createProcessPool
+        from src.core.reverseEngine import global_config, global_paths, checkCancelled
+        
+        records = [None] * len(tasks)
+        bundled = {index for unit in units for index in unit}
+        others = [index for index in range(len(tasks)) if index not in bundled]
+        assets_root = os.path.join(global_paths.get('output', ''), 'assets')
+        create_meta = global_config.get('output', {}).get('createMeta', True)
+        logger().info(f'按资源包并行处理 {len(bundled)} 个资源，共 {len(units)} 个工作单元...')
+        
+        with createProcessPool(len(units)) as executor:
+            # 先提交全部单元，工作进程计算的同时处理资源包以外的资源
+            futures = {
+                executor.submit(_describeUnitWorker, [tasks[index] for index in unit], assets_root, create_meta): unit
+                for unit in units
+            }
+            try:
+                for index, record in zip(others, workerPool.map(self._processResource, [tasks[index] for index in others])):
+                    records[index] = record
                 
-                # 处理不同类型的资源
-                self._processResource(file_path, rel_path)
+                # 单元完成后立即复制资源并写入meta
+                for future in as_completed(futures):
+                    unit = futures[future]
+                    unit_tasks = [tasks[index] + (None, described) for index, described in zip(unit, future.result())]
+                    for index, record in zip(unit, workerPool.map(self._processResource, unit_tasks)):
+                        records[index] = record
+                    checkCancelled()
+            except BaseException:
+                # 取消或出错时丢弃尚未开始的单元，不必等全部单元算完
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        
+        return records
     
-    def _processResource(self, file_path, rel_path):
+    def _processWithOptimizedPngs(self, tasks):
+        """
+        处理资源，PNG 写入重新压缩后的数据
+        
+        Args:
+            tasks (list): (资源文件路径, 资源输出相对路径, 文件状态, 原始UUID) 列表
+        
+        Returns:
+            list: 按任务顺序排列的资源信息
+        """
+        from src.utils.workerPool import workerPool
+        from src.core.pngOptimizer import pngOptimizer
+        
+        png_index = [i for i, task in enumerate(tasks) if task[0].lower().endswith('.png')]
+        png_set = set(png_index)
+        records = [None] * len(tasks)
+        
+        # 其他资源照常在线程池中复制
+        other_index = [i for i in range(len(tasks)) if i not in png_set]
+        for i, record in zip(other_index, workerPool.map(self._processResource, [tasks[i] for i in other_index])):
+            records[i] = record
+        
+        # PNG 压缩结果按顺序到达，逐个写入，避免在内存中堆积
+        # （生成器放在 zip 首位，保证其执行完毕并输出汇总）
+        optimized = pngOptimizer.optimizeMany([tasks[i][0] for i in png_index])
+        for data, i in zip(optimized, png_index):
+            records[i] = self._processResource(*tasks[i], data=data)
+        
+        return records
+    
+    def _processResource(self, file_path, rel_path, stat_result=None, uuid_hint=None, data=None, described=None):
         """
         处理单个资源
         
         Args:
             file_path (str): 资源文件路径
-            rel_path (str): 资源相对路径
+            rel_path (str): 资源在输出assets目录下的相对路径
+            stat_result (os.stat_result): 资源文件状态（可选）
+            uuid_hint (str): 资源的原始UUID（来自资源包配置，可选）
+            data (bytes): 替代源文件写入的内容（如重新压缩后的PNG），为None时直接复制
+            described (tuple): 已在工作进程中得到的 describeResource 结果（可选）
+        
+        Returns:
+            dict: 已处理资源的信息
         """
-        from src.utils.logger import logger
-        from src.core.reverseEngine import global_paths
-        from src.utils.fileManager import fileManager
+        from src.utils.logger import logger, DEBUG
+        from src.core.reverseEngine import global_paths, global_output
+        from src.core.projectGenerator import projectGenerator
         
-        # 检测文件类型
-        kind = filetype.guess(file_path)
-        if kind:
-            logger().debug(f"处理资源: {rel_path}, 类型: {kind.mime}")
-        else:
-            logger().debug(f"处理资源: {rel_path}, 类型: 未知")
+        start = time.perf_counter()
         
         # 资源输出路径
-        output_path = os.path.join(global_paths.get('output', ''), 'assets', rel_path)
+        assets_root = os.path.join(global_paths.get('output', ''), 'assets')
+        output_path = os.path.join(assets_root, rel_path)
+        
+        if described is None:
+            described = self.describeResource(file_path, rel_path, stat_result, uuid_hint, data, assets_root=assets_root)
+        mime, meta_content = described
+        # 每个文件一条日志，先检查级别再拼接消息
+        if logger().isEnabledFor(DEBUG):
+            logger().debug(f"处理资源: {rel_path}, 类型: {mime or '未知'}")
         
-        # 复制资源到输出目录
-        fileManager.copyFile(file_path, output_path)
+        # 复制资源到输出目录，并同时写入meta文件
+        if data is None:
+            global_output.copyFile(file_path, output_path)
+        else:
+            global_output.writeFile(output_path, data)
+        if meta_content is not None:
+            projectGenerator.writeMeta(output_path + '.meta', meta_content)
         
-        # 添加到已处理资源列表
-        self.processed_resources.append({
+        self._process_seconds.observe(time.perf_counter() - start)
+        self._processed.inc()
+        return {
             'source': file_path,
             'target': output_path,
-            'type': kind.mime if kind else 'unknown',
+            'type': mime or 'unknown',
             'relative_path': rel_path
-        })
+        }
+    
+    def describeResource(self, file_path, rel_path, stat_result=None, uuid_hint=None, data=None, assets_root='', create_meta=None):
+        """
+        识别资源的文件类型并生成meta内容，不写入任何文件
+        
+        Args:
+            file_path (str): 资源文件路径
+            rel_path (str): 资源在输出assets目录下的相对路径
+            stat_result (os.stat_result): 资源文件状态（可选）
+            uuid_hint (str): 资源的原始UUID（可选）
+            data (bytes): 替代源文件写入的内容（可选）
+            assets_root (str): 输出的 assets 目录
+            create_meta (bool): 是否生成meta，为None时读取配置
+        
+        Returns:
+            tuple: (MIME类型或None, meta内容或None)
+        """
+        import filetype
+        from src.core.projectGenerator import projectGenerator
+        
+        kind = filetype.guess(file_path)
+        meta_content = projectGenerator.buildMeta(os.path.join(assets_root, rel_path), rel_path, uuid_hint,
+                                                  source_path=file_path, stat_result=stat_result, data=data,
+                                                  create_meta=create_meta)
+        return kind.mime if kind else None, meta_content
     
     def getProcessedResources(self):
         """
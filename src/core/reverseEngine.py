@@ -5,9 +5,16 @@ Cocos Creator 逆向工程核心引擎
 
 import os
 import sys
+import json
+import time
 import shutil
 from src.utils.fileManager import fileManager
-from src.utils.logger import logger
+from src.utils.logger import logger, WARN
+from src.utils.outputBackend import createOutputBackend, DirectoryBackend
+from src.utils.fileInventory import FileInventory
+from src.utils.metrics import metrics
+from src.utils.memoryTracker import memoryTracker, MemoryBudgetError
+from src.utils.uuidRegistry import uuidRegistry
 from src.config.configLoader import loadConfig
 
 global_config = {}
@@ -15,6 +22,22 @@ global_verbose = False
 global_cocosVersion = ""
 global_settings = {}
 global_paths = {}
+global_output = DirectoryBackend('')
+global_inventory = None
+global_progress = None
+global_cancel = None
+global_timings = []
+global_warnings = []
+global_stage_start = None
+
+# --analyze-only 报告的默认文件名
+ANALYSIS_REPORT_NAME = 'analysis.json'
+
+# 可以选择执行的阶段（atlases、sprites 依赖 resources 的处理结果）
+STAGES = ('scripts', 'resources', 'atlases', 'sprites', 'project')
+
+class ReverseCancelledError(Exception):
+    """任务在完成前被取消"""
 
 def reverseProject(options):
     """
@@ -27,159 +50,669 @@ def reverseProject(options):
             verbose (bool): 是否显示详细日志
             silent (bool): 是否静默模式
             versionHint (str): 版本提示
+            outputFormat (str): 输出格式 (dir|zip|tar|tar.gz|tar.zst)，默认dir
+            keepTemp (bool): 是否保留临时文件
+            logFile (str): JSON Lines 日志文件路径（可选）
+            metricsFile (str): 指标快照文件路径（可选，.json 结尾写入 JSON，否则写入 Prometheus 文本格式）
+            memoryProfile (bool): 是否记录各阶段的峰值内存和主要分配位置
+            memoryBudget (str): 内存预算，如 2G；按主进程和子进程的内存之和计算，接近时切换到低内存策略，达到 90% 时中止
+            include (list): 只处理匹配的资源（通配符，追加到配置 assets.include）
+            exclude (list): 排除匹配的资源（通配符，追加到配置 assets.exclude）
+            types (list): 只处理这些类别的资源（覆盖配置 assets.types）
+            stages (list): 执行的阶段（覆盖配置 stages，见 STAGES）
+            onProgress (callable): 进入每个阶段时调用 onProgress(阶段名称, 指标快照)（可选）
+            isCancelled (callable): 返回True时在下一个检查点抛出 ReverseCancelledError（可选）
     
     Returns:
-        bool: 成功返回True，失败返回False
+        bool: 成功返回True，失败返回False；运行结果通过 getResult 获取
     """
     source_path = options.get('sourcePath')
     output_path = options.get('outputPath')
     verbose = options.get('verbose', False)
     version_hint = options.get('versionHint', '')
+    output_format = options.get('outputFormat') or 'dir'
+    keep_temp = options.get('keepTemp', False)
+    
+    # 日志级别：verbose 显示调试日志，silent 只显示警告和错误
+    logger().configure(verbose=verbose, silent=options.get('silent', False), log_file=options.get('logFile'))
     
     # 全局配置初始化
-    global global_config, global_verbose, global_cocosVersion, global_settings, global_paths
-    global_config = loadConfig()
+    global global_config, global_verbose, global_cocosVersion, global_settings, global_paths, global_output, global_inventory
+    global global_progress, global_cancel, global_timings, global_warnings, global_stage_start
+    global_config = applyOptions(loadConfig(), options)
     global_verbose = verbose
+    global_progress = options.get('onProgress')
+    global_cancel = options.get('isCancelled')
+    global_timings = []
+    global_warnings = []
+    global_stage_start = None
+    
+    # 源项目文件清单，各阶段共享，每个目录只扫描一次
+    global_inventory = FileInventory(source_path)
     
     # 检测Cocos Creator版本并设置相应的文件路径
-    project_info = detectProjectVersion(source_path, version_hint)
+    project_info = detectProjectVersion(source_path, version_hint, global_inventory)
     global_cocosVersion = project_info['version']
     
     # 检查文件是否存在
     validatePaths(project_info['resPath'], project_info['settingsPath'], project_info['projectPath'])
     
+    # 创建输出后端（归档格式不可用时在创建临时目录之前失败）
+    global_output = createOutputBackend(output_path, output_format)
+    
     # 创建临时目录和输出目录
-    temp_path = os.path.join(output_path, 'temp')
+    if output_format == 'dir':
+        temp_path = os.path.join(output_path, 'temp')
+    else:
+        # 归档输出时临时文件不进入归档
+        import tempfile
+        temp_path = tempfile.mkdtemp(prefix='cc-reverse-')
     ast_path = os.path.join(temp_path, 'ast')
     
-    # 创建目录
-    os.makedirs(temp_path, exist_ok=True)
-    os.makedirs(ast_path, exist_ok=True)
-    os.makedirs(output_path, exist_ok=True)
+    # 创建目录（目录缓存从本次运行开始重新记录）
+    fileManager.resetDirectoryCache()
+    if output_format == 'dir':
+        # 回收目录（temp 重命名而来）位于系统临时目录时由系统清理，否则位于输出目录的上级目录
+        import tempfile
+        trash_dir = fileManager.getTrashDirectory(temp_path, output_path)
+        if trash_dir != tempfile.gettempdir():
+            fileManager.sweepTrash(trash_dir)
+    fileManager.ensureDirectory(temp_path)
+    fileManager.ensureDirectory(ast_path)
+    
+    # 小文件写入放入后台队列
+    fileManager.startWriteBehind()
     
     # 保存全局路径信息
     global_paths = {
         'source': source_path,
         'output': output_path,
         'res': project_info['resPath'],
+        'settings': project_info['settingsPath'],
+        'project': project_info['projectPath'],
         'temp': temp_path,
         'ast': ast_path
     }
     
+    # 运行指标：定期导出快照，非静默模式下显示进度行
+    metrics.reset()
+    metrics.startReporter(path=options.get('metricsFile'), progress=not options.get('silent', False))
+    logger().addListener(_collectWarning)
+    
     try:
-        # 读取项目文件
-        with open(project_info['settingsPath'], 'rb') as f:
-            settings = f.read()
+        # 内存跟踪：按阶段记录峰值，设置预算时接近预算切换低内存策略
+        memoryTracker.start(profile=options.get('memoryProfile', False), budget=options.get('memoryBudget'))
         
-        with open(project_info['projectPath'], 'rb') as f:
-            project = f.read()
+        stages = global_config['stages']
         
-        code = project.decode('utf-8')
+        # 读取并解析设置
+        with open(project_info['settingsPath'], 'rb') as f:
+            settings = f.read()
         
-        # 解析设置
+        enterStage('解析设置')
         parseSettings(settings)
         
-        # 开始处理
-        logger().info('开始分析代码...')
-        
         # 导入需要在全局变量设置后使用的模块
         from src.core.codeAnalyzer import codeAnalyzer
         from src.core.resourceProcessor import resourceProcessor
         from src.core.projectGenerator import projectGenerator
+        from src.core.converters import converters
+        from src.core.spriteExtractor import spriteExtractor
+        from src.core.bundleProcessor import bundleProcessor
+        
+        # 清空上一次运行的结果（常驻进程中会连续运行多个任务）
+        for component in (codeAnalyzer, resourceProcessor, projectGenerator, spriteExtractor, bundleProcessor):
+            component.reset()
+        uuidRegistry.trim()
+        assets_config = global_config.get('assets', {})
+        resourceProcessor.configureFilters(assets_config)
         
-        # 分析主项目文件
-        codeAnalyzer.analyze(code)
+        # 2.4.x 的资源包：解析各包的配置，脚本和资源阶段共用解析结果
+        if global_cocosVersion == '2.4.x' and stages & {'scripts', 'resources'}:
+            enterStage('解析资源包')
+            bundleProcessor.loadBundles(global_paths['res'])
         
-        # 分析settings中列出的所有JavaScript文件
-        js_list = global_settings.get('CCSettings', {}).get('jsList', [])
-        if js_list:
-            logger().info(f'开始分析 {len(js_list)} 个额外脚本文件...')
-            source_path = global_paths.get('source', '')
-            js_files = []
+        if 'scripts' in stages:
+            enterStage('分析代码')
+            logger().info('开始分析代码...')
             
-            for js_file in js_list:
-                # 构建完整的文件路径
-                js_file_path = os.path.join(source_path, js_file)
-                if os.path.exists(js_file_path):
-                    js_files.append(js_file_path)
-                else:
-                    # 尝试在src目录下查找
-                    js_file_path_src = os.path.join(source_path, 'src', js_file)
-                    if os.path.exists(js_file_path_src):
-                        js_files.append(js_file_path_src)
-                    else:
-                        logger().warn(f'未找到脚本文件: {js_file}')
+            # 分析主项目文件
+            with open(project_info['projectPath'], 'rb') as f:
+                code = f.read().decode('utf-8')
+            codeAnalyzer.analyze(code, project_info['projectPath'])
             
-            # 分析所有找到的脚本文件
-            if js_files:
-                codeAnalyzer.analyzeMultipleFiles(js_files)
+            # 分析settings中列出的所有JavaScript文件以及资源包的脚本
+            global_paths['scripts'] = findScriptFiles() + bundleProcessor.getScripts()
+            if global_paths['scripts']:
+                codeAnalyzer.analyzeMultipleFiles(global_paths['scripts'])
         
-        logger().info('开始处理资源...')
-        # 处理资源
-        resourceProcessor.processResources()
+        if 'resources' in stages:
+            enterStage('处理资源')
+            logger().info('开始处理资源...')
+            # 处理资源（过滤器在清单阶段生效）
+            resourceProcessor.processResources()
+        
+        # 将图集 JSON 转换为 plist，并从图集中提取精灵帧
+        if assets_config.get('extractTextures', True):
+            if 'atlases' in stages:
+                enterStage('转换图集')
+                converters.convertSpriteAtlas(converters.findAtlases(resourceProcessor.getProcessedResources()))
+            if 'sprites' in stages and assets_config.get('extractSpriteFrames', True):
+                enterStage('提取精灵帧')
+                spriteExtractor.extractSpriteFrames(resourceProcessor.getProcessedResources())
         
         # 生成脚本文件
         if codeAnalyzer.analyzed_data.get('components', []):
+            enterStage('生成脚本')
             logger().info('生成脚本文件...')
             codeAnalyzer.generateScripts(global_paths.get('output', ''))
         
-        logger().info('生成项目文件...')
-        # 生成项目，传入全局路径
-        projectGenerator.generateProject(global_paths)
+        if 'project' in stages:
+            enterStage('生成项目')
+            logger().info('生成项目文件...')
+            # 生成项目，传入全局路径
+            projectGenerator.generateProject(global_paths)
+        
+        # 等待后台写入全部落盘后再完成输出
+        enterStage('完成输出')
+        fileManager.stopWriteBehind()
+        global_output.close()
+        if output_format != 'dir':
+            logger().info(f'已输出归档: {global_output.describe()}')
         
-        # 清理临时文件
-        if not verbose:
-            fileManager.cleanDirectory(temp_path)
+        # 清理临时文件：重命名后在后台删除，输出此时已完整
+        # （目录输出时 temp 同时是 Cocos Creator 项目的临时目录，保留空目录；归档输出的临时目录在 finally 中删除）
+        if output_format == 'dir' and not verbose and not keep_temp:
+            fileManager.removeDirectoryInBackground(temp_path, recreate=True, root=output_path)
         
+        finishStage()
+        metrics.setStage('完成')
+        if global_progress is not None:
+            global_progress('完成', metrics.snapshot())
+        metrics.stopReporter()
+        memoryTracker.stop()
+        if memoryTracker.profile:
+            logger().info(memoryTracker.formatReport())
+        logger().flush()
         return True
     except Exception as e:
-        logger().error(f'处理项目文件时出错: {e}')
+        if isinstance(e, ReverseCancelledError):
+            logger().warn(str(e))
+        else:
+            logger().error(f'处理项目文件时出错: {e}')
+        try:
+            fileManager.stopWriteBehind()
+        except Exception as write_error:
+            logger().error(str(write_error))
+        # 归档输出放弃未完成的归档，不在最终路径留下截断的文件
+        global_output.abort()
+        metrics.stopReporter()
+        memoryTracker.stop()
+        if memoryTracker.profile and not isinstance(e, MemoryBudgetError):
+            logger().info(memoryTracker.formatReport())
+        logger().flush()
         raise
+    finally:
+        logger().removeListener(_collectWarning)
+        # 归档输出的临时目录位于系统临时目录中，无论成功与否都删除
+        if output_format != 'dir':
+            if keep_temp:
+                logger().info(f'临时文件保留在: {temp_path}')
+            else:
+                fileManager.deleteDirectory(temp_path)
 
-def detectProjectVersion(sourcePath, versionHint):
+def analyzeProject(options):
+    """
+    只分析项目（--analyze-only）：检测版本、解析设置、分析代码并统计资源，写入一份 JSON 报告
+    
+    资源只查询文件状态，不读取、复制任何资源，也不生成meta和脚本。
+    
+    Args:
+        options (dict): 与 reverseProject 相同的配置选项；outputPath 以 .json 结尾时作为报告路径，
+            否则报告写入 outputPath 目录下的 analysis.json
+    
+    Returns:
+        dict: 分析报告
+    """
+    global global_config, global_verbose, global_cocosVersion, global_settings, global_paths, global_output, global_inventory
+    global global_progress, global_cancel, global_timings, global_warnings, global_stage_start
+    
+    source_path = options.get('sourcePath')
+    output_path = options.get('outputPath')
+    report_path = getReportPath(output_path)
+    logger().configure(verbose=options.get('verbose', False), silent=options.get('silent', False), log_file=options.get('logFile'))
+    
+    global_config = applyOptions(loadConfig(), options)
+    global_verbose = options.get('verbose', False)
+    global_progress = options.get('onProgress')
+    global_cancel = options.get('isCancelled')
+    global_timings = []
+    global_warnings = []
+    global_stage_start = None
+    global_inventory = FileInventory(source_path)
+    # 不输出任何文件，结果中的输出文件列表只有报告本身
+    global_output = DirectoryBackend(output_path)
+    
+    metrics.reset()
+    logger().addListener(_collectWarning)
+    try:
+        project_info = detectProjectVersion(source_path, options.get('versionHint', ''), global_inventory)
+        global_cocosVersion = project_info['version']
+        validatePaths(project_info['resPath'], project_info['settingsPath'], project_info['projectPath'])
+        global_paths = {
+            'source': source_path,
+            'output': output_path,
+            'res': project_info['resPath'],
+            'settings': project_info['settingsPath'],
+            'project': project_info['projectPath']
+        }
+        
+        enterStage('解析设置')
+        with open(project_info['settingsPath'], 'rb') as f:
+            parseSettings(f.read())
+        
+        enterStage('分析代码')
+        from src.core.codeAnalyzer import codeAnalyzer
+        from src.core.resourceProcessor import resourceProcessor
+        from src.core.bundleProcessor import bundleProcessor
+        codeAnalyzer.reset()
+        resourceProcessor.reset()
+        bundleProcessor.reset()
+        resourceProcessor.configureFilters(global_config.get('assets', {}))
+        if global_cocosVersion == '2.4.x':
+            bundleProcessor.loadBundles(project_info['resPath'])
+        with open(project_info['projectPath'], 'rb') as f:
+            codeAnalyzer.analyze(f.read().decode('utf-8'), project_info['projectPath'])
+        global_paths['scripts'] = findScriptFiles() + bundleProcessor.getScripts()
+        codeAnalyzer.analyzeMultipleFiles(global_paths['scripts'])
+        
+        enterStage('统计资源')
+        assets = resourceProcessor.inventoryResources()
+        if assets is None:
+            logger().warn('未找到资源目录')
+        finishStage()
+        
+        settings = global_settings.get('CCSettings', {})
+        report = {
+            'sourcePath': source_path,
+            'version': global_cocosVersion,
+            'files': {
+                'settings': project_info['settingsPath'],
+                'project': project_info['projectPath'],
+                'scripts': global_paths['scripts']
+            },
+            'settings': {
+                'platform': settings.get('platform'),
+                'launchScene': settings.get('launchScene'),
+                'scenes': len(settings.get('scenes') or []),
+                'uuids': len(settings.get('uuids') or []),
+                'jsList': len(settings.get('jsList') or [])
+            },
+            'classes': [
+                {
+                    'name': component.get('name'),
+                    'extends': component.get('extends'),
+                    'file': component.get('file'),
+                    'properties': sorted(str(key) for key in component.get('properties', {}))
+                }
+                for component in codeAnalyzer.getData().get('components', [])
+            ],
+            'assets': assets,
+            'bundles': bundleProcessor.getSummary(),
+            'timings': list(global_timings),
+            'warnings': list(global_warnings)
+        }
+        
+        report_dir = os.path.dirname(report_path)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        global_output.files.append(report_path)
+        
+        logger().info(f'分析报告已写入: {report_path}')
+        logger().flush()
+        return report
+    except Exception as e:
+        if isinstance(e, ReverseCancelledError):
+            logger().warn(str(e))
+        else:
+            logger().error(f'分析项目时出错: {e}')
+        logger().flush()
+        raise
+    finally:
+        logger().removeListener(_collectWarning)
+
+def applyOptions(config, options):
+    """
+    把命令行的过滤和阶段选项合并到配置中
+    
+    Args:
+        config (dict): loadConfig 返回的配置
+        options (dict): reverseProject 选项（include、exclude、types、stages）
+    
+    Returns:
+        dict: 合并后的配置，stages 为阶段名称集合
+    
+    Raises:
+        ValueError: 阶段或资源类别名称无效（在开始处理之前检查）
+    """
+    from src.core.resourceProcessor import validateCategories
+    
+    assets_config = config.setdefault('assets', {})
+    for key in ('include', 'exclude'):
+        assets_config[key] = list(assets_config.get(key) or []) + list(options.get(key) or [])
+    if options.get('types'):
+        assets_config['types'] = list(options['types'])
+    validateCategories(assets_config.get('types'))
+    
+    stages = set(options.get('stages') or config.get('stages') or STAGES)
+    unknown = sorted(stages - set(STAGES))
+    if unknown:
+        raise ValueError(f"未知的阶段: {', '.join(unknown)}（可选: {', '.join(STAGES)}）")
+    # 图集和精灵帧从已处理的资源中查找
+    if stages & {'atlases', 'sprites'}:
+        stages.add('resources')
+    config['stages'] = stages
+    return config
+
+def getReportPath(output_path):
+    """
+    获取分析报告的路径
+    
+    Args:
+        output_path (str): 输出路径
+    
+    Returns:
+        str: outputPath 以 .json 结尾时返回它本身，否则返回其下的 analysis.json
+    """
+    if output_path.lower().endswith('.json'):
+        return output_path
+    return os.path.join(output_path, ANALYSIS_REPORT_NAME)
+
+def findScriptFiles():
+    """
+    查找settings中 jsList 列出的脚本文件（相对于源项目或其 src 目录）
+    
+    Returns:
+        list: 找到的脚本文件路径
+    """
+    js_list = global_settings.get('CCSettings', {}).get('jsList', [])
+    if not js_list:
+        return []
+    
+    logger().info(f'开始分析 {len(js_list)} 个额外脚本文件...')
+    source_path = global_paths.get('source', '')
+    js_files = []
+    for js_file in js_list:
+        # 构建完整的文件路径
+        js_file_path = os.path.join(source_path, js_file)
+        if os.path.exists(js_file_path):
+            js_files.append(js_file_path)
+        else:
+            # 尝试在src目录下查找
+            js_file_path_src = os.path.join(source_path, 'src', js_file)
+            if os.path.exists(js_file_path_src):
+                js_files.append(js_file_path_src)
+            else:
+                logger().warn(f'未找到脚本文件: {js_file}')
+    return js_files
+
+def updateProject(options, changed, removed=()):
+    """
+    增量更新上一次 reverseProject 的输出，只重新执行受影响的阶段（用于 --watch）
+    
+    变化的 jsList 脚本重新分析并重新生成其中组件的脚本；资源目录下变化的文件重新复制并生成meta，
+    涉及图集或精灵帧时只重新转换相关的图集。设置文件或主脚本变化、输出为归档或此前没有在本进程中
+    完整运行过时，回退为完整运行。
+    
+    Args:
+        options (dict): 与 reverseProject 相同的配置选项
+        changed (list): 新增或修改的源文件路径
+        removed (list): 已删除的源文件路径
+    
+    Returns:
+        bool: 成功返回True
+    """
+    global global_output, global_inventory, global_progress, global_cancel, global_timings, global_warnings, global_stage_start
+    
+    source_path = options.get('sourcePath')
+    output_path = options.get('outputPath')
+    if ((options.get('outputFormat') or 'dir') != 'dir' or 'settings' not in global_paths
+            or global_paths.get('source') != source_path or global_paths.get('output') != output_path):
+        return reverseProject(options)
+    
+    # 路径统一规范化后比较（源路径可能是相对路径）
+    norm = os.path.normpath
+    if {norm(global_paths['settings']), norm(global_paths['project'])}.intersection(map(norm, list(changed) + list(removed))):
+        logger().info('设置文件或主脚本已变化，重新完整处理')
+        return reverseProject(options)
+    
+    # 资源包配置变化时 UUID 到路径的映射随之变化
+    from src.core.bundleProcessor import bundleProcessor
+    if any(bundleProcessor.isConfig(p) for p in list(changed) + list(removed)):
+        logger().info('资源包配置已变化，重新完整处理')
+        return reverseProject(options)
+    
+    from src.core.codeAnalyzer import codeAnalyzer
+    from src.core.resourceProcessor import resourceProcessor
+    from src.core.converters import converters
+    from src.core.spriteExtractor import spriteExtractor
+    
+    # 按影响范围分类：jsList 脚本和资源目录下的文件，其他文件不影响输出
+    scripts = {norm(p): p for p in global_paths.get('scripts', [])}
+    asset_prefix = os.path.join(norm(resourceProcessor.asset_path), '') if resourceProcessor.asset_path else None
+    changed_scripts = [scripts[norm(p)] for p in changed if norm(p) in scripts]
+    removed_scripts = [scripts[norm(p)] for p in removed if norm(p) in scripts]
+    changed_assets = [p for p in changed if asset_prefix and norm(p).startswith(asset_prefix)]
+    removed_assets = [p for p in removed if asset_prefix and norm(p).startswith(asset_prefix)]
+    if not (changed_scripts or removed_scripts or changed_assets or removed_assets):
+        logger().debug('变化的文件不影响输出')
+        return True
+    
+    logger().configure(verbose=options.get('verbose', False), silent=options.get('silent', False), log_file=options.get('logFile'))
+    global_progress = options.get('onProgress')
+    global_cancel = options.get('isCancelled')
+    global_timings = []
+    global_warnings = []
+    global_stage_start = None
+    global_inventory = FileInventory(source_path)
+    fileManager.resetDirectoryCache()
+    global_output = createOutputBackend(output_path, 'dir')
+    fileManager.startWriteBehind()
+    metrics.reset()
+    metrics.startReporter(path=options.get('metricsFile'), progress=not options.get('silent', False))
+    logger().addListener(_collectWarning)
+    
+    try:
+        memoryTracker.start(profile=options.get('memoryProfile', False), budget=options.get('memoryBudget'))
+        uuidRegistry.trim()
+        
+        if changed_scripts or removed_scripts:
+            enterStage('分析代码')
+            logger().info(f'重新分析 {len(changed_scripts)} 个脚本文件，移除 {len(removed_scripts)} 个...')
+            stale = codeAnalyzer.removeFiles(changed_scripts + removed_scripts)
+            codeAnalyzer.analyzeMultipleFiles(changed_scripts)
+            
+            enterStage('生成脚本')
+            fresh = [c for c in codeAnalyzer.analyzed_data['components'] if c.get('file') in set(changed_scripts)]
+            names = {c.get('name') for c in codeAnalyzer.analyzed_data['components']}
+            codeAnalyzer.removeScripts(output_path, [c for c in stale if c.get('name') not in names])
+            codeAnalyzer.generateScripts(output_path, fresh)
+        
+        if changed_assets or removed_assets:
+            enterStage('处理资源')
+            logger().info(f'重新处理 {len(changed_assets)} 个资源文件，移除 {len(removed_assets)} 个...')
+            records = resourceProcessor.updateResources(changed_assets, removed_assets)
+            
+            # 只重新转换与变化文件同名的图集，精灵帧只在相关的 import 文件或纹理中重新提取
+            assets_config = global_config.get('assets', {})
+            if assets_config.get('extractTextures', True) and records:
+                resources = resourceProcessor.getProcessedResources()
+                stems = {os.path.splitext(r['source'])[0] for r in records}
+                stages = global_config['stages']
+                if 'atlases' in stages:
+                    enterStage('转换图集')
+                    converters.convertSpriteAtlas(converters.findAtlases(
+                        [r for r in resources if os.path.splitext(r['source'])[0] in stems]
+                    ))
+                if 'sprites' in stages and assets_config.get('extractSpriteFrames', True):
+                    enterStage('提取精灵帧')
+                    changed_json = [r for r in records if r['source'].lower().endswith('.json')]
+                    changed_other = [r for r in records if not r['source'].lower().endswith('.json')]
+                    changed_sources = {r['source'] for r in records}
+                    other_json = [r for r in resources if r['source'].lower().endswith('.json') and r['source'] not in changed_sources]
+                    all_other = [r for r in resources if not r['source'].lower().endswith('.json')]
+                    # 变化的 import 文件对照全部纹理，其余 import 文件只对照变化的纹理
+                    if changed_json:
+                        spriteExtractor.extractSpriteFrames(changed_json + all_other)
+                    if changed_other:
+                        spriteExtractor.extractSpriteFrames(other_json + changed_other)
+        
+        enterStage('完成输出')
+        fileManager.stopWriteBehind()
+        global_output.close()
+        
+        finishStage()
+        metrics.setStage('完成')
+        if global_progress is not None:
+            global_progress('完成', metrics.snapshot())
+        metrics.stopReporter()
+        memoryTracker.stop()
+        if memoryTracker.profile:
+            logger().info(memoryTracker.formatReport())
+        logger().flush()
+        return True
+    except Exception as e:
+        if isinstance(e, ReverseCancelledError):
+            logger().warn(str(e))
+        else:
+            logger().error(f'更新项目文件时出错: {e}')
+        try:
+            fileManager.stopWriteBehind()
+        except Exception as write_error:
+            logger().error(str(write_error))
+        # 归档输出放弃未完成的归档，不在最终路径留下截断的文件
+        global_output.abort()
+        metrics.stopReporter()
+        memoryTracker.stop()
+        logger().flush()
+        raise
+    finally:
+        logger().removeListener(_collectWarning)
+
+def enterStage(name):
+    """
+    进入流水线的下一个阶段：检查是否已取消，更新进度显示并记录阶段内存
+    
+    Args:
+        name (str): 阶段名称
+    """
+    global global_stage_start
+    checkCancelled()
+    finishStage()
+    global_stage_start = (name, time.perf_counter())
+    metrics.setStage(name)
+    memoryTracker.beginStage(name)
+    if global_progress is not None:
+        global_progress(name, metrics.snapshot())
+
+def finishStage():
+    """
+    结束当前阶段，记录阶段耗时
+    """
+    global global_stage_start
+    if global_stage_start is not None:
+        name, start = global_stage_start
+        global_stage_start = None
+        global_timings.append({'stage': name, 'seconds': round(time.perf_counter() - start, 6)})
+
+def _collectWarning(level, message):
+    """
+    日志监听：记录本次运行的警告和错误
+    
+    Args:
+        level (int): 日志级别
+        message (str): 日志消息
+    """
+    if level >= WARN:
+        global_warnings.append(message)
+
+def getResult():
+    """
+    获取最近一次运行的结构化结果（reverseProject 或 updateProject 结束后调用）
+    
+    Returns:
+        dict: 运行结果
+            sourcePath (str): 源项目路径
+            outputPath (str): 输出路径
+            version (str): 检测到的Cocos Creator版本
+            components (list): 检测到的cc.Class组件（name、extends、properties、file）
+            resources (list): 处理的资源（source、target、type、relative_path）
+            files (list): 本次输出的全部文件路径
+            timings (list): 各阶段耗时（stage、seconds）
+            elapsed (float): 总耗时（秒）
+            warnings (list): 警告和错误消息
+    """
+    from src.core.codeAnalyzer import codeAnalyzer
+    from src.core.resourceProcessor import resourceProcessor
+    
+    return {
+        'sourcePath': global_paths.get('source'),
+        'outputPath': global_paths.get('output'),
+        'version': global_cocosVersion,
+        'components': [dict(component) for component in codeAnalyzer.getData().get('components', [])],
+        'resources': [dict(record) for record in resourceProcessor.getProcessedResources()],
+        'files': list(global_output.files),
+        'timings': list(global_timings),
+        'elapsed': round(sum(timing['seconds'] for timing in global_timings), 6),
+        'warnings': list(global_warnings)
+    }
+
+def checkCancelled():
+    """
+    检查任务是否已被取消
+    
+    Raises:
+        ReverseCancelledError: 任务已取消
+    """
+    if global_cancel is not None and global_cancel():
+        raise ReverseCancelledError('任务已取消')
+
+def detectProjectVersion(sourcePath, versionHint, inventory=None):
     """
     检测Cocos Creator项目版本并返回相应的文件路径
     
     Args:
         sourcePath (str): 源项目路径
         versionHint (str): 版本提示
+        inventory (FileInventory): 源项目文件清单（可选）
     
     Returns:
         dict: 包含版本信息和文件路径的对象
     """
-    import glob
+    if inventory is None:
+        inventory = FileInventory(sourcePath)
     
-    # 2.4.x版本的可能路径（支持带md5值的文件名）
+    # 2.4.x版本的可能路径（支持带md5值的文件名，相对于源项目路径）
     paths24x = {
-        'settings': [
-            os.path.join(sourcePath, 'main*.js'),
-            os.path.join(sourcePath, 'settings*.js'),
-            os.path.join(sourcePath, 'src', 'settings*.js')
-        ],
-        'project': [
-            os.path.join(sourcePath, 'project*.js'),
-            os.path.join(sourcePath, 'main*.js'),
-            os.path.join(sourcePath, 'src', 'project*.js')
-        ],
-        'res': [
-            os.path.join(sourcePath, 'assets'),
-            os.path.join(sourcePath, 'res'),
-            os.path.join(sourcePath, 'src', 'assets')
-        ]
+        'settings': ['main*.js', 'settings*.js', 'src/settings*.js'],
+        'project': ['project*.js', 'main*.js', 'src/project*.js'],
+        'res': ['assets', 'res', 'src/assets']
     }
     
     # 2.3.x及以下版本的路径
     paths23x = {
-        'settings': [os.path.join(sourcePath, 'src', 'settings*.js')],
-        'project': [os.path.join(sourcePath, 'src', 'project*.js')],
-        'res': [os.path.join(sourcePath, 'res')]
+        'settings': ['src/settings*.js'],
+        'project': ['src/project*.js'],
+        'res': ['res']
     }
     
     def findExistingPath(pathArray):
         """查找存在的路径，支持通配符模式"""
         for pattern in pathArray:
-            # 使用glob查找匹配的文件
-            matches = glob.glob(pattern)
+            # 在文件清单中查找匹配的文件
+            matches = inventory.glob(pattern)
             if matches:
                 # 返回第一个匹配的文件
                 return matches[0]
@@ -188,8 +721,7 @@ def detectProjectVersion(sourcePath, versionHint):
     # 特殊处理2.4.15版本提示
     if versionHint == '2.4.15' or versionHint == '2.4.x':
         # 先尝试查找src/settings*.js作为优先设置文件
-        src_settings_pattern = os.path.join(sourcePath, 'src', 'settings*.js')
-        src_settings = glob.glob(src_settings_pattern)
+        src_settings = inventory.glob('src/settings*.js')
         
         if src_settings:
             # 如果找到src/settings*.js，优先使用它
@@ -328,49 +860,28 @@ def parseSettings(settings):
         
         # 解析window._CCSettings或window.CCSettings
         import re
-        import json
         
         logger().debug('开始解析设置文件...')
         logger().debug(f'设置文件内容: {settings_content[:200]}...')
         
-        # 方法1: 直接执行JavaScript代码获取CCSettings（安全方式）
+        # 方法1: 解析window._CCSettings或window.CCSettings赋值的对象字面量
+        # 只扫描一遍顶层字段的位置，各字段在首次访问时才解析
+        settings_data = None
         try:
-            # 使用ast.literal_eval或直接解析
-            # 查找CCSettings赋值行
-            if 'window._CCSettings' in settings_content:
-                # 提取整个赋值语句
-                settings_line = settings_content.strip()
-                # 移除window._CCSettings = 和最后的分号
-                settings_json_str = settings_line.replace('window._CCSettings=', '').rstrip(';')
-                
-                # 使用一个简单的JavaScript解析器来处理
-                # 替换单引号为双引号
-                settings_json_str = settings_json_str.replace("'", '"')
-                # 移除末尾的逗号
-                settings_json_str = re.sub(r",\s*([}\]])", r'\1', settings_json_str)
-                
-                # 解析JSON
-                settings_data = json.loads(settings_json_str)
-                global_settings = {'CCSettings': settings_data}
-            elif 'window.CCSettings' in settings_content:
-                settings_line = settings_content.strip()
-                settings_json_str = settings_line.replace('window.CCSettings=', '').rstrip(';')
-                settings_json_str = settings_json_str.replace("'", '"')
-                settings_json_str = re.sub(r",\s*([}\]])", r'\1', settings_json_str)
-                settings_data = json.loads(settings_json_str)
-                global_settings = {'CCSettings': settings_data}
-            else:
-                # 尝试方法2: 提取jsList
-                js_list_match = re.search(r'jsList\s*:\s*\[(.*?)\]', settings_content, re.DOTALL)
-                if js_list_match:
-                    js_list_str = js_list_match.group(1)
-                    # 分割并清理jsList项
-                    js_list = [item.strip().strip("'").strip('"') for item in js_list_str.split(',')]
-                    global_settings = {'CCSettings': {'jsList': js_list}}
-                else:
-                    global_settings = {'CCSettings': {}}
+            from src.utils.jsLiteralParser import parseSettingsLazily
+            settings_data = parseSettingsLazily(settings_content)
+            if settings_data is None:
+                logger().debug('未找到CCSettings赋值语句，尝试提取jsList')
+            elif 'jsList' in settings_data:
+                # jsList 决定要分析的脚本，在这里解析，失败时与整体解析失败一样回退为正则提取
+                settings_data.load('jsList')
         except Exception as e1:
+            settings_data = None
             logger().debug(f'直接解析失败，尝试提取jsList: {e1}')
+        
+        if settings_data is not None:
+            global_settings = {'CCSettings': settings_data}
+        else:
             # 方法2: 提取jsList
             js_list_match = re.search(r'jsList\s*:\s*\[(.*?)\]', settings_content, re.DOTALL)
             if js_list_match:
@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+后台服务
+
+`cc-reverse serve` 启动一个常驻进程，在本机 HTTP 端口上接收逆向任务。任务在固定大小的进程池中
+执行，工作进程在任务之间保留已导入的模块和各类缓存（图像探测、UUID 驻留表），连续的构建不必每次
+重新加载。`cc-reverse submit` 提交任务并输出进度。
+
+服务没有身份验证，默认只监听本机地址。提交任务必须使用 Content-Type: application/json，浏览器中的
+网页无法不经预检就跨域发送这种请求；客户端也不能指定日志、指标等输出文件的路径。
+
+接口:
+    POST   /jobs              提交任务，请求体为 JSON（sourcePath、outputPath 及 reverseProject 的其他选项）
+    GET    /jobs              列出全部任务
+    GET    /jobs/<id>         查询任务状态
+    GET    /jobs/<id>/events  获取进度事件（?since=序号&wait=秒数，没有新事件时最多等待 wait 秒）
+    DELETE /jobs/<id>         取消任务
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.utils.logger import logger
+
+# 默认监听地址
+DEFAULT_HOST = '127.0.0.1'
+
+# 默认端口
+DEFAULT_PORT = 8765
+
+# 默认工作进程数
+DEFAULT_WORKERS = 2
+
+# 获取事件时的最长等待时间（秒）
+MAX_EVENT_WAIT = 30
+
+# 保留的已结束任务数
+KEEP_FINISHED_JOBS = 100
+
+# 客户端可以传入的 reverseProject 选项（不包括 logFile、metricsFile 等任意路径的输出文件）
+JOB_OPTIONS = (
+    'verbose', 'silent', 'versionHint', 'outputFormat', 'keepTemp',
+    'memoryProfile', 'memoryBudget',
+    'include', 'exclude', 'types', 'stages'
+)
+
+# 提交任务的请求体类型
+JSON_CONTENT_TYPE = 'application/json'
+
+# 任务状态
+QUEUED = 'queued'
+RUNNING = 'running'
+CANCELLING = 'cancelling'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+JOB_PATH_RE = re.compile(r'^/jobs/([0-9a-f]+)(/events)?$')
+
+
+class ServerError(Exception):
+    """请求无法处理"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def isLoopback(host):
+    """
+    检查监听地址是否只在本机可以访问
+
+    Args:
+        host (str): 监听地址
+
+    Returns:
+        bool: 是本机回环地址返回True
+    """
+    import ipaddress
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def ignoreInterrupt():
+    """
+    子进程忽略 Ctrl+C，由服务进程取消任务后统一退出
+    """
+    import signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def runJob(job_id, options, events, cancel_event):
+    """
+    在工作进程中执行一个任务（模块级函数，后台服务和异步接口的进程池共用）
+
+    Args:
+        job_id (str): 任务ID
+        options (dict): reverseProject 选项
+        events (Queue): 进度事件队列
+        cancel_event (Event): 取消标记
+
+    Returns:
+        dict: 运行结果（见 reverseEngine.getResult）
+    """
+    from src.core.reverseEngine import reverseProject, getResult
+
+    def onProgress(stage, snapshot):
+        events.put((job_id, 'progress', {
+            'stage': stage,
+            'elapsed': round(snapshot['elapsed'], 3),
+            'resources': snapshot['metrics'].get('cc_reverse_resources_processed_total', 0),
+            'files': snapshot['metrics'].get('cc_reverse_files_written_total', 0),
+            'bytes': snapshot['metrics'].get('cc_reverse_bytes_written_total', 0)
+        }))
+
+    events.put((job_id, 'started', {'pid': os.getpid()}))
+    reverseProject(dict(options, onProgress=onProgress, isCancelled=cancel_event.is_set))
+    return getResult()
+
+
+class Job:
+    """任务类"""
+
+    def __init__(self, job_id, options):
+        """
+        初始化
+
+        Args:
+            job_id (str): 任务ID
+            options (dict): reverseProject 选项
+        """
+        self.id = job_id
+        self.options = options
+        self.status = QUEUED
+        self.stage = ''
+        self.error = None
+        self.events = []
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.cancel_event = None
+
+    def toDict(self):
+        """
+        转换为可以输出为 JSON 的字典
+
+        Returns:
+            dict: 任务信息
+        """
+        return {
+            'id': self.id,
+            'status': self.status,
+            'stage': self.stage,
+            'error': self.error,
+            'sourcePath': self.options.get('sourcePath'),
+            'outputPath': self.options.get('outputPath'),
+            'createdAt': self.created_at,
+            'startedAt': self.started_at,
+            'finishedAt': self.finished_at,
+            'events': len(self.events)
+        }
+
+
+class ReverseServer:
+    """后台服务类"""
+
+    def __init__(self, host=None, port=None, workers=None):
+        """
+        初始化
+
+        Args:
+            host (str): 监听地址
+            port (int): 端口
+            workers (int): 工作进程数
+        """
+        self.host = host or DEFAULT_HOST
+        self.port = port or DEFAULT_PORT
+        self.workers = workers or DEFAULT_WORKERS
+        self.jobs = {}
+        self._condition = threading.Condition()
+        self._manager = None
+        self._events = None
+        self._pool = None
+        self._pump = None
+        self._httpd = None
+
+    def start(self):
+        """
+        启动进程池和 HTTP 服务
+        """
+        from multiprocessing.managers import SyncManager
+
+        if not isLoopback(self.host):
+            logger().warn(f'监听地址 {self.host} 不是本机地址：服务没有身份验证，网络中的其他主机都可以提交任务')
+
+        # 先绑定端口，端口被占用时不必启动其他进程
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.reverse_server = self
+        self.port = self._httpd.server_address[1]
+
+        self._manager = SyncManager()
+        self._manager.start(ignoreInterrupt)
+        self._events = self._manager.Queue()
+        self._pool = self._createPool()
+        self._pump = threading.Thread(target=self._pumpEvents, name='cc-reverse-events', daemon=True)
+        self._pump.start()
+        logger().info(f'服务已启动: http://{self.host}:{self.port}（{self.workers} 个工作进程）')
+
+    def serveForever(self):
+        """
+        处理请求直到中断（Ctrl+C 或 SIGTERM）
+        """
+        import signal
+
+        def onTerminate(signum, frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, onTerminate)
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """
+        停止服务：取消未完成的任务并等待正在运行的任务退出
+        """
+        if self._httpd is not None:
+            self._httpd.server_close()
+            self._httpd = None
+        with self._condition:
+            for job in self.jobs.values():
+                if job.status not in FINISHED_STATES:
+                    job.cancel_event.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._events is not None:
+            self._events.put(None)
+            self._pump.join()
+            self._events = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+        logger().info('服务已停止')
+
+    def submit(self, options):
+        """
+        提交任务
+
+        Args:
+            options (dict): 任务选项，必须包含 sourcePath 和 outputPath
+
+        Returns:
+            Job: 任务
+
+        Raises:
+            ServerError: 选项无效或输出路径正被其他任务使用
+        """
+        source_path = options.get('sourcePath')
+        output_path = options.get('outputPath')
+        if not source_path or not output_path:
+            raise ServerError(400, '必须指定 sourcePath 和 outputPath')
+        if not os.path.isdir(source_path):
+            raise ServerError(400, f'源路径不存在: {source_path}')
+
+        job_options = {key: options[key] for key in JOB_OPTIONS if key in options}
+        job_options['sourcePath'] = os.path.abspath(source_path)
+        job_options['outputPath'] = os.path.abspath(output_path)
+        # 进度通过事件返回给客户端，工作进程中不显示进度行
+        job_options.setdefault('silent', True)
+
+        with self._condition:
+            for other in self.jobs.values():
+                if other.status not in FINISHED_STATES and other.options['outputPath'] == job_options['outputPath']:
+                    raise ServerError(409, f'输出路径正被任务 {other.id} 使用: {output_path}')
+
+            job = Job(uuid.uuid4().hex[:12], job_options)
+            job.cancel_event = self._manager.Event()
+            self.jobs[job.id] = job
+            self._pruneJobs()
+
+            try:
+                job.future = self._pool.submit(runJob, job.id, job_options, self._events, job.cancel_event)
+            except RuntimeError:
+                # 工作进程异常退出后进程池不可用（BrokenProcessPool），重建后重新提交
+                self._pool = self._createPool()
+                job.future = self._pool.submit(runJob, job.id, job_options, self._events, job.cancel_event)
+            job.future.add_done_callback(lambda future, job=job: self._onJobDone(job, future))
+
+        logger().info(f'任务 {job.id} 已提交: {job_options["sourcePath"]} -> {job_options["outputPath"]}')
+        return job
+
+    def cancel(self, job_id):
+        """
+        取消任务：排队中的任务直接取消，运行中的任务在下一个检查点停止
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            Job: 任务
+        """
+        job = self.getJob(job_id)
+        with self._condition:
+            if job.status in FINISHED_STATES:
+                return job
+            job.cancel_event.set()
+            if not job.future.cancel() and job.status != CANCELLING:
+                job.status = CANCELLING
+                self._addEvent(job, 'cancelling', {})
+        logger().info(f'任务 {job.id} 正在取消')
+        return job
+
+    def getJob(self, job_id):
+        """
+        获取任务
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            Job: 任务
+
+        Raises:
+            ServerError: 任务不存在
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise ServerError(404, f'任务不存在: {job_id}')
+        return job
+
+    def listJobs(self):
+        """
+        列出全部任务
+
+        Returns:
+            list: 任务信息列表
+        """
+        with self._condition:
+            return [job.toDict() for job in self.jobs.values()]
+
+    def waitEvents(self, job, since=0, timeout=0):
+        """
+        获取序号 since 之后的事件，没有新事件且任务未结束时最多等待 timeout 秒
+
+        Args:
+            job (Job): 任务
+            since (int): 已获取的事件数
+            timeout (float): 最长等待时间（秒）
+
+        Returns:
+            list: 事件列表
+        """
+        deadline = time.time() + min(timeout, MAX_EVENT_WAIT)
+        with self._condition:
+            while len(job.events) <= since and job.status not in FINISHED_STATES:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return job.events[since:]
+
+    def _createPool(self):
+        """
+        创建进程池（工作进程在任务之间复用，已导入的模块和缓存保持可用）
+
+        Returns:
+            ProcessPoolExecutor: 进程池
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=ignoreInterrupt)
+
+    def _addEvent(self, job, kind, data):
+        """
+        记录任务事件并唤醒等待的请求（调用方持有 self._condition）
+
+        Args:
+            job (Job): 任务
+            kind (str): 事件类型
+            data (dict): 事件数据
+        """
+        job.events.append(dict(data, seq=len(job.events), type=kind, time=time.time()))
+        self._condition.notify_all()
+
+    def _onJobDone(self, job, future):
+        """
+        进程池中的任务结束时调用；结束事件放入同一个事件队列，保证排在工作进程的进度事件之后
+
+        Args:
+            job (Job): 任务
+            future (Future): 任务的 Future
+        """
+        from src.core.reverseEngine import ReverseCancelledError
+
+        if future.cancelled():
+            status, error = CANCELLED, None
+        elif future.exception() is None:
+            status, error = DONE, None
+        elif isinstance(future.exception(), ReverseCancelledError):
+            status, error = CANCELLED, None
+        else:
+            status, error = FAILED, str(future.exception())
+
+        events = self._events
+        if events is not None:
+            try:
+                events.put((job.id, 'finished', {'status': status, 'error': error}))
+                return
+            except Exception:
+                pass
+        self._handleEvent(job.id, 'finished', {'status': status, 'error': error})
+
+    def _pumpEvents(self):
+        """
+        后台线程：把工作进程发来的事件分发到对应的任务
+        """
+        events = self._events
+        while True:
+            try:
+                item = events.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            self._handleEvent(*item)
+
+    def _handleEvent(self, job_id, kind, data):
+        """
+        处理一个任务事件，更新任务状态
+
+        Args:
+            job_id (str): 任务ID
+            kind (str): 事件类型
+            data (dict): 事件数据
+        """
+        with self._condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return
+            if kind == 'started':
+                job.status = CANCELLING if job.status == CANCELLING else RUNNING
+                job.started_at = time.time()
+            elif kind == 'progress':
+                job.stage = data['stage']
+            elif kind == 'finished':
+                job.status = data['status']
+                job.error = data['error']
+                job.finished_at = time.time()
+            self._addEvent(job, kind, data)
+
+        if kind == 'finished':
+            if job.status == FAILED:
+                logger().error(f'任务 {job.id} 失败: {job.error}')
+            else:
+                logger().info(f'任务 {job.id} {"已完成" if job.status == DONE else "已取消"}')
+
+    def _pruneJobs(self):
+        """
+        只保留最近的 KEEP_FINISHED_JOBS 个已结束任务（调用方持有 self._condition）
+        """
+        finished = [job for job in self.jobs.values() if job.status in FINISHED_STATES]
+        for job in finished[:max(0, len(finished) - KEEP_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP 请求处理类"""
+
+    server_version = 'cc-reverse'
+
+    def do_GET(self):
+        """查询任务或获取事件"""
+        url = urllib.parse.urlsplit(self.path)
+        service = self.server.reverse_server
+        if url.path == '/jobs':
+            return self._sendJson(200, {'jobs': service.listJobs()})
+
+        match = JOB_PATH_RE.match(url.path)
+        if not match:
+            return self._sendJson(404, {'error': f'未知路径: {url.path}'})
+        try:
+            job = service.getJob(match.group(1))
+            if not match.group(2):
+                return self._sendJson(200, job.toDict())
+            query = urllib.parse.parse_qs(url.query)
+            since = int(query.get('since', ['0'])[0])
+            wait = float(query.get('wait', ['0'])[0])
+        except ServerError as e:
+            return self._sendJson(e.status, {'error': str(e)})
+        except ValueError as e:
+            return self._sendJson(400, {'error': str(e)})
+        events = service.waitEvents(job, since, wait)
+        self._sendJson(200, {'job': job.toDict(), 'events': events})
+
+    def do_POST(self):
+        """提交任务"""
+        if urllib.parse.urlsplit(self.path).path != '/jobs':
+            return self._sendJson(404, {'error': f'未知路径: {self.path}'})
+        # 拒绝表单等"简单请求"，浏览器中的网页无法不经预检跨域提交任务
+        if self.headers.get_content_type() != JSON_CONTENT_TYPE:
+            return self._sendJson(415, {'error': f'请求体类型必须是 {JSON_CONTENT_TYPE}'})
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            options = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(options, dict):
+                raise ServerError(400, '请求体必须是 JSON 对象')
+            job = self.server.reverse_server.submit(options)
+        except ServerError as e:
+            return self._sendJson(e.status, {'error': str(e)})
+        except ValueError as e:
+            return self._sendJson(400, {'error': f'无效的请求体: {e}'})
+        self._sendJson(202, job.toDict())
+
+    def do_DELETE(self):
+        """取消任务"""
+        match = JOB_PATH_RE.match(urllib.parse.urlsplit(self.path).path)
+        if not match or match.group(2):
+            return self._sendJson(404, {'error': f'未知路径: {self.path}'})
+        try:
+            job = self.server.reverse_server.cancel(match.group(1))
+        except ServerError as e:
+            return self._sendJson(e.status, {'error': str(e)})
+        self._sendJson(202, job.toDict())
+
+    def log_message(self, format, *args):
+        """请求日志输出到调试日志"""
+        logger().debug(f'{self.address_string()} {format % args}')
+
+    def _sendJson(self, status, data):
+        """
+        返回 JSON 响应
+
+        Args:
+            status (int): HTTP 状态码
+            data (dict): 响应数据
+        """
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host=None, port=None, workers=None):
+    """
+    启动后台服务并处理请求直到中断
+
+    Args:
+        host (str): 监听地址
+        port (int): 端口
+        workers (int): 工作进程数
+    """
+    server = ReverseServer(host, port, workers)
+    server.start()
+    server.serveForever()
+
+
+def _request(method, url, data=None, timeout=None):
+    """
+    发送请求并解析 JSON 响应
+
+    Args:
+        method (str): HTTP 方法
+        url (str): 地址
+        data (dict): 请求体（可选）
+        timeout (float): 超时时间（秒）
+
+    Returns:
+        dict: 响应数据
+
+    Raises:
+        ServerError: 服务返回错误或无法连接
+    """
+    body = json.dumps(data).encode('utf-8') if data is not None else None
+    request = urllib.request.Request(url, data=body, method=method, headers={'Content-Type': JSON_CONTENT_TYPE})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read()).get('error', e.reason)
+        except ValueError:
+            message = e.reason
+        raise ServerError(e.code, message)
+    except urllib.error.URLError as e:
+        raise ServerError(503, f'无法连接服务 {url}: {e.reason}')
+
+
+def submitJob(options, host=None, port=None, follow=True, onEvent=None):
+    """
+    提交任务；follow 为True时持续获取进度事件直到任务结束
+
+    Args:
+        options (dict): 任务选项，必须包含 sourcePath 和 outputPath
+        host (str): 服务地址
+        port (int): 服务端口
+        follow (bool): 是否等待任务结束
+        onEvent (callable): 每收到一个事件时调用 onEvent(事件)（可选）
+
+    Returns:
+        dict: 任务信息（follow 为True时为结束后的状态）
+    """
+    base_url = f'http://{host or DEFAULT_HOST}:{port or DEFAULT_PORT}'
+    job = _request('POST', f'{base_url}/jobs', options, timeout=MAX_EVENT_WAIT)
+    if not follow:
+        return job
+
+    since = 0
+    try:
+        while job['status'] not in FINISHED_STATES:
+            result = _request(
+                'GET', f'{base_url}/jobs/{job["id"]}/events?since={since}&wait={MAX_EVENT_WAIT}',
+                timeout=MAX_EVENT_WAIT + 10
+            )
+            for event in result['events']:
+                if onEvent is not None:
+                    onEvent(event)
+            since += len(result['events'])
+            job = result['job']
+    except KeyboardInterrupt:
+        # 客户端中断时取消服务端的任务
+        cancelJob(job['id'], host, port)
+        raise
+    return job
+
+
+def cancelJob(job_id, host=None, port=None):
+    """
+    取消任务
+
+    Args:
+        job_id (str): 任务ID
+        host (str): 服务地址
+        port (int): 服务端口
+
+    Returns:
+        dict: 任务信息
+    """
+    base_url = f'http://{host or DEFAULT_HOST}:{port or DEFAULT_PORT}'
+    return _request('DELETE', f'{base_url}/jobs/{job_id}', timeout=MAX_EVENT_WAIT)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+精灵帧提取器
+
+根据 import 目录中序列化的 cc.SpriteFrame（rect、offset、originalSize、rotated），
+从图集纹理中裁剪出单独的精灵图片。
+"""
+
+import io
+import os
+import json
+
+# 输出目录（相对于assets）
+SPRITES_DIR = 'sprites'
+
+# 每个扫描任务处理的文件数
+SCAN_CHUNK_SIZE = 64
+
+
+def _scanFramesWorker(json_path):
+    """
+    进程池任务：从单个 import JSON 中提取精灵帧定义
+
+    Args:
+        json_path (str): import JSON 路径
+
+    Returns:
+        list: 精灵帧定义列表
+    """
+    return spriteExtractor.scanFrames(json_path)
+
+
+def _extractAtlasWorker(texture_path, frames):
+    """
+    进程池任务：解码一次图集纹理并裁剪其上的全部精灵帧
+
+    Args:
+        texture_path (str): 图集纹理路径
+        frames (list): 该纹理上的精灵帧定义列表
+
+    Returns:
+        list: (精灵帧名称, PNG 数据) 列表
+    """
+    return spriteExtractor.cropFrames(texture_path, frames)
+
+
+class SpriteExtractor:
+    """精灵帧提取器类"""
+
+    def __init__(self):
+        """初始化"""
+        self.extracted_sprites = []
+
+    def reset(self):
+        """
+        清空上一次运行提取的精灵帧列表
+        """
+        self.extracted_sprites = []
+
+    def extractSpriteFrames(self, resources):
+        """
+        从已处理的资源中提取全部精灵帧
+
+        Args:
+            resources (list): 已处理的资源列表
+
+        Returns:
+            int: 提取的精灵帧数量
+        """
+        from src.utils.logger import logger
+        from src.utils.uuidRegistry import uuidRegistry
+        from src.core.reverseEngine import global_output, global_paths
+        from src.core.projectGenerator import projectGenerator
+
+        json_paths = [r['source'] for r in resources if r['source'].lower().endswith('.json')]
+        if not json_paths:
+            return 0
+
+        # 纹理UUID -> 纹理源文件路径（原生资源以UUID命名）
+        textures = {}
+        for resource in resources:
+            source = resource['source']
+            if os.path.splitext(source)[1].lower() in ('.png', '.jpg', '.jpeg', '.webp'):
+                name = os.path.basename(source).split('.', 1)[0]
+                uuid_id = uuidRegistry.intern(name) if len(name) == 36 else None
+                if uuid_id is not None:
+                    textures[uuid_id] = source
+
+        if not textures:
+            return 0
+
+        logger().info(f'扫描精灵帧定义，共 {len(json_paths)} 个 import 文件...')
+        from src.utils.workerPool import createProcessPool
+        with createProcessPool() as executor:
+            # 第一阶段：并发扫描 import JSON，按纹理分组
+            groups = {}
+            for frames in executor.map(_scanFramesWorker, json_paths, chunksize=SCAN_CHUNK_SIZE):
+                for frame in frames:
+                    texture_id = uuidRegistry.intern(frame['texture'])
+                    if texture_id in textures:
+                        groups.setdefault(texture_id, []).append(frame)
+
+            if not groups:
+                logger().info('未找到可提取的精灵帧')
+                return 0
+
+            total = sum(len(frames) for frames in groups.values())
+            logger().info(f'开始提取精灵帧，共 {total} 个，分布在 {len(groups)} 张纹理上...')
+
+            # 第二阶段：每张纹理一个任务，只解码一次
+            texture_ids = list(groups)
+            results = executor.map(
+                _extractAtlasWorker,
+                [textures[i] for i in texture_ids],
+                [groups[i] for i in texture_ids]
+            )
+
+            assets_path = os.path.join(global_paths.get('output', ''), 'assets')
+            extracted = 0
+            for texture_id, sprites in zip(texture_ids, results):
+                sprite_dir = os.path.join(assets_path, SPRITES_DIR, uuidRegistry.toCanonical(texture_id))
+                for name, data in sprites:
+                    sprite_path = os.path.join(sprite_dir, name + '.png')
+                    global_output.writeFile(sprite_path, data)
+                    projectGenerator.generateMeta(sprite_path, os.path.relpath(sprite_path, assets_path), data=data)
+                    self.extracted_sprites.append(sprite_path)
+                    extracted += 1
+
+        logger().info(f'精灵帧提取完成，共 {extracted} 个')
+        return extracted
+
+    def scanFrames(self, json_path):
+        """
+        从 import JSON 中提取 cc.SpriteFrame 定义
+
+        Args:
+            json_path (str): import JSON 路径
+
+        Returns:
+            list: 精灵帧定义列表
+        """
+        try:
+            with open(json_path, 'rb') as f:
+                data = f.read()
+            # 先做廉价的字节检查，避免解析无关的 JSON
+            if b'cc.SpriteFrame' not in data:
+                return []
+            root = json.loads(data)
+        except (OSError, ValueError):
+            return []
+
+        frames = []
+        default_name = os.path.basename(json_path).split('.', 1)[0]
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, dict):
+                content = node.get('content')
+                if node.get('__type__') == 'cc.SpriteFrame' and isinstance(content, dict):
+                    frame = self._parseFrame(content, default_name)
+                    if frame:
+                        frames.append(frame)
+                else:
+                    stack.extend(node.values())
+        return frames
+
+    def _parseFrame(self, content, default_name):
+        """
+        解析序列化的精灵帧内容
+
+        Args:
+            content (dict): cc.SpriteFrame 的 content 字段
+            default_name (str): 缺少名称时使用的默认名称
+
+        Returns:
+            dict: 精灵帧定义，数据不完整时返回 None
+        """
+        texture = content.get('texture')
+        rect = content.get('rect')
+        if not isinstance(texture, str) or not isinstance(rect, list) or len(rect) != 4:
+            return None
+        offset = content.get('offset') or [0, 0]
+        original_size = content.get('originalSize') or rect[2:]
+        return {
+            'name': str(content.get('name') or default_name),
+            'texture': texture,
+            'rect': [int(v) for v in rect],
+            'offset': [float(v) for v in offset[:2]],
+            'originalSize': [int(v) for v in original_size[:2]],
+            'rotated': bool(content.get('rotated'))
+        }
+
+    def cropFrames(self, texture_path, frames):
+        """
+        从纹理中裁剪精灵帧：还原旋转并按 offset 填充到原始尺寸
+
+        Args:
+            texture_path (str): 纹理路径
+            frames (list): 精灵帧定义列表
+
+        Returns:
+            list: (精灵帧名称, PNG 数据) 列表
+        """
+        from PIL import Image
+        from src.utils.logger import logger
+
+        rotate_90 = getattr(Image, 'Transpose', Image).ROTATE_90
+        results = []
+        used_names = set()
+        try:
+            with Image.open(texture_path) as texture:
+                texture = texture.convert('RGBA')
+                for frame in frames:
+                    x, y, w, h = frame['rect']
+                    if frame['rotated']:
+                        # 图集中顺时针旋转了 90 度，裁剪区域宽高互换
+                        sprite = texture.crop((x, y, x + h, y + w)).transpose(rotate_90)
+                    else:
+                        sprite = texture.crop((x, y, x + w, y + h))
+
+                    original_w, original_h = frame['originalSize']
+                    if (original_w, original_h) != (w, h) and original_w >= w and original_h >= h:
+                        # offset 为裁剪区域中心相对原图中心的偏移，y 轴向上
+                        left = int(round((original_w - w) / 2 + frame['offset'][0]))
+                        top = int(round((original_h - h) / 2 - frame['offset'][1]))
+                        canvas = Image.new('RGBA', (original_w, original_h), (0, 0, 0, 0))
+                        canvas.paste(sprite, (left, top))
+                        sprite = canvas
+
+                    buffer = io.BytesIO()
+                    sprite.save(buffer, 'PNG')
+                    results.append((self._uniqueName(frame['name'], used_names), buffer.getvalue()))
+        except Exception as e:
+            logger().error(f'提取纹理 {texture_path} 的精灵帧时出错: {e}')
+        return results
+
+    def _uniqueName(self, name, used_names):
+        """
+        生成同一纹理内不重复的文件名
+
+        Args:
+            name (str): 精灵帧名称
+            used_names (set): 已使用的名称
+
+        Returns:
+            str: 不重复的文件名
+        """
+        base = name.replace('/', '_').replace('\\', '_') or 'sprite'
+        candidate = base
+        index = 1
+        while candidate in used_names:
+            candidate = f'{base}_{index}'
+            index += 1
+        used_names.add(candidate)
+        return candidate
+
+    def getExtractedSprites(self):
+        """
+        获取已提取的精灵图片列表
+
+        Returns:
+            list: 精灵图片输出路径列表
+        """
+        return self.extracted_sprites
+
+
+# 创建全局实例
+spriteExtractor = SpriteExtractor()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+监视模式
+
+先完整处理一次源项目，之后定期扫描源目录的文件状态（修改时间、大小），
+变化平息一段时间后只把变化的文件交给 updateProject 增量处理。
+进程和各模块的缓存在两次处理之间保持不变。
+"""
+
+import os
+import time
+
+# 扫描间隔（秒）
+POLL_INTERVAL = 0.5
+
+# 最后一次变化后等待的时间（秒），编辑器保存、批量复制时只触发一次处理
+DEBOUNCE_SECONDS = 1.0
+
+
+def takeSnapshot(root, exclude=None):
+    """
+    记录目录下所有文件的状态
+
+    Args:
+        root (str): 根目录
+        exclude (str): 跳过的目录（输出目录位于源目录内时）
+
+    Returns:
+        dict: 文件路径 -> (修改时间纳秒, 文件大小)
+    """
+    exclude = os.path.normpath(exclude) if exclude else None
+    snapshot = {}
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir() and not entry.is_symlink():
+                            if os.path.normpath(entry.path) != exclude:
+                                stack.append(entry.path)
+                        else:
+                            stat_result = entry.stat()
+                            snapshot[entry.path] = (stat_result.st_mtime_ns, stat_result.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+    return snapshot
+
+
+def diffSnapshots(old, new):
+    """
+    比较两次快照
+
+    Args:
+        old (dict): 上一次的快照
+        new (dict): 本次的快照
+
+    Returns:
+        tuple: (新增或修改的文件列表, 已删除的文件列表)
+    """
+    changed = sorted(path for path, state in new.items() if old.get(path) != state)
+    removed = sorted(path for path in old if path not in new)
+    return changed, removed
+
+
+class ProjectWatcher:
+    """项目监视器类"""
+
+    def __init__(self, options, interval=POLL_INTERVAL, debounce=DEBOUNCE_SECONDS):
+        """
+        初始化
+
+        Args:
+            options (dict): 与 reverseProject 相同的配置选项
+            interval (float): 扫描间隔（秒）
+            debounce (float): 变化平息后等待的时间（秒）
+        """
+        self.options = options
+        self.interval = interval
+        self.debounce = debounce
+        self.source_path = options.get('sourcePath')
+        output_path = options.get('outputPath')
+        # 输出目录位于源目录内时不监视输出目录，否则每次输出都会再次触发处理
+        inside = output_path and os.path.normpath(output_path).startswith(os.path.join(os.path.normpath(self.source_path), ''))
+        self.exclude = output_path if inside else None
+
+    def run(self):
+        """
+        完整处理一次后持续监视，直到 Ctrl+C
+        """
+        from src.utils.logger import logger
+        from src.core.reverseEngine import reverseProject, updateProject
+
+        baseline = takeSnapshot(self.source_path, self.exclude)
+        reverseProject(self.options)
+        logger().success('逆向工程完成！')
+        logger().info(f'正在监视 {self.source_path} 的变化，按 Ctrl+C 退出')
+        logger().flush()
+
+        # 上一次扫描的结果及其首次出现的时间，用于判断变化是否已经平息
+        last_snapshot = baseline
+        quiet_since = time.monotonic()
+        try:
+            while True:
+                time.sleep(self.interval)
+                current = takeSnapshot(self.source_path, self.exclude)
+                if current != last_snapshot:
+                    last_snapshot = current
+                    quiet_since = time.monotonic()
+                    continue
+                if current == baseline or time.monotonic() - quiet_since < self.debounce:
+                    continue
+
+                changed, removed = diffSnapshots(baseline, current)
+                logger().info(f'检测到 {len(changed)} 个文件变化，{len(removed)} 个文件删除，开始增量处理...')
+                start = time.monotonic()
+                try:
+                    updateProject(self.options, changed, removed)
+                    logger().success(f'增量处理完成，耗时 {time.monotonic() - start:.2f}s')
+                except Exception as e:
+                    # 出错时保留进程，等下一次变化再处理
+                    logger().error(f'增量处理失败: {e}')
+                logger().flush()
+                baseline = current
+        except KeyboardInterrupt:
+            logger().info('已停止监视')
+            logger().flush()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+文件清单
+
+基于 os.scandir 遍历源项目，每个目录只扫描一次并缓存结果，
+版本检测、资源处理等阶段共享同一份清单，大型项目只需遍历一次。
+"""
+
+import os
+import fnmatch
+import threading
+
+
+class InventoryEntry:
+    """清单条目，包装 os.DirEntry 并保存相对路径"""
+
+    __slots__ = ('path', 'rel_path', 'name', 'is_dir', '_entry')
+
+    def __init__(self, entry, rel_path, is_dir):
+        """
+        初始化
+
+        Args:
+            entry (os.DirEntry): 目录条目
+            rel_path (str): 相对于清单根目录的路径
+            is_dir (bool): 是否为目录
+        """
+        self.path = entry.path
+        self.rel_path = rel_path
+        self.name = entry.name
+        self.is_dir = is_dir
+        self._entry = entry
+
+    def stat(self):
+        """
+        获取文件状态（由 DirEntry 缓存，多次调用只查询一次）
+
+        Returns:
+            os.stat_result: 文件状态
+        """
+        return self._entry.stat()
+
+
+class FileInventory:
+    """文件清单类"""
+
+    def __init__(self, root):
+        """
+        初始化
+
+        Args:
+            root (str): 清单根目录
+        """
+        self.root = root
+        self._lock = threading.Lock()
+        self._dirs = {}
+
+    def listDir(self, rel_dir=''):
+        """
+        列出目录内容，结果缓存
+
+        Args:
+            rel_dir (str): 相对于根目录的目录路径，''表示根目录
+
+        Returns:
+            list: 清单条目列表（保持 scandir 顺序）
+        """
+        entries = self._dirs.get(rel_dir)
+        if entries is not None:
+            return entries
+
+        entries = []
+        prefix = rel_dir + os.sep if rel_dir else ''
+        try:
+            with os.scandir(os.path.join(self.root, rel_dir) if rel_dir else self.root) as it:
+                for entry in it:
+                    try:
+                        # 与 os.walk 一致：不进入指向目录的符号链接
+                        is_dir = entry.is_dir() and not entry.is_symlink()
+                    except OSError:
+                        continue
+                    entries.append(InventoryEntry(entry, prefix + entry.name, is_dir))
+        except OSError:
+            pass
+
+        with self._lock:
+            return self._dirs.setdefault(rel_dir, entries)
+
+    def walkFiles(self, rel_dir=''):
+        """
+        深度优先遍历目录下的所有文件
+
+        Args:
+            rel_dir (str): 相对于根目录的目录路径
+
+        Yields:
+            InventoryEntry: 文件条目
+        """
+        stack = [rel_dir]
+        while stack:
+            subdirs = []
+            for entry in self.listDir(stack.pop()):
+                if entry.is_dir:
+                    subdirs.append(entry.rel_path)
+                else:
+                    yield entry
+            stack.extend(reversed(subdirs))
+
+    def glob(self, pattern):
+        """
+        按通配符查找文件或目录（通配符只作用于最后一级）
+
+        Args:
+            pattern (str): 相对于根目录的模式，使用 / 分隔，如 'src/settings*.js'
+
+        Returns:
+            list: 匹配的绝对路径列表
+        """
+        parts = pattern.split('/')
+        rel_dir = os.sep.join(parts[:-1])
+        name_pattern = parts[-1]
+        # 与 glob.glob 一致：通配符不匹配隐藏文件
+        return [
+            entry.path for entry in self.listDir(rel_dir)
+            if fnmatch.fnmatch(entry.name, name_pattern)
+            and (not entry.name.startswith('.') or name_pattern.startswith('.'))
+        ]
+
+    def relativeTo(self, path):
+        """
+        将路径转换为相对于根目录的路径
+
+        Args:
+            path (str): 路径
+
+        Returns:
+            str: 相对路径（根目录本身为''），不在根目录下时返回None
+        """
+        rel_path = os.path.relpath(os.path.abspath(path), os.path.abspath(self.root))
+        if rel_path == os.curdir:
+            return ''
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            return None
+        return rel_path
+
+    def clear(self):
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._dirs.clear()
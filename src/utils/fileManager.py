@@ -4,12 +4,257 @@
 """
 
 import os
+import sys
+import time
+import queue
 import shutil
-from tqdm import tqdm
+import threading
+import subprocess
+from src.utils.metrics import metrics
+
+# 写后缓冲的默认 I/O 线程数、队列容量和等待写入的总字节数上限
+WRITE_BEHIND_WORKERS = 4
+WRITE_BEHIND_QUEUE_SIZE = 1024
+WRITE_BEHIND_MAX_BYTES = 64 * 1024 * 1024
+
+# 后台删除前目录被重命名为的前缀
+TRASH_PREFIX = '.cc-reverse-trash-'
+
+class AsyncWriter:
+    """
+    写后缓冲
+    
+    文件的写入放入队列，由若干 I/O 线程在后台完成，生成代码与写盘可以并行。
+    队列按路径哈希分片，同一路径的写入总由同一个线程按提交顺序完成。
+    等待写入的文件数或总字节数超过上限时提交方阻塞（背压）；写入失败的异常在 flush() 时抛出。
+    """
+    
+    def __init__(self, workers=WRITE_BEHIND_WORKERS, max_pending=WRITE_BEHIND_QUEUE_SIZE,
+                 max_bytes=WRITE_BEHIND_MAX_BYTES):
+        """
+        初始化
+        
+        Args:
+            workers (int): I/O 线程数
+            max_pending (int): 队列中最多等待的写入数
+            max_bytes (int): 队列中等待写入的最大总字节数（单个更大的写入在队列为空时仍可提交）
+        """
+        self._queues = [queue.Queue(maxsize=max(1, max_pending // workers)) for _ in range(workers)]
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._pending = {}  # 路径 -> 尚未完成的写入数
+        self._pending_bytes = 0
+        self._errors = []
+        self._threads = []
+        for i, work_queue in enumerate(self._queues):
+            thread = threading.Thread(target=self._run, args=(work_queue,), name=f'cc-reverse-writer-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def submit(self, path, func, *args, size=0):
+        """
+        提交写入任务，队列满或等待写入的字节数超过上限时阻塞
+        
+        Args:
+            path (str): 写入的文件路径
+            func (callable): 写入函数
+            *args: 写入函数的参数
+            size (int): 写入的字节数（用于背压）
+        """
+        with self._space:
+            while self._pending_bytes and self._pending_bytes + size > self._max_bytes:
+                self._space.wait()
+            self._pending_bytes += size
+            self._pending[path] = self._pending.get(path, 0) + 1
+        self._queues[hash(path) % len(self._queues)].put((path, func, args, size))
+    
+    def isPending(self, path):
+        """
+        检查文件是否还有未完成的写入
+        
+        Args:
+            path (str): 文件路径
+        
+        Returns:
+            bool: 是否有未完成的写入
+        """
+        return path in self._pending
+    
+    def queueSize(self):
+        """
+        获取队列中等待的写入数
+        
+        Returns:
+            int: 等待的写入数
+        """
+        return sum(work_queue.qsize() for work_queue in self._queues)
+    
+    def pendingBytes(self):
+        """
+        获取等待写入的总字节数
+        
+        Returns:
+            int: 字节数
+        """
+        return self._pending_bytes
+    
+    def flush(self):
+        """
+        等待所有写入完成，有写入失败时抛出异常
+        """
+        for work_queue in self._queues:
+            work_queue.join()
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            path, error = errors[0]
+            raise Exception(f'写入文件 {path} 失败: {error}（共 {len(errors)} 个文件写入失败）')
+    
+    def close(self):
+        """
+        等待所有写入完成并停止 I/O 线程
+        """
+        try:
+            self.flush()
+        finally:
+            for work_queue in self._queues:
+                work_queue.put(None)
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+    
+    def _run(self, work_queue):
+        """
+        I/O 线程主循环
+        
+        Args:
+            work_queue (queue.Queue): 该线程负责的队列分片
+        """
+        while True:
+            item = work_queue.get()
+            if item is None:
+                work_queue.task_done()
+                return
+            path, func, args, size = item
+            try:
+                func(*args)
+            except Exception as e:
+                with self._lock:
+                    self._errors.append((path, e))
+            finally:
+                with self._space:
+                    count = self._pending.get(path, 1) - 1
+                    if count:
+                        self._pending[path] = count
+                    else:
+                        self._pending.pop(path, None)
+                    self._pending_bytes -= size
+                    self._space.notify_all()
+                work_queue.task_done()
 
 class FileManager:
     """文件管理类"""
     
+    def __init__(self):
+        """初始化"""
+        # 已确认存在的目录，避免每写一个文件都调用一次 makedirs
+        self._dir_lock = threading.Lock()
+        self._known_dirs = set()
+        # 写后缓冲，未开启时同步写入
+        self._writer = None
+        # 写入指标
+        self._files_written = metrics.counter('files_written_total', '写入的文件数')
+        self._bytes_written = metrics.counter('bytes_written_total', '写入的字节数（文本按字符数计）')
+        metrics.gauge('write_queue_depth', '写后缓冲队列中等待写入的文件数',
+                      func=lambda: self._writer.queueSize() if self._writer is not None else 0)
+        metrics.gauge('write_queue_bytes', '写后缓冲队列中等待写入的字节数',
+                      func=lambda: self._writer.pendingBytes() if self._writer is not None else 0)
+    
+    def startWriteBehind(self, workers=WRITE_BEHIND_WORKERS, max_pending=WRITE_BEHIND_QUEUE_SIZE,
+                         max_bytes=WRITE_BEHIND_MAX_BYTES):
+        """
+        开启写后缓冲，之后的 writeFile / writeFileIfChanged 在后台线程中完成
+        
+        Args:
+            workers (int): I/O 线程数
+            max_pending (int): 队列中最多等待的写入数
+            max_bytes (int): 队列中等待写入的最大总字节数
+        """
+        if self._writer is None:
+            self._writer = AsyncWriter(workers, max_pending, max_bytes)
+    
+    def stopWriteBehind(self):
+        """
+        等待所有写入完成并关闭写后缓冲，有写入失败时抛出异常
+        """
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+    
+    def flush(self):
+        """
+        等待所有已提交的写入完成，有写入失败时抛出异常
+        """
+        if self._writer is not None:
+            self._writer.flush()
+    
+    def isPendingWrite(self, path):
+        """
+        检查文件是否还有未完成的后台写入
+        
+        Args:
+            path (str): 文件路径
+        
+        Returns:
+            bool: 是否有未完成的写入
+        """
+        return self._writer is not None and self._writer.isPending(path)
+    
+    def ensureDirectory(self, path):
+        """
+        确保目录存在，已确认存在的目录直接跳过
+        
+        Args:
+            path (str): 目录路径
+        """
+        if not path or path in self._known_dirs:
+            return
+        os.makedirs(path, exist_ok=True)
+        
+        # 记录该目录及其所有上级目录
+        with self._dir_lock:
+            while path and path not in self._known_dirs:
+                self._known_dirs.add(path)
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+    
+    def ensureDirectories(self, paths):
+        """
+        批量创建目录，排序后一次性创建，上级目录先于子目录
+        
+        Args:
+            paths (iterable): 目录路径列表
+        """
+        for path in sorted(set(paths)):
+            self.ensureDirectory(path)
+    
+    def resetDirectoryCache(self, path=None):
+        """
+        清除目录缓存
+        
+        Args:
+            path (str): 只清除该目录及其子目录，为None时全部清除
+        """
+        with self._dir_lock:
+            if path is None:
+                self._known_dirs.clear()
+                return
+            prefix = os.path.join(path, '')
+            self._known_dirs = {d for d in self._known_dirs if d != path and not d.startswith(prefix)}
+    
     def copyFile(self, src, dst, show_progress=False):
         """
         复制文件
@@ -20,10 +265,10 @@ class FileManager:
             show_progress (bool): 是否显示进度条
         """
         # 确保目标目录存在，跳过当前目录（空字符串）
-        dst_dir = os.path.dirname(dst)
-        if dst_dir:
-            os.makedirs(dst_dir, exist_ok=True)
+        self.ensureDirectory(os.path.dirname(dst))
         shutil.copy2(src, dst)
+        self._files_written.inc()
+        self._bytes_written.inc(os.path.getsize(dst))
     
     def copyDirectory(self, src, dst, show_progress=False):
         """
@@ -45,6 +290,7 @@ class FileManager:
         
         # 复制文件
         if show_progress:
+            from tqdm import tqdm
             for src_file in tqdm(files, desc="复制文件"):
                 rel_path = os.path.relpath(src_file, src)
                 dst_file = os.path.join(dst, rel_path)
@@ -55,16 +301,27 @@ class FileManager:
     
     def writeFile(self, path, content):
         """
-        写入文件
+        写入文件，开启写后缓冲时在后台完成
+        
+        Args:
+            path (str): 文件路径
+            content (str or bytes): 文件内容
+        """
+        if self._writer is not None:
+            self._writer.submit(path, self._writeFileSync, path, content, size=len(content))
+        else:
+            self._writeFileSync(path, content)
+    
+    def _writeFileSync(self, path, content):
+        """
+        同步写入文件
         
         Args:
             path (str): 文件路径
             content (str or bytes): 文件内容
         """
         # 确保目标目录存在，跳过当前目录（空字符串）
-        dst_dir = os.path.dirname(path)
-        if dst_dir:
-            os.makedirs(dst_dir, exist_ok=True)
+        self.ensureDirectory(os.path.dirname(path))
         
         if isinstance(content, bytes):
             with open(path, "wb") as f:
@@ -72,6 +329,48 @@ class FileManager:
         else:
             with open(path, "w", encoding="utf-8") as f:
                 f.write(content)
+        self._files_written.inc()
+        self._bytes_written.inc(len(content))
+    
+    def writeFileIfChanged(self, path, content):
+        """
+        写入文件，内容与已有文件完全一致时跳过
+        在调用方线程中比较，开启写后缓冲时只有写入在后台完成
+        
+        Args:
+            path (str): 文件路径
+            content (str or bytes): 文件内容
+        
+        Returns:
+            bool: 写入（或已提交写入）新内容返回True，内容未变化返回False
+        """
+        data = content if isinstance(content, bytes) else content.encode("utf-8")
+        
+        # 还有未完成的写入时磁盘上的内容不是最终内容，直接写入
+        if not self.isPendingWrite(path) and self._isSameContent(path, data):
+            return False
+        
+        self.writeFile(path, data)
+        return True
+    
+    def _isSameContent(self, path, data):
+        """
+        检查已有文件的内容是否与给定内容完全一致
+        
+        Args:
+            path (str): 文件路径
+            data (bytes): 内容
+        
+        Returns:
+            bool: 一致返回True，文件不存在或内容不同返回False
+        """
+        try:
+            if os.path.getsize(path) == len(data):
+                with open(path, "rb") as f:
+                    return f.read() == data
+        except OSError:
+            pass
+        return False
     
     def readFile(self, path, mode="r"):
         """
@@ -106,6 +405,7 @@ class FileManager:
         """
         if os.path.exists(path):
             shutil.rmtree(path)
+        self.resetDirectoryCache(path)
     
     def cleanDirectory(self, path):
         """
@@ -121,6 +421,107 @@ class FileManager:
                     os.remove(item_path)
                 else:
                     shutil.rmtree(item_path)
+                    self.resetDirectoryCache(item_path)
+    
+    def removeDirectoryInBackground(self, path, recreate=False, detach=True, root=None):
+        """
+        快速删除目录：先原子地重命名到输出根目录之外的回收目录（见 getTrashDirectory），再在后台删除，
+        重命名完成后输出目录中已不再包含它
+        
+        Args:
+            path (str): 目录路径
+            recreate (bool): 重命名后是否重新创建空目录
+            detach (bool): 为True时由独立的辅助进程删除（当前进程可以立即退出），
+                否则在后台线程中删除
+            root (str): 输出根目录（可选，默认为目录的上级目录）
+        
+        Returns:
+            str: 回收目录路径，目录不存在时返回None
+        """
+        if not os.path.exists(path):
+            return None
+        
+        path = os.path.abspath(path)
+        trash_path = os.path.join(self.getTrashDirectory(path, root), f'{TRASH_PREFIX}{os.getpid()}-{time.time_ns()}')
+        try:
+            os.rename(path, trash_path)
+        except OSError:
+            # 无法重命名（如目录本身是挂载点）时直接删除
+            shutil.rmtree(path, ignore_errors=True)
+            trash_path = None
+        self.resetDirectoryCache(path)
+        if recreate:
+            self.ensureDirectory(path)
+        
+        if trash_path is not None:
+            self._deleteInBackground(trash_path, detach)
+        return trash_path
+    
+    def getTrashDirectory(self, path, root=None):
+        """
+        获取目录删除前重命名到的位置：与输出根目录在同一文件系统时为系统临时目录，
+        否则为输出根目录的上级目录（重命名不能跨文件系统）
+        
+        Args:
+            path (str): 要删除的目录
+            root (str): 输出根目录（可选，默认为目录的上级目录）
+        
+        Returns:
+            str: 回收目录所在的目录
+        """
+        import tempfile
+        
+        parent = os.path.dirname(os.path.abspath(root or os.path.dirname(os.path.abspath(path))))
+        temp_dir = tempfile.gettempdir()
+        try:
+            if os.stat(temp_dir).st_dev == os.stat(parent).st_dev:
+                return temp_dir
+        except OSError:
+            pass
+        return parent
+    
+    def sweepTrash(self, directory, detach=True):
+        """
+        在后台删除以往运行中未删除完的回收目录
+        
+        Args:
+            directory (str): 回收目录所在的目录
+            detach (bool): 是否由独立的辅助进程删除
+        """
+        if not os.path.isdir(directory):
+            return
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(TRASH_PREFIX) and entry.is_dir(follow_symlinks=False):
+                    self._deleteInBackground(entry.path, detach)
+    
+    def _deleteInBackground(self, path, detach=True):
+        """
+        在后台删除目录
+        
+        Args:
+            path (str): 目录路径
+            detach (bool): 是否由独立的辅助进程删除，启动失败时回退到后台线程
+        """
+        if detach:
+            try:
+                kwargs = {}
+                if os.name == 'nt':
+                    kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+                else:
+                    kwargs['start_new_session'] = True
+                subprocess.Popen(
+                    [sys.executable, '-c', 'import shutil, sys; shutil.rmtree(sys.argv[1], ignore_errors=True)', path],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    close_fds=True,
+                    **kwargs
+                )
+                return
+            except OSError:
+                pass
+        threading.Thread(target=shutil.rmtree, args=(path, True), name='cc-reverse-cleanup').start()
     
     def getFiles(self, directory, pattern=None):
         """
@@ -133,12 +534,11 @@ class FileManager:
         Returns:
             list: 文件路径列表
         """
-        files = []
-        for root, _, filenames in os.walk(directory):
-            for filename in filenames:
-                if pattern is None or filename.endswith(pattern):
-                    files.append(os.path.join(root, filename))
-        return files
+        from src.utils.fileInventory import FileInventory
+        return [
+            entry.path for entry in FileInventory(directory).walkFiles()
+            if pattern is None or entry.name.endswith(pattern)
+        ]
     
     def getDirectories(self, directory):
         """
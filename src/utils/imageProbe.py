@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+图像尺寸探测工具
+
+只读取 PNG / JPEG / WebP 文件头即可获得尺寸和像素格式，无需加载 PIL。
+结果按路径和修改时间缓存在有界的 LRU 缓存中，同一次运行中每张图片只探测一次，
+常驻的后台服务在多个任务之间复用缓存也不会无限增长。
+"""
+
+import io
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+# 各格式的文件签名
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+JPEG_SIGNATURE = b'\xff\xd8'
+
+# 默认缓存容量
+DEFAULT_CACHE_SIZE = 65536
+
+# 探测时读取的文件头长度
+HEADER_SIZE = 512
+
+# JPEG 中最多跳过的段数，防止损坏文件导致长时间扫描
+MAX_JPEG_SEGMENTS = 256
+
+# 图像扩展名
+IMAGE_EXTENSIONS = frozenset(['.png', '.jpg', '.jpeg', '.webp'])
+
+# PNG 颜色类型对应的像素格式
+PNG_PIXEL_FORMATS = {
+    0: 'L8',
+    2: 'RGB888',
+    3: 'PALETTE',
+    4: 'LA88',
+    6: 'RGBA8888'
+}
+
+# JPEG 颜色分量数对应的像素格式
+JPEG_PIXEL_FORMATS = {
+    1: 'L8',
+    3: 'RGB888',
+    4: 'CMYK'
+}
+
+
+class ImageProbe:
+    """图像尺寸探测类"""
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        初始化
+
+        Args:
+            cache_size (int): 缓存容量
+        """
+        self._lock = threading.Lock()
+        self._cache_size = cache_size
+        self._cache = OrderedDict()  # (路径, 修改时间, 大小) -> 图像信息
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, path, stat_result=None):
+        """
+        探测图像信息
+
+        Args:
+            path (str): 图像路径
+            stat_result (os.stat_result): 已知的文件状态（可选，避免重复 stat）
+
+        Returns:
+            dict: 图像信息（format、width、height、pixelFormat），无法识别时返回 None
+        """
+        try:
+            st = stat_result or os.stat(path)
+        except OSError:
+            return None
+
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        try:
+            with open(path, 'rb') as f:
+                info = self._probeStream(f)
+        except (OSError, struct.error, IndexError):
+            info = None
+
+        with self._lock:
+            self._cache[key] = info
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return info
+
+    def probeData(self, data):
+        """
+        探测内存中的图像数据（不缓存）
+
+        Args:
+            data (bytes): 图像数据
+
+        Returns:
+            dict: 图像信息，无法识别时返回 None
+        """
+        try:
+            return self._probeStream(io.BytesIO(data))
+        except (struct.error, IndexError):
+            return None
+
+    def getSize(self, path):
+        """
+        获取图像尺寸
+
+        Args:
+            path (str): 图像路径
+
+        Returns:
+            tuple: (宽, 高)，无法识别时返回 None
+        """
+        info = self.probe(path)
+        return (info['width'], info['height']) if info else None
+
+    def clear(self):
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _probeStream(self, f):
+        """
+        从文件流中解析图像信息
+
+        Args:
+            f (file): 以二进制模式打开的文件
+
+        Returns:
+            dict: 图像信息，无法识别时返回 None
+        """
+        header = f.read(HEADER_SIZE)
+        if header[:8] == PNG_SIGNATURE:
+            return self._probePng(header)
+        if header[:2] == JPEG_SIGNATURE:
+            return self._probeJpeg(f)
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return self._probeWebp(header)
+        return None
+
+    def _probePng(self, header):
+        """
+        解析 PNG 的 IHDR 块
+
+        Args:
+            header (bytes): 文件头
+
+        Returns:
+            dict: 图像信息
+        """
+        if len(header) < 29 or header[12:16] != b'IHDR':
+            return None
+        width, height, bit_depth, color_type = struct.unpack('>IIBB', header[16:26])
+        pixel_format = PNG_PIXEL_FORMATS.get(color_type, 'UNKNOWN')
+        if bit_depth == 16 and color_type != 3:
+            pixel_format += '_16'
+        return {
+            'format': 'png',
+            'width': width,
+            'height': height,
+            'pixelFormat': pixel_format
+        }
+
+    def _probeJpeg(self, f):
+        """
+        逐段扫描 JPEG，读取 SOF 段中的尺寸，跳过的段只读取段头
+
+        Args:
+            f (file): 以二进制模式打开的文件
+
+        Returns:
+            dict: 图像信息
+        """
+        f.seek(2)
+        for _ in range(MAX_JPEG_SEGMENTS):
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            code = marker[1]
+            # 填充字节
+            while code == 0xFF:
+                code = f.read(1)[0]
+            # 无长度的独立标记
+            if code == 0x01 or 0xD0 <= code <= 0xD7:
+                continue
+            length = struct.unpack('>H', f.read(2))[0]
+            # SOF0~SOF15，排除 DHT(C4)、JPG(C8)、DAC(CC)
+            if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                _, height, width, components = struct.unpack('>BHHB', f.read(6))
+                return {
+                    'format': 'jpeg',
+                    'width': width,
+                    'height': height,
+                    'pixelFormat': JPEG_PIXEL_FORMATS.get(components, 'UNKNOWN')
+                }
+            if code == 0xDA:
+                # 进入图像数据仍未找到 SOF
+                return None
+            f.seek(length - 2, os.SEEK_CUR)
+        return None
+
+    def _probeWebp(self, header):
+        """
+        解析 WebP 的 VP8 / VP8L / VP8X 块
+
+        Args:
+            header (bytes): 文件头
+
+        Returns:
+            dict: 图像信息
+        """
+        chunk = header[12:16]
+        if chunk == b'VP8 ' and len(header) >= 30:
+            width, height = struct.unpack('<HH', header[26:30])
+            width &= 0x3FFF
+            height &= 0x3FFF
+            has_alpha = False
+        elif chunk == b'VP8L' and len(header) >= 25:
+            bits = struct.unpack('<I', header[21:25])[0]
+            width = (bits & 0x3FFF) + 1
+            height = ((bits >> 14) & 0x3FFF) + 1
+            has_alpha = bool((bits >> 28) & 1)
+        elif chunk == b'VP8X' and len(header) >= 30:
+            has_alpha = bool(header[20] & 0x10)
+            width = int.from_bytes(header[24:27], 'little') + 1
+            height = int.from_bytes(header[27:30], 'little') + 1
+        else:
+            return None
+        return {
+            'format': 'webp',
+            'width': width,
+            'height': height,
+            'pixelFormat': 'RGBA8888' if has_alpha else 'RGB888'
+        }
+
+
+# 创建全局实例
+imageProbe = ImageProbe()
@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+JavaScript 对象字面量解析器
+
+解析 Cocos Creator 构建产物 settings.js 中使用的字面量子集：
+对象（带引号或不带引号的键）、数组、单/双引号字符串（含转义）、数字、
+true / false / null / undefined、尾随逗号和注释。
+
+按下标在原字符串上单遍扫描，连续的普通字符用正则一次匹配，不生成中间副本。
+parseSettingsLazily 只扫描顶层键的位置，各个字段在首次访问时才解析。
+"""
+
+import re
+import threading
+from collections.abc import Mapping
+
+# 空白（含换行）
+WHITESPACE_RE = re.compile(r'\s*')
+
+# 数字（十进制、小数、指数、十六进制）
+NUMBER_RE = re.compile(r'[+-]?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+
+# 标识符（不带引号的键和关键字）
+IDENTIFIER_RE = re.compile(r'[A-Za-z_$][\w$]*')
+
+# 数组中的简单元素（不含转义的双引号字符串或整数）及其后的逗号或结束括号，批量匹配
+SIMPLE_ITEM_RE = re.compile(r'\s*(?:"([^"\\\r\n]*)"|(-?\d+)(?![\w.]))\s*,')
+SIMPLE_LAST_ITEM_RE = re.compile(r'\s*(?:"([^"\\\r\n]*)"|(-?\d+)(?![\w.]))\s*\]')
+
+# 对象中的简单键（不含转义的双引号字符串或标识符）及其后的冒号
+SIMPLE_KEY_RE = re.compile(r'\s*(?:"([^"\\\r\n]*)"|([A-Za-z_$][\w$]*))\s*:')
+
+# 空白及注释的起始字符
+SKIP_CHARS = frozenset(' \t\r\n\ufeff\u00a0\u2028\u2029/')
+
+# 字符串中不需要特殊处理的字符
+DOUBLE_QUOTED_RUN_RE = re.compile(r'[^"\\\r\n]*')
+SINGLE_QUOTED_RUN_RE = re.compile(r"[^'\\\r\n]*")
+
+# 跳过值时可以整段越过的内容：普通字符和不含转义的字符串
+SKIP_RUN_RE = re.compile(r'[^"\'{}\[\]()/]*(?:(?:"[^"\\\r\n]*"|\'[^\'\\\r\n]*\')[^"\'{}\[\]()/]*)*')
+
+# 开括号与闭括号
+OPEN_BRACKETS = frozenset('{[(')
+CLOSE_BRACKETS = frozenset('}])')
+
+# settings 的赋值语句，如 window._CCSettings = {...}
+SETTINGS_ASSIGNMENT_RE = re.compile(r'\b_?CCSettings\s*=\s*(?=[{(])')
+
+# 关键字对应的值
+KEYWORDS = {
+    'true': True,
+    'false': False,
+    'null': None,
+    'undefined': None,
+    'NaN': float('nan'),
+    'Infinity': float('inf')
+}
+
+# 单字符转义
+SIMPLE_ESCAPES = {
+    'n': '\n',
+    't': '\t',
+    'r': '\r',
+    'b': '\b',
+    'f': '\f',
+    'v': '\v',
+    '0': '\0'
+}
+
+
+class JsLiteralError(Exception):
+    """字面量语法错误"""
+
+    def __init__(self, message, pos):
+        super().__init__(f'{message} (位置 {pos})')
+        self.pos = pos
+
+
+class JsLiteralParser:
+    """JavaScript 对象字面量解析器类"""
+
+    def __init__(self, text):
+        """
+        初始化
+
+        Args:
+            text (str): 源代码
+        """
+        self.text = text
+        self.length = len(text)
+
+    def skipWhitespace(self, pos):
+        """
+        跳过空白和注释
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            int: 第一个有效字符的位置
+        """
+        text = self.text
+        if pos < self.length and text[pos] not in SKIP_CHARS:
+            return pos
+        while True:
+            pos = WHITESPACE_RE.match(text, pos).end()
+            if text.startswith('//', pos):
+                end = text.find('\n', pos)
+                pos = self.length if end < 0 else end + 1
+            elif text.startswith('/*', pos):
+                end = text.find('*/', pos + 2)
+                if end < 0:
+                    raise JsLiteralError('注释未结束', pos)
+                pos = end + 2
+            else:
+                return pos
+
+    def parseValue(self, pos):
+        """
+        解析一个值
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            tuple: (值, 值之后的位置)
+        """
+        pos = self.skipWhitespace(pos)
+        if pos >= self.length:
+            raise JsLiteralError('意外的结尾', pos)
+
+        char = self.text[pos]
+        if char == '{':
+            return self._parseObject(pos + 1)
+        if char == '[':
+            return self._parseArray(pos + 1)
+        if char == '"' or char == "'":
+            return self._parseString(pos)
+        if char == '(':
+            # 括号包裹的值，如 window._CCSettings = ({...})
+            value, pos = self.parseValue(pos + 1)
+            pos = self._expect(pos, ')')
+            return value, pos
+
+        match = NUMBER_RE.match(self.text, pos)
+        if match:
+            return self._toNumber(match.group()), match.end()
+
+        match = IDENTIFIER_RE.match(self.text, pos)
+        if match and match.group() in KEYWORDS:
+            return KEYWORDS[match.group()], match.end()
+        raise JsLiteralError(f'无法识别的值 {self.text[pos:pos + 20]!r}', pos)
+
+    def skipValue(self, pos):
+        """
+        跳过一个值而不构造它，只检查括号配对和字符串边界
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            int: 值之后的位置
+        """
+        text = self.text
+        pos = self.skipWhitespace(pos)
+        if pos >= self.length:
+            raise JsLiteralError('意外的结尾', pos)
+        char = text[pos]
+        if char == '"' or char == "'":
+            return self._skipString(pos)
+        if char not in OPEN_BRACKETS:
+            # 数字和关键字很短，直接解析
+            return self.parseValue(pos)[1]
+
+        start = pos
+        depth = 0
+        while True:
+            pos = SKIP_RUN_RE.match(text, pos).end()
+            if pos >= self.length:
+                raise JsLiteralError('括号未闭合', start)
+            char = text[pos]
+            if char in OPEN_BRACKETS:
+                depth += 1
+                pos += 1
+            elif char in CLOSE_BRACKETS:
+                depth -= 1
+                pos += 1
+                if depth == 0:
+                    return pos
+            elif char == '/':
+                skipped = self.skipWhitespace(pos)
+                pos = skipped if skipped > pos else pos + 1
+            else:
+                # 含转义的字符串
+                pos = self._skipString(pos)
+
+    def _skipString(self, pos):
+        """
+        跳过字符串（起始位置位于引号处）
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            int: 字符串之后的位置
+        """
+        text = self.text
+        quote = text[pos]
+        run_re = DOUBLE_QUOTED_RUN_RE if quote == '"' else SINGLE_QUOTED_RUN_RE
+        start = pos
+        pos += 1
+        while True:
+            pos = run_re.match(text, pos).end()
+            if pos >= self.length:
+                raise JsLiteralError('字符串未结束', start)
+            char = text[pos]
+            if char == quote:
+                return pos + 1
+            if char != '\\':
+                raise JsLiteralError('字符串中出现换行', pos)
+            # 续行转义 \r\n 占三个字符
+            pos += 3 if text.startswith('\r\n', pos + 1) else 2
+
+    def scanObjectKeys(self, pos):
+        """
+        扫描对象的顶层键，只记录每个值的起始位置，不解析值
+
+        Args:
+            pos (int): 对象起始位置（位于 { 处，允许前置空白）
+
+        Returns:
+            tuple: (键 -> 值起始位置的字典, 对象之后的位置)
+        """
+        text = self.text
+        pos = self.skipWhitespace(pos)
+        if text.startswith('(', pos):
+            offsets, pos = self.scanObjectKeys(pos + 1)
+            return offsets, self._expect(pos, ')')
+        if not text.startswith('{', pos):
+            raise JsLiteralError('不是对象', pos)
+        pos += 1
+
+        offsets = {}
+        while True:
+            pos = self.skipWhitespace(pos)
+            if pos >= self.length:
+                raise JsLiteralError('对象未结束', pos)
+            if text[pos] == '}':
+                return offsets, pos + 1
+
+            key, pos = self._parseKey(pos)
+            pos = self.skipWhitespace(self._expect(pos, ':'))
+            offsets[key] = pos
+            pos = self.skipWhitespace(self.skipValue(pos))
+            if text.startswith(',', pos):
+                pos += 1
+            elif not text.startswith('}', pos):
+                raise JsLiteralError('对象中缺少逗号', pos)
+
+    def _parseObject(self, pos):
+        """
+        解析对象（起始位置位于 { 之后）
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            tuple: (dict, 对象之后的位置)
+        """
+        result = {}
+        text = self.text
+        while True:
+            match = SIMPLE_KEY_RE.match(text, pos)
+            if match:
+                key = match.group(1)
+                if key is None:
+                    key = match.group(2)
+                pos = match.end()
+            else:
+                pos = self.skipWhitespace(pos)
+                if pos >= self.length:
+                    raise JsLiteralError('对象未结束', pos)
+                if text[pos] == '}':
+                    return result, pos + 1
+
+                key, pos = self._parseKey(pos)
+                pos = self._expect(pos, ':')
+            result[key], pos = self.parseValue(pos)
+
+            pos = self.skipWhitespace(pos)
+            if text.startswith(',', pos):
+                pos += 1
+            elif not text.startswith('}', pos):
+                raise JsLiteralError('对象中缺少逗号', pos)
+
+    def _parseArray(self, pos):
+        """
+        解析数组（起始位置位于 [ 之后）
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            tuple: (list, 数组之后的位置)
+        """
+        result = []
+        text = self.text
+        append = result.append
+        while True:
+            # UUID 表等大数组的元素大多是简单字符串或整数，整段匹配
+            match = SIMPLE_ITEM_RE.match(text, pos)
+            while match:
+                string, number = match.groups()
+                append(string if number is None else int(number))
+                pos = match.end()
+                match = SIMPLE_ITEM_RE.match(text, pos)
+            match = SIMPLE_LAST_ITEM_RE.match(text, pos)
+            if match:
+                string, number = match.groups()
+                append(string if number is None else int(number))
+                return result, match.end()
+
+            pos = self.skipWhitespace(pos)
+            if pos >= self.length:
+                raise JsLiteralError('数组未结束', pos)
+            if text[pos] == ']':
+                return result, pos + 1
+
+            value, pos = self.parseValue(pos)
+            append(value)
+
+            pos = self.skipWhitespace(pos)
+            if text.startswith(',', pos):
+                pos += 1
+            elif not text.startswith(']', pos):
+                raise JsLiteralError('数组中缺少逗号', pos)
+
+    def _parseKey(self, pos):
+        """
+        解析对象的键（带引号、不带引号或数字）
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            tuple: (键, 键之后的位置)
+        """
+        char = self.text[pos]
+        if char == '"' or char == "'":
+            return self._parseString(pos)
+        match = IDENTIFIER_RE.match(self.text, pos) or NUMBER_RE.match(self.text, pos)
+        if not match:
+            raise JsLiteralError('无效的键', pos)
+        return match.group(), match.end()
+
+    def _parseString(self, pos):
+        """
+        解析字符串（起始位置位于引号处）
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            tuple: (str, 字符串之后的位置)
+        """
+        text = self.text
+        quote = text[pos]
+        run_re = DOUBLE_QUOTED_RUN_RE if quote == '"' else SINGLE_QUOTED_RUN_RE
+        start = pos
+        pos += 1
+
+        # 没有转义的字符串直接切片
+        end = run_re.match(text, pos).end()
+        if text.startswith(quote, end):
+            return text[pos:end], end + 1
+
+        parts = []
+        while True:
+            end = run_re.match(text, pos).end()
+            parts.append(text[pos:end])
+            if end >= self.length:
+                raise JsLiteralError('字符串未结束', start)
+            char = text[end]
+            if char == quote:
+                return ''.join(parts), end + 1
+            if char != '\\':
+                raise JsLiteralError('字符串中出现换行', end)
+            value, pos = self._parseEscape(end + 1)
+            parts.append(value)
+
+    def _parseEscape(self, pos):
+        """
+        解析转义序列（起始位置位于反斜杠之后）
+
+        Args:
+            pos (int): 起始位置
+
+        Returns:
+            tuple: (转义后的字符, 转义序列之后的位置)
+        """
+        text = self.text
+        if pos >= self.length:
+            raise JsLiteralError('转义序列未结束', pos)
+        char = text[pos]
+        if char in SIMPLE_ESCAPES and not (char == '0' and text[pos + 1:pos + 2].isdigit()):
+            return SIMPLE_ESCAPES[char], pos + 1
+        if char == 'x':
+            return chr(self._parseHex(pos + 1, 2)), pos + 3
+        if char == 'u':
+            if text.startswith('{', pos + 1):
+                end = text.find('}', pos + 2)
+                if end < 0:
+                    raise JsLiteralError('转义序列未结束', pos)
+                return chr(self._parseHex(pos + 2, end - pos - 2)), end + 1
+            code = self._parseHex(pos + 1, 4)
+            pos += 5
+            # 代理对合并为一个字符
+            if 0xD800 <= code <= 0xDBFF and text.startswith('\\u', pos):
+                low = self._parseHex(pos + 2, 4)
+                if 0xDC00 <= low <= 0xDFFF:
+                    return chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)), pos + 6
+            return chr(code), pos
+        if char == '\r':
+            # 续行
+            return '', pos + 2 if text.startswith('\n', pos + 1) else pos + 1
+        if char == '\n':
+            return '', pos + 1
+        return char, pos + 1
+
+    def _parseHex(self, pos, count):
+        """
+        解析十六进制数字
+
+        Args:
+            pos (int): 起始位置
+            count (int): 位数
+
+        Returns:
+            int: 数值
+        """
+        try:
+            return int(self.text[pos:pos + count], 16)
+        except ValueError:
+            raise JsLiteralError('无效的十六进制转义', pos)
+
+    def _expect(self, pos, char):
+        """
+        跳过空白后要求出现指定字符
+
+        Args:
+            pos (int): 起始位置
+            char (str): 期望的字符
+
+        Returns:
+            int: 该字符之后的位置
+        """
+        pos = self.skipWhitespace(pos)
+        if not self.text.startswith(char, pos):
+            raise JsLiteralError(f'缺少 {char!r}', pos)
+        return pos + 1
+
+    def _toNumber(self, literal):
+        """
+        将数字字面量转换为 int 或 float
+
+        Args:
+            literal (str): 数字字面量
+
+        Returns:
+            int or float: 数值
+        """
+        body = literal.lstrip('+-')
+        sign = -1 if literal.startswith('-') else 1
+        if body[:2] in ('0x', '0X'):
+            return sign * int(body, 16)
+        if '.' in body or 'e' in body or 'E' in body:
+            return float(literal)
+        return int(literal)
+
+
+def parseLiteral(text, pos=0):
+    """
+    从指定位置解析一个 JavaScript 字面量
+
+    Args:
+        text (str): 源代码
+        pos (int): 起始位置
+
+    Returns:
+        tuple: (值, 值之后的位置)
+    """
+    return JsLiteralParser(text).parseValue(pos)
+
+
+class LazyLiteralObject(Mapping):
+    """
+    延迟解析的对象字面量
+
+    创建时只扫描一遍顶层键并记录各个值的位置，某个键第一次被访问时才解析对应的值，
+    全部值解析完成后释放源代码。值无法解析的键按不存在处理（记录警告并从对象中移除），
+    需要区分解析失败时使用 load。
+    """
+
+    def __init__(self, text, pos=0):
+        """
+        初始化
+
+        Args:
+            text (str): 源代码
+            pos (int): 对象起始位置
+        """
+        self._parser = JsLiteralParser(text)
+        self._offsets, _ = self._parser.scanObjectKeys(pos)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        try:
+            return self.load(key)
+        except JsLiteralError as e:
+            from src.utils.logger import logger
+            logger().warn(f'设置字段 {key} 解析失败，已忽略: {e}')
+            with self._lock:
+                self._offsets.pop(key, None)
+                if self._parser is not None and len(self._values) == len(self._offsets):
+                    self._parser = None
+            raise KeyError(key) from e
+
+    def load(self, key):
+        """
+        解析并返回键对应的值
+
+        Args:
+            key (str): 键
+
+        Returns:
+            object: 值
+
+        Raises:
+            KeyError: 键不存在
+            JsLiteralError: 值无法解析
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        offset = self._offsets[key]
+        with self._lock:
+            if key not in self._values:
+                self._values[key], _ = self._parser.parseValue(offset)
+                if len(self._values) == len(self._offsets):
+                    self._parser = None
+            return self._values[key]
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def isLoaded(self, key):
+        """
+        检查键对应的值是否已解析
+
+        Args:
+            key (str): 键
+
+        Returns:
+            bool: 是否已解析
+        """
+        return key in self._values
+
+    def __repr__(self):
+        loaded = ', '.join(repr(key) for key in self._values)
+        return f'<LazyLiteralObject keys={list(self._offsets)!r} loaded=[{loaded}]>'
+
+
+def findSettingsLiteral(text):
+    """
+    查找 window._CCSettings / window.CCSettings 赋值语句中字面量的起始位置
+
+    Args:
+        text (str): settings.js 内容
+
+    Returns:
+        int: 字面量起始位置，未找到时返回 -1
+    """
+    match = SETTINGS_ASSIGNMENT_RE.search(text)
+    return match.end() if match else -1
+
+
+def parseSettingsLiteral(text):
+    """
+    解析 settings.js 中的 CCSettings 对象
+
+    Args:
+        text (str): settings.js 内容
+
+    Returns:
+        dict: 设置对象，未找到赋值语句时返回 None
+    """
+    pos = findSettingsLiteral(text)
+    if pos < 0:
+        return None
+    value, _ = parseLiteral(text, pos)
+    if not isinstance(value, dict):
+        raise JsLiteralError('CCSettings 不是对象', pos)
+    return value
+
+
+def parseSettingsLazily(text):
+    """
+    延迟解析 settings.js 中的 CCSettings 对象，各个字段在首次访问时才解析
+
+    Args:
+        text (str): settings.js 内容
+
+    Returns:
+        LazyLiteralObject: 设置对象，未找到赋值语句时返回 None
+    """
+    pos = findSettingsLiteral(text)
+    if pos < 0:
+        return None
+    return LazyLiteralObject(text, pos)
@@ -1,48 +1,277 @@
 #!/usr/bin/env python3
 """
 日志工具
+
+日志先按级别过滤，低于当前级别的调用直接返回；通过过滤的记录放入队列，
+由后台线程输出到终端，并可同时写入 JSON Lines 日志文件。
+终端输出使用的 rich 在第一次输出时才导入，不影响命令行的启动速度。
 """
 
-from rich.console import Console
-from rich.theme import Theme
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+
+# 日志级别
+DEBUG = 10
+INFO = 20
+SUCCESS = 25
+WARN = 30
+ERROR = 40
+
+# 级别名称（同时是终端主题中的样式名）
+LEVEL_NAMES = {
+    DEBUG: "debug",
+    INFO: "info",
+    SUCCESS: "success",
+    WARN: "warn",
+    ERROR: "error"
+}
 
 # 自定义主题
-custom_theme = Theme({
+custom_theme = {
     "info": "cyan",
     "error": "bold red",
     "success": "bold green",
     "warn": "yellow",
     "debug": "magenta"
-})
+}
 
-console = Console(theme=custom_theme)
+_console = None
+_console_lock = threading.Lock()
+
+def getConsole():
+    """
+    获取终端输出对象（第一次调用时创建）
+    
+    Returns:
+        Console: rich 终端输出对象
+    """
+    global _console
+    if _console is None:
+        with _console_lock:
+            if _console is None:
+                from rich.console import Console
+                from rich.theme import Theme
+                _console = Console(theme=Theme(custom_theme))
+    return _console
 
 class Logger:
     """日志类"""
-    
+
+    def __init__(self):
+        """初始化"""
+        self.level = INFO
+        self._queue = None
+        self._thread = None
+        self._log_file = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def configure(self, verbose=False, silent=False, log_file=None):
+        """
+        配置日志级别和输出
+
+        Args:
+            verbose (bool): 显示调试日志
+            silent (bool): 静默模式，只显示警告和错误
+            log_file (str): JSON Lines 日志文件路径（可选）
+        """
+        self.flush()
+        if verbose:
+            self.level = DEBUG
+        elif silent:
+            self.level = WARN
+        else:
+            self.level = INFO
+
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            if log_file:
+                log_dir = os.path.dirname(log_file)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                self._log_file = open(log_file, 'a', encoding='utf-8')
+
+        # 开始处理前创建终端输出对象，避免进程池 fork 时后台线程正在导入 rich
+        getConsole()
+        self._startThread()
+
+    def isEnabledFor(self, level):
+        """
+        检查级别是否会被输出，热路径上先检查再拼接消息
+
+        Args:
+            level (int): 日志级别
+
+        Returns:
+            bool: 是否输出
+        """
+        return level >= self.level
+
     def info(self, message):
         """信息日志"""
-        console.print(f"[info]{message}[/info]")
-    
+        if INFO >= self.level:
+            self._emit(INFO, message)
+
     def error(self, message):
         """错误日志"""
-        console.print(f"[error]{message}[/error]")
-    
+        if ERROR >= self.level:
+            self._emit(ERROR, message)
+
     def success(self, message):
         """成功日志"""
-        console.print(f"[success]{message}[/success]")
-    
+        if SUCCESS >= self.level:
+            self._emit(SUCCESS, message)
+
     def warn(self, message):
         """警告日志"""
-        console.print(f"[warn]{message}[/warn]")
-    
+        if WARN >= self.level:
+            self._emit(WARN, message)
+
     def debug(self, message):
         """调试日志"""
-        console.print(f"[debug]{message}[/debug]")
+        if DEBUG >= self.level:
+            self._emit(DEBUG, message)
+
+    def addListener(self, listener):
+        """
+        添加日志监听函数，每条输出的记录都会以 listener(级别, 消息) 调用（在调用日志方法的线程中）
+
+        Args:
+            listener (callable): 监听函数
+        """
+        self._listeners = self._listeners + [listener]
+
+    def removeListener(self, listener):
+        """
+        移除日志监听函数
+
+        Args:
+            listener (callable): 监听函数
+        """
+        self._listeners = [item for item in self._listeners if item is not listener]
+
+    def flush(self):
+        """
+        等待队列中的日志全部输出
+        """
+        if self._queue is not None and self._isOwner():
+            self._queue.join()
+        if self._log_file is not None:
+            with self._lock:
+                self._log_file.flush()
+
+    def close(self):
+        """
+        输出剩余日志，停止后台线程并关闭日志文件
+        """
+        if self._thread is not None and self._isOwner():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+        self._queue = None
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+    def _afterFork(self):
+        """
+        fork 出的子进程中重建锁（父进程中其他线程可能正持有该锁）
+        """
+        global _console_lock
+        self._lock = threading.Lock()
+        _console_lock = threading.Lock()
+
+    def _startThread(self):
+        """
+        启动后台输出线程
+        """
+        if self._thread is not None and self._thread.is_alive() and self._isOwner():
+            return
+        self._pid = os.getpid()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='cc-reverse-logger', daemon=True)
+        self._thread.start()
+
+    def _isOwner(self):
+        """
+        检查当前进程是否为启动后台线程的进程（fork 出的子进程中没有该线程）
+
+        Returns:
+            bool: 是否为同一进程
+        """
+        return self._pid == os.getpid()
+
+    def _emit(self, level, message):
+        """
+        提交一条日志记录
+
+        Args:
+            level (int): 日志级别
+            message (str): 日志消息
+        """
+        record = (level, str(message), time.time())
+        for listener in self._listeners:
+            listener(level, record[1])
+        if self._thread is not None and self._isOwner():
+            self._queue.put(record)
+        else:
+            # 未启动后台线程或位于子进程中时直接输出
+            self._write(record)
+
+    def _run(self):
+        """
+        后台线程：依次输出队列中的日志记录
+        """
+        log_queue = self._queue
+        while True:
+            record = log_queue.get()
+            try:
+                if record is None:
+                    return
+                self._write(record)
+            except Exception:
+                pass
+            finally:
+                log_queue.task_done()
+
+    def _write(self, record):
+        """
+        输出一条日志记录到终端和日志文件
+
+        Args:
+            record (tuple): (级别, 消息, 时间戳)
+        """
+        level, message, timestamp = record
+        name = LEVEL_NAMES.get(level, "info")
+        getConsole().print(message, style=name, markup=False, highlight=False)
+
+        if self._log_file is not None:
+            line = json.dumps({
+                "time": time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp)) + f'.{int(timestamp * 1000) % 1000:03d}',
+                "level": name,
+                "pid": os.getpid(),
+                "message": message
+            }, ensure_ascii=False)
+            with self._lock:
+                if self._log_file is not None:
+                    self._log_file.write(line + '\n')
 
 # 创建全局日志实例
 logger_instance = Logger()
 
+# 退出前输出剩余日志
+atexit.register(logger_instance.close)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=logger_instance._afterFork)
+
 def logger():
     """获取日志实例"""
     return logger_instance
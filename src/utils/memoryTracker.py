@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+内存跟踪
+
+按流水线阶段记录主进程的峰值 RSS，开启 --memory-profile 时同时用 tracemalloc
+记录每个阶段新增内存最多的代码位置。设置 --memory-budget 后，预算按主进程和全部子孙进程
+（包括 forkserver 派生的进程池工作进程）的 RSS 之和计算：接近预算时各阶段切换到低内存策略
+（串行处理、更少的进程、不生成 AST 位置信息），达到预算的 ABORT_RATIO 时在下一个检查点中止
+并输出报告，在真正超出预算之前停止。
+"""
+
+import os
+import re
+import sys
+import time
+import threading
+from src.utils.metrics import metrics
+
+# 采样间隔（秒）
+SAMPLE_INTERVAL = 0.1
+
+# 达到预算的该比例时切换到低内存策略
+LOW_MEMORY_RATIO = 0.75
+
+# 达到预算的该比例时中止（为检查点之间的增长留出余量）
+ABORT_RATIO = 0.9
+
+# 重新查找子孙进程的间隔（秒），两次查找之间只读取已知进程的 RSS
+CHILDREN_REFRESH_INTERVAL = 1.0
+
+# 低内存策略下进程池的进程数
+LOW_MEMORY_PROCESS_WORKERS = 1
+
+# 每个阶段报告的分配位置数
+TOP_ALLOCATIONS = 5
+
+# 大小单位
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+class MemoryBudgetError(Exception):
+    """内存超出预算"""
+
+
+def parseSize(value):
+    """
+    解析大小，支持 512M、2G、1.5GB、1048576 等写法
+
+    Args:
+        value (str or int): 大小
+
+    Returns:
+        int: 字节数
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*', str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f'无效的大小: {value}')
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def formatSize(size):
+    """
+    格式化字节数
+
+    Args:
+        size (int): 字节数
+
+    Returns:
+        str: 如 123.4 MB
+    """
+    return f'{size / 1024 / 1024:.1f} MB'
+
+
+def getCurrentRss():
+    """
+    获取当前进程的常驻内存
+
+    Returns:
+        int: 字节数，无法获取时返回 0
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+    return getPeakRss()
+
+
+def getProcessRss(pid):
+    """
+    获取指定进程的常驻内存
+
+    Args:
+        pid (int): 进程号
+
+    Returns:
+        int: 字节数，进程已退出或无法获取时返回 0
+    """
+    try:
+        with open(f'/proc/{pid}/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return 0
+
+
+def getDescendantPids():
+    """
+    获取当前进程的全部子孙进程（进程池工作进程由 forkserver 派生，是当前进程的孙进程）
+
+    Returns:
+        list: 进程号列表，无法获取时返回空列表
+    """
+    try:
+        names = os.listdir('/proc')
+    except OSError:
+        try:
+            import psutil
+            return [child.pid for child in psutil.Process().children(recursive=True)]
+        except Exception:
+            return []
+
+    children = {}
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'rb') as f:
+                stat = f.read()
+            # 进程名可能包含空格和括号，父进程号是最后一个 ')' 之后的第二个字段
+            ppid = int(stat[stat.rindex(b')') + 2:].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    pids = []
+    pending = [os.getpid()]
+    while pending:
+        for pid in children.get(pending.pop(), ()):
+            pids.append(pid)
+            pending.append(pid)
+    return pids
+
+
+def getPeakRss(children=False):
+    """
+    获取进程生命周期内的峰值常驻内存
+
+    Args:
+        children (bool): 为True时返回已结束子进程中的最大值
+
+    Returns:
+        int: 字节数，无法获取时返回 0
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # macOS 以字节为单位，Linux 以 KB 为单位
+    return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+
+class MemoryTracker:
+    """内存跟踪类"""
+
+    def __init__(self):
+        """初始化"""
+        self.profile = False
+        self.budget = 0
+        self.low_memory = False
+        self.exceeded = False
+        self.stages = []
+        self._current = None
+        self._children = []
+        self._children_time = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._snapshot = None
+
+    def start(self, profile=False, budget=None):
+        """
+        开始跟踪（未开启分析也未设置预算时不做任何事）
+
+        Args:
+            profile (bool): 是否用 tracemalloc 记录分配位置
+            budget (str or int): 内存预算，如 2G（可选）
+        """
+        self.stop()
+        self.profile = profile
+        self.budget = parseSize(budget) if budget else 0
+        self.low_memory = False
+        self.exceeded = False
+        self.stages = []
+        self._current = None
+        self._children = []
+        self._children_time = 0
+        if not self.isActive():
+            return
+
+        if profile:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='cc-reverse-memory', daemon=True)
+        self._thread.start()
+
+    def isActive(self):
+        """
+        是否开启了跟踪
+
+        Returns:
+            bool: 开启了分析或设置了预算
+        """
+        return self.profile or self.budget > 0
+
+    def beginStage(self, name):
+        """
+        结束上一个阶段并开始新阶段；检查内存预算
+
+        Args:
+            name (str): 阶段名称
+        """
+        if not self.isActive():
+            return
+        self._finishStage()
+        rss = getCurrentRss()
+        with self._lock:
+            self._current = {
+                'stage': name,
+                'start_rss': rss,
+                'peak_rss': rss,
+                'start_time': time.time(),
+                'top_allocations': []
+            }
+        if self.profile:
+            import tracemalloc
+            self._snapshot = tracemalloc.take_snapshot()
+        self._checkRss(rss)
+        self.checkBudget()
+
+    def checkBudget(self):
+        """
+        超出预算时中止
+
+        Raises:
+            MemoryBudgetError: 内存超出预算，异常消息中包含报告
+        """
+        if self.exceeded:
+            self._finishStage()
+            raise MemoryBudgetError(
+                f'内存（含子进程）已达到预算 {formatSize(self.budget)} 的 {ABORT_RATIO:.0%}，已中止\n{self.formatReport()}'
+            )
+
+    def processWorkers(self):
+        """
+        获取进程池的进程数
+
+        Returns:
+            int: 低内存策略下返回限制的进程数，否则返回None（使用默认值）
+        """
+        return LOW_MEMORY_PROCESS_WORKERS if self.low_memory else None
+
+    def stop(self):
+        """
+        结束当前阶段并停止跟踪
+
+        Returns:
+            list: 各阶段的内存记录
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self._finishStage()
+        if self.profile:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._snapshot = None
+        return self.stages
+
+    def formatReport(self):
+        """
+        生成各阶段的内存报告
+
+        Returns:
+            str: 报告文本
+        """
+        lines = ['阶段内存报告（主进程 RSS）:']
+        for stage in self.stages:
+            lines.append(
+                f'  {stage["stage"]}: 峰值 {formatSize(stage["peak_rss"])}，'
+                f'增长 {formatSize(stage["peak_rss"] - stage["start_rss"])}，'
+                f'耗时 {stage["seconds"]:.1f} 秒'
+            )
+            for allocation in stage['top_allocations']:
+                lines.append(f'    +{formatSize(allocation["size"])} {allocation["location"]}')
+        children_peak = getPeakRss(children=True)
+        if children_peak:
+            lines.append(f'  子进程峰值: {formatSize(children_peak)}')
+        if self.low_memory:
+            lines.append('  已切换到低内存策略')
+        return '\n'.join(lines)
+
+    def _finishStage(self):
+        """
+        结束当前阶段，记录峰值和分配位置
+        """
+        with self._lock:
+            stage, self._current = self._current, None
+        if stage is None:
+            return
+        stage['peak_rss'] = max(stage['peak_rss'], getCurrentRss())
+        stage['seconds'] = time.time() - stage.pop('start_time')
+        if self.profile and self._snapshot is not None:
+            import tracemalloc
+            stats = tracemalloc.take_snapshot().compare_to(self._snapshot, 'lineno')
+            stage['top_allocations'] = [
+                {'location': str(stat.traceback), 'size': stat.size_diff}
+                for stat in stats[:TOP_ALLOCATIONS] if stat.size_diff > 0
+            ]
+            self._snapshot = None
+        self.stages.append(stage)
+
+    def _checkRss(self, rss):
+        """
+        根据主进程和子孙进程的 RSS 之和更新低内存和超预算状态
+
+        Args:
+            rss (int): 主进程当前 RSS
+        """
+        if not self.budget:
+            return
+        total = rss + self._childrenRss()
+        if not self.low_memory and total >= self.budget * LOW_MEMORY_RATIO:
+            from src.utils.logger import logger
+            self.low_memory = True
+            logger().warn(f'内存已用 {formatSize(total)}（含子进程），接近预算 {formatSize(self.budget)}，切换到低内存策略')
+        if total >= self.budget * ABORT_RATIO:
+            self.exceeded = True
+
+    def _childrenRss(self):
+        """
+        获取子孙进程的 RSS 之和（每 CHILDREN_REFRESH_INTERVAL 秒重新查找一次子孙进程）
+
+        Returns:
+            int: 字节数
+        """
+        now = time.time()
+        if now - self._children_time >= CHILDREN_REFRESH_INTERVAL:
+            self._children = getDescendantPids()
+            self._children_time = now
+        return sum(getProcessRss(pid) for pid in self._children)
+
+    def _run(self):
+        """
+        后台线程：定期采样 RSS
+        """
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            rss = getCurrentRss()
+            with self._lock:
+                if self._current is not None and rss > self._current['peak_rss']:
+                    self._current['peak_rss'] = rss
+            self._checkRss(rss)
+
+
+# 创建全局实例
+memoryTracker = MemoryTracker()
+
+metrics.gauge('memory_rss_bytes', '主进程当前常驻内存', func=getCurrentRss)
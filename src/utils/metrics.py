@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+运行指标
+
+计数器、仪表和直方图由各阶段在热路径上更新（每次更新只是一次加锁的加法），
+后台线程定期导出为 Prometheus 文本文件或 JSON 快照，并刷新终端上的进度行。
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+
+# 导出间隔（秒）
+EXPORT_INTERVAL = 5.0
+
+# 进度刷新间隔（秒）
+PROGRESS_INTERVAL = 1.0
+
+# 默认的耗时直方图分桶（秒）
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# 指标名前缀
+METRIC_PREFIX = 'cc_reverse_'
+
+
+class Counter:
+    """计数器，只增不减"""
+
+    __slots__ = ('name', 'help', 'value', '_lock')
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        """增加计数"""
+        with self._lock:
+            self.value += amount
+
+    def get(self):
+        """获取当前值"""
+        return self.value
+
+    def reset(self):
+        """清零"""
+        with self._lock:
+            self.value = 0
+
+
+class Gauge:
+    """仪表，可以设置为任意值，也可以在导出时通过回调取值"""
+
+    __slots__ = ('name', 'help', 'value', 'func', '_lock')
+
+    def __init__(self, name, help_text, func=None):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.func = func
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        """设置值"""
+        self.value = value
+
+    def inc(self, amount=1):
+        """增加"""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        """减少"""
+        with self._lock:
+            self.value -= amount
+
+    def get(self):
+        """获取当前值，回调出错时返回 0"""
+        if self.func is not None:
+            try:
+                return self.func()
+            except Exception:
+                return 0
+        return self.value
+
+    def reset(self):
+        """清零"""
+        self.value = 0
+
+
+class Histogram:
+    """直方图，记录观测值的分布"""
+
+    __slots__ = ('name', 'help', 'buckets', 'counts', 'count', 'sum', '_lock')
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """记录一个观测值"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def get(self):
+        """获取快照"""
+        with self._lock:
+            buckets = dict(zip(self.buckets, self.counts))
+            buckets['+Inf'] = self.counts[-1]
+            return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+    def reset(self):
+        """清零"""
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+
+
+class MetricsRegistry:
+    """指标注册表类"""
+
+    def __init__(self):
+        """初始化"""
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self.stage = ''
+        self.started_at = time.time()
+        self._thread = None
+        self._stop = threading.Event()
+        self._path = None
+        self._status = None
+
+    def counter(self, name, help_text=''):
+        """
+        获取或创建计数器
+
+        Args:
+            name (str): 指标名（不含前缀）
+            help_text (str): 说明
+
+        Returns:
+            Counter: 计数器
+        """
+        return self._register(name, Counter, help_text)
+
+    def gauge(self, name, help_text='', func=None):
+        """
+        获取或创建仪表
+
+        Args:
+            name (str): 指标名（不含前缀）
+            help_text (str): 说明
+            func (callable): 导出时调用的取值函数（可选）
+
+        Returns:
+            Gauge: 仪表
+        """
+        gauge = self._register(name, Gauge, help_text)
+        if func is not None:
+            gauge.func = func
+        return gauge
+
+    def histogram(self, name, help_text='', buckets=DEFAULT_BUCKETS):
+        """
+        获取或创建直方图
+
+        Args:
+            name (str): 指标名（不含前缀）
+            help_text (str): 说明
+            buckets (tuple): 分桶上界
+
+        Returns:
+            Histogram: 直方图
+        """
+        return self._register(name, Histogram, help_text, buckets)
+
+    def setStage(self, stage):
+        """
+        设置当前阶段（显示在进度行和快照中）
+
+        Args:
+            stage (str): 阶段名称
+        """
+        self.stage = stage
+
+    def reset(self):
+        """
+        清零全部指标并重新开始计时
+        """
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.reset()
+        self.stage = ''
+        self.started_at = time.time()
+
+    def snapshot(self):
+        """
+        获取全部指标的快照
+
+        Returns:
+            dict: 快照
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            'time': time.time(),
+            'elapsed': time.time() - self.started_at,
+            'stage': self.stage,
+            'metrics': {METRIC_PREFIX + metric.name: metric.get() for metric in metrics}
+        }
+
+    def toPrometheus(self):
+        """
+        导出为 Prometheus 文本格式
+
+        Returns:
+            str: 文本
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            name = METRIC_PREFIX + metric.name
+            if metric.help:
+                lines.append(f'# HELP {name} {metric.help}')
+            if isinstance(metric, Histogram):
+                lines.append(f'# TYPE {name} histogram')
+                data = metric.get()
+                cumulative = 0
+                for bound, count in data['buckets'].items():
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum {data["sum"]}')
+                lines.append(f'{name}_count {data["count"]}')
+            else:
+                lines.append(f'# TYPE {name} {"counter" if isinstance(metric, Counter) else "gauge"}')
+                lines.append(f'{name} {metric.get()}')
+        return '\n'.join(lines) + '\n'
+
+    def writeSnapshot(self, path):
+        """
+        写入快照文件，.json 结尾时写入 JSON，否则写入 Prometheus 文本文件
+        （先写临时文件再替换，读取方不会看到写了一半的文件）
+
+        Args:
+            path (str): 文件路径
+        """
+        if path.endswith('.json'):
+            content = json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+        else:
+            content = self.toPrometheus()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def startReporter(self, path=None, progress=True):
+        """
+        启动后台线程：定期导出快照并刷新进度行
+
+        Args:
+            path (str): 快照文件路径（可选）
+            progress (bool): 是否显示进度行
+        """
+        self.stopReporter()
+        self._path = path
+        if progress:
+            from src.utils.logger import getConsole
+            console = getConsole()
+            if console.is_terminal:
+                self._status = console.status(self._progressText())
+                self._status.start()
+        if not path and self._status is None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='cc-reverse-metrics', daemon=True)
+        self._thread.start()
+
+    def stopReporter(self):
+        """
+        停止后台线程，写入最后一次快照并移除进度行
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._status is not None:
+            self._status.stop()
+            self._status = None
+        if self._path:
+            try:
+                self.writeSnapshot(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+    def _register(self, name, metric_class, help_text, *args):
+        """
+        注册指标，同名指标只创建一次
+
+        Args:
+            name (str): 指标名
+            metric_class (type): 指标类
+            help_text (str): 说明
+
+        Returns:
+            object: 指标
+        """
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = metric_class(name, help_text, *args)
+                    self._metrics[name] = metric
+        return metric
+
+    def _run(self):
+        """
+        后台线程：按间隔刷新进度并导出快照
+        """
+        last_export = time.time()
+        last_time = time.time()
+        last_files = self.counter('files_written_total').get()
+        last_bytes = self.counter('bytes_written_total').get()
+        interval = PROGRESS_INTERVAL if self._status is not None else EXPORT_INTERVAL
+        while not self._stop.wait(interval):
+            now = time.time()
+            if self._status is not None:
+                files = self.counter('files_written_total').get()
+                written = self.counter('bytes_written_total').get()
+                elapsed = max(now - last_time, 1e-6)
+                self._status.update(self._progressText((files - last_files) / elapsed, (written - last_bytes) / elapsed))
+                last_time, last_files, last_bytes = now, files, written
+            if self._path and now - last_export >= EXPORT_INTERVAL:
+                try:
+                    self.writeSnapshot(self._path)
+                except OSError:
+                    pass
+                last_export = now
+
+    def _progressText(self, files_rate=0.0, bytes_rate=0.0):
+        """
+        生成进度行文本
+
+        Args:
+            files_rate (float): 每秒写入文件数
+            bytes_rate (float): 每秒写入字节数
+
+        Returns:
+            str: 进度文本
+        """
+        return (
+            f'{self.stage or "处理中"} | '
+            f'资源 {self.counter("resources_processed_total").get()} | '
+            f'写入 {self.counter("files_written_total").get()} 个文件 '
+            f'({files_rate:.0f} 个/秒, {bytes_rate / 1024 / 1024:.1f} MB/秒) | '
+            f'写入队列 {self.gauge("write_queue_depth").get()}'
+        )
+
+
+# 创建全局实例
+metrics = MetricsRegistry()
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+输出后端
+
+逆向生成的项目可以直接写入目录（默认），也可以流式写入 zip / tar 归档，
+避免先落盘十万个小文件再打包带来的双倍 I/O。归档先写入 <归档>.partial，成功完成后才替换为最终文件，
+失败或取消的运行不会留下看似完整的截断归档。
+"""
+
+import io
+import os
+import time
+import shutil
+import tarfile
+import zipfile
+import threading
+from src.utils.metrics import metrics
+
+# 支持的输出格式
+OUTPUT_FORMATS = ('dir', 'zip', 'tar', 'tar.gz', 'tar.zst')
+
+# 未完成归档的后缀
+PARTIAL_SUFFIX = '.partial'
+
+# 流式复制的块大小
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 已压缩的媒体格式，写入 zip 时不再压缩
+STORED_EXTENSIONS = frozenset([
+    '.png', '.jpg', '.jpeg', '.webp', '.gif', '.mp3', '.ogg', '.m4a', '.mp4', '.zip', '.gz'
+])
+
+
+class OutputBackend:
+    """输出后端基类，所有路径都是位于 root 之下的输出路径"""
+
+    def __init__(self, root):
+        """
+        初始化
+
+        Args:
+            root (str): 输出根目录
+        """
+        self.root = root
+        # 本次输出的全部文件路径
+        self.files = []
+
+    def writeFile(self, path, content):
+        """
+        写入文件
+
+        Args:
+            path (str): 输出路径
+            content (str or bytes): 文件内容
+        """
+        raise NotImplementedError
+
+    def writeFileIfChanged(self, path, content):
+        """
+        写入文件，内容未变化时跳过
+
+        Args:
+            path (str): 输出路径
+            content (str or bytes): 文件内容
+
+        Returns:
+            bool: 写入了新内容返回True，内容未变化返回False
+        """
+        self.writeFile(path, content)
+        return True
+
+    def copyFile(self, src, path):
+        """
+        复制文件
+
+        Args:
+            src (str): 源文件路径
+            path (str): 输出路径
+        """
+        raise NotImplementedError
+
+    def makedirs(self, path):
+        """
+        创建目录
+
+        Args:
+            path (str): 输出目录路径
+        """
+        raise NotImplementedError
+
+    def makedirsMany(self, paths):
+        """
+        批量创建目录
+
+        Args:
+            paths (iterable): 输出目录路径列表
+        """
+        for path in sorted(set(paths)):
+            self.makedirs(path)
+
+    def exists(self, path):
+        """
+        检查输出路径是否已写入
+
+        Args:
+            path (str): 输出路径
+
+        Returns:
+            bool: 是否存在
+        """
+        raise NotImplementedError
+
+    def removeFile(self, path):
+        """
+        删除已输出的文件（只有目录输出支持，归档是只追加的）
+
+        Args:
+            path (str): 输出路径
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        完成输出并释放资源
+        """
+
+    def abort(self):
+        """
+        放弃输出并释放资源（运行失败或取消时调用）
+        """
+
+    def describe(self):
+        """
+        获取输出位置的描述
+
+        Returns:
+            str: 输出位置
+        """
+        return self.root
+
+    def _arcname(self, path):
+        """
+        将输出路径转换为归档内的相对路径
+
+        Args:
+            path (str): 输出路径
+
+        Returns:
+            str: 归档内路径（使用 / 分隔）
+        """
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+
+class DirectoryBackend(OutputBackend):
+    """目录输出后端（默认）"""
+
+    def writeFile(self, path, content):
+        from src.utils.fileManager import fileManager
+        fileManager.writeFile(path, content)
+        self.files.append(path)
+
+    def writeFileIfChanged(self, path, content):
+        from src.utils.fileManager import fileManager
+        self.files.append(path)
+        return fileManager.writeFileIfChanged(path, content)
+
+    def copyFile(self, src, path):
+        from src.utils.fileManager import fileManager
+        fileManager.copyFile(src, path)
+        self.files.append(path)
+
+    def makedirs(self, path):
+        from src.utils.fileManager import fileManager
+        fileManager.ensureDirectory(path)
+
+    def makedirsMany(self, paths):
+        from src.utils.fileManager import fileManager
+        fileManager.ensureDirectories(paths)
+
+    def exists(self, path):
+        from src.utils.fileManager import fileManager
+        return fileManager.isPendingWrite(path) or os.path.exists(path)
+
+    def removeFile(self, path):
+        from src.utils.fileManager import fileManager
+        fileManager.deleteFile(path)
+
+
+class ArchiveBackend(OutputBackend):
+    """归档输出后端基类，所有写入通过锁串行化到同一个归档流"""
+
+    def __init__(self, root, archive_path):
+        """
+        初始化
+
+        Args:
+            root (str): 输出根目录（归档内路径相对于它计算）
+            archive_path (str): 归档文件路径
+        """
+        super().__init__(root)
+        self.archive_path = archive_path
+        self.partial_path = archive_path + PARTIAL_SUFFIX
+        self._closed = False
+        self._lock = threading.Lock()
+        self._names = set()
+        self._files_written = metrics.counter('files_written_total', '写入的文件数')
+        self._bytes_written = metrics.counter('bytes_written_total', '写入的字节数（文本按字符数计）')
+        archive_dir = os.path.dirname(archive_path)
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+
+    def writeFile(self, path, content):
+        data = content if isinstance(content, bytes) else content.encode('utf-8')
+        name = self._arcname(path)
+        with self._lock:
+            self._addParents(name)
+            self._writeBytes(name, data)
+            self._names.add(name)
+            self.files.append(path)
+        self._files_written.inc()
+        self._bytes_written.inc(len(data))
+
+    def copyFile(self, src, path):
+        name = self._arcname(path)
+        with self._lock:
+            self._addParents(name)
+            self._writeStream(name, src)
+            self._names.add(name)
+            self.files.append(path)
+        self._files_written.inc()
+        self._bytes_written.inc(os.path.getsize(src))
+
+    def makedirs(self, path):
+        name = self._arcname(path).rstrip('/')
+        if not name or name == '.':
+            return
+        with self._lock:
+            self._addParents(name + '/x')
+
+    def exists(self, path):
+        name = self._arcname(path).rstrip('/')
+        return name in self._names or name + '/' in self._names
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._closeArchive()
+            os.replace(self.partial_path, self.archive_path)
+
+    def abort(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._closeArchive()
+            except Exception:
+                pass
+            self._removePartial()
+
+    def describe(self):
+        return self.archive_path
+
+    def _removePartial(self):
+        """
+        删除未完成的归档文件
+        """
+        try:
+            os.remove(self.partial_path)
+        except FileNotFoundError:
+            pass
+
+    def _closeArchive(self):
+        """
+        写入归档结尾并关闭文件（调用方需持有锁）
+        """
+        raise NotImplementedError
+
+    def _addParents(self, name):
+        """
+        为归档内路径补齐上级目录条目（调用方需持有锁）
+
+        Args:
+            name (str): 归档内路径
+        """
+        parts = name.split('/')[:-1]
+        for i in range(1, len(parts) + 1):
+            dir_name = '/'.join(parts[:i]) + '/'
+            if dir_name not in self._names:
+                self._writeDirectory(dir_name)
+                self._names.add(dir_name)
+
+    def _writeBytes(self, name, data):
+        raise NotImplementedError
+
+    def _writeStream(self, name, src):
+        raise NotImplementedError
+
+    def _writeDirectory(self, name):
+        raise NotImplementedError
+
+
+class ZipBackend(ArchiveBackend):
+    """zip 归档输出后端"""
+
+    def __init__(self, root, archive_path):
+        super().__init__(root, archive_path)
+        self._zip = zipfile.ZipFile(self.partial_path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    def _compressType(self, name):
+        ext = os.path.splitext(name)[1].lower()
+        return zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+    def _writeBytes(self, name, data):
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.compress_type = self._compressType(name)
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, data)
+
+    def _writeStream(self, name, src):
+        info = zipfile.ZipInfo.from_file(src, name)
+        info.compress_type = self._compressType(name)
+        with open(src, 'rb') as fsrc, self._zip.open(info, 'w', force_zip64=True) as fdst:
+            shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE)
+
+    def _writeDirectory(self, name):
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.external_attr = (0o40755 << 16) | 0x10
+        self._zip.writestr(info, b'')
+
+    def _closeArchive(self):
+        self._zip.close()
+
+
+class TarBackend(ArchiveBackend):
+    """tar 归档输出后端，支持 gzip 和 zstd 压缩"""
+
+    def __init__(self, root, archive_path, compression=''):
+        """
+        初始化
+
+        Args:
+            root (str): 输出根目录
+            archive_path (str): 归档文件路径
+            compression (str): 压缩方式（''、'gz' 或 'zst'）
+        """
+        super().__init__(root, archive_path)
+        self._fileobj = None
+        self._writer = None
+        if compression == 'zst':
+            try:
+                import zstandard
+            except ImportError:
+                raise Exception('输出 tar.zst 需要安装 zstandard: pip install zstandard')
+        try:
+            if compression == 'zst':
+                self._fileobj = open(self.partial_path, 'wb')
+                self._writer = zstandard.ZstdCompressor(threads=-1).stream_writer(self._fileobj)
+                self._tar = tarfile.open(fileobj=self._writer, mode='w|')
+            elif compression == 'gz':
+                self._tar = tarfile.open(self.partial_path, mode='w|gz')
+            else:
+                self._tar = tarfile.open(self.partial_path, mode='w|')
+        except BaseException:
+            # 打开失败时关闭已打开的文件并删除空的归档
+            if self._fileobj is not None:
+                self._fileobj.close()
+            self._removePartial()
+            raise
+
+    def _writeBytes(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def _writeStream(self, name, src):
+        info = self._tar.gettarinfo(src, arcname=name)
+        with open(src, 'rb') as fsrc:
+            self._tar.addfile(info, fsrc)
+
+    def _writeDirectory(self, name):
+        info = tarfile.TarInfo(name.rstrip('/'))
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+        info.mtime = int(time.time())
+        self._tar.addfile(info)
+
+    def _closeArchive(self):
+        try:
+            self._tar.close()
+            if self._writer is not None:
+                self._writer.close()
+        finally:
+            if self._fileobj is not None and not self._fileobj.closed:
+                self._fileobj.close()
+
+
+def getArchivePath(output_path, output_format):
+    """
+    获取归档文件路径，未带扩展名时自动补齐
+
+    Args:
+        output_path (str): 输出路径
+        output_format (str): 输出格式
+
+    Returns:
+        str: 归档文件路径
+    """
+    ext = '.' + output_format
+    return output_path if output_path.endswith(ext) else output_path + ext
+
+
+def createOutputBackend(output_path, output_format='dir'):
+    """
+    创建输出后端
+
+    Args:
+        output_path (str): 输出路径
+        output_format (str): 输出格式，见 OUTPUT_FORMATS
+
+    Returns:
+        OutputBackend: 输出后端
+    """
+    output_format = output_format or 'dir'
+    if output_format not in OUTPUT_FORMATS:
+        raise Exception(f'不支持的输出格式: {output_format}，可选: {", ".join(OUTPUT_FORMATS)}')
+
+    if output_format == 'dir':
+        return DirectoryBackend(output_path)
+
+    archive_path = getArchivePath(output_path, output_format)
+    if output_format == 'zip':
+        return ZipBackend(output_path, archive_path)
+    return TarBackend(output_path, archive_path, output_format.split('.', 1)[1] if '.' in output_format else '')
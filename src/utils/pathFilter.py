@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+路径过滤器
+
+按 include/exclude 通配符筛选文件。模式中含 / 时匹配相对路径（/ 分隔，* 可以跨越目录），
+否则只匹配文件名。指定了 include 时只保留匹配任一 include 的文件；exclude 优先于 include。
+"""
+
+import os
+import re
+import fnmatch
+
+
+class PathFilter:
+    """路径过滤器类"""
+
+    def __init__(self, include=(), exclude=()):
+        """
+        初始化
+
+        Args:
+            include (list): 包含模式列表，为空时包含全部文件
+            exclude (list): 排除模式列表
+        """
+        self.include = [self._compile(pattern) for pattern in include or ()]
+        self.exclude = [self._compile(pattern) for pattern in exclude or ()]
+
+    def isEmpty(self):
+        """
+        是否没有任何模式（全部文件都通过）
+
+        Returns:
+            bool: 没有模式返回True
+        """
+        return not self.include and not self.exclude
+
+    def matches(self, rel_path):
+        """
+        检查文件是否通过过滤
+
+        Args:
+            rel_path (str): 相对路径
+
+        Returns:
+            bool: 通过返回True
+        """
+        if self.isEmpty():
+            return True
+        path = rel_path.replace(os.sep, '/')
+        name = path.rsplit('/', 1)[-1]
+        if any(self._match(rule, path, name) for rule in self.exclude):
+            return False
+        return not self.include or any(self._match(rule, path, name) for rule in self.include)
+
+    def _compile(self, pattern):
+        """
+        预编译模式
+
+        Args:
+            pattern (str): 通配符模式
+
+        Returns:
+            tuple: (是否匹配完整路径, 正则对象)
+        """
+        pattern = pattern.replace('\\', '/')
+        if pattern.startswith('./'):
+            pattern = pattern[2:]
+        return '/' in pattern, re.compile(fnmatch.translate(pattern))
+
+    def _match(self, rule, path, name):
+        """
+        用单个模式匹配
+
+        Args:
+            rule (tuple): 预编译的模式
+            path (str): / 分隔的相对路径
+            name (str): 文件名
+
+        Returns:
+            bool: 是否匹配
+        """
+        full_path, regex = rule
+        return regex.match(path if full_path else name) is not None
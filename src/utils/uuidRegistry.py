@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+UUID 驻留表
+"""
+
+import binascii
+import threading
+from collections import OrderedDict
+from src.utils.uuidUtils import BASE64_STRICT_DELETE, HEX_STRICT_DELETE
+
+# 默认转换缓存容量
+DEFAULT_CACHE_SIZE = 65536
+
+# 默认驻留表容量：运行开始时超过该数量则清空（同一次运行中整数 ID 必须保持稳定，不能逐项淘汰）
+DEFAULT_MAX_INTERNED = 262144
+
+
+class UuidRegistry:
+    """
+    UUID 驻留表
+
+    将 22 位、23 位和标准格式的 UUID 映射为同一个整数 ID，并支持反向转换。
+    任意格式字符串到 ID 的转换结果保存在有界的 LRU 缓存中，
+    重复转换只需一次字典查找，比较 UUID 时只需比较整数。
+    全部表都在 self._lock 内读写，可以在共享线程池中并发调用。
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, max_interned=DEFAULT_MAX_INTERNED):
+        """
+        初始化
+
+        Args:
+            cache_size (int): 转换缓存容量
+            max_interned (int): 驻留表容量（见 trim）
+        """
+        self._lock = threading.Lock()
+        self._cache_size = cache_size
+        self._max_interned = max_interned
+        self._cache = OrderedDict()  # 任意格式字符串 -> ID
+        self._ids = {}  # 32 位十六进制 -> ID
+        self._hex = []  # ID -> 32 位十六进制
+        self._short = []  # ID -> 22 位格式（按需生成）
+        self._long = []  # ID -> 23 位格式（按需生成）
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, uuid_str):
+        """
+        获取 UUID 对应的整数 ID，不存在时登记
+
+        Args:
+            uuid_str (str): 任意格式的 UUID
+
+        Returns:
+            int: UUID 的整数 ID，无法识别时返回 None
+        """
+        with self._lock:
+            uuid_id = self._cache.get(uuid_str)
+            if uuid_id is not None:
+                self._cache.move_to_end(uuid_str)
+                self.hits += 1
+                return uuid_id
+            self.misses += 1
+
+        hex_str = self._toHex(uuid_str)
+        if hex_str is None:
+            return None
+
+        with self._lock:
+            uuid_id = self._register(hex_str)
+            self._remember(uuid_str, uuid_id)
+            return uuid_id
+
+    def internMany(self, uuid_list):
+        """
+        批量获取 UUID 对应的整数 ID
+
+        Args:
+            uuid_list (iterable): 任意格式的 UUID 序列
+
+        Returns:
+            list: 整数 ID 列表，无法识别的项为 None
+        """
+        return [self.intern(uuid_str) for uuid_str in uuid_list]
+
+    def toCanonical(self, uuid_str):
+        """
+        转换为标准 UUID 格式
+
+        Args:
+            uuid_str (str or int): 任意格式的 UUID 或整数 ID
+
+        Returns:
+            str: 标准格式的 UUID，无法识别时返回 None
+        """
+        uuid_id = self._resolve(uuid_str)
+        if uuid_id is None:
+            return None
+        with self._lock:
+            h = self._hex[uuid_id]
+        return h[:8] + '-' + h[8:12] + '-' + h[12:16] + '-' + h[16:20] + '-' + h[20:]
+
+    def toShort(self, uuid_str):
+        """
+        转换为 22 位压缩格式
+
+        Args:
+            uuid_str (str or int): 任意格式的 UUID 或整数 ID
+
+        Returns:
+            str: 22 位 UUID，无法识别时返回 None
+        """
+        uuid_id = self._resolve(uuid_str)
+        if uuid_id is None:
+            return None
+        with self._lock:
+            short = self._short[uuid_id]
+            if short is None:
+                h = self._hex[uuid_id]
+                short = h[:2] + binascii.b2a_base64(bytes.fromhex(h[2:]), newline=False).decode('ascii')
+                self._short[uuid_id] = short
+        return short
+
+    def toLong(self, uuid_str):
+        """
+        转换为 23 位压缩格式
+
+        Args:
+            uuid_str (str or int): 任意格式的 UUID 或整数 ID
+
+        Returns:
+            str: 23 位 UUID，无法识别时返回 None
+        """
+        uuid_id = self._resolve(uuid_str)
+        if uuid_id is None:
+            return None
+        with self._lock:
+            long_uuid = self._long[uuid_id]
+            if long_uuid is None:
+                h = self._hex[uuid_id]
+                # 27 位十六进制补一位后按字节编码，取前 18 个字符
+                encoded = binascii.b2a_base64(bytes.fromhex(h[5:] + '0'), newline=False).decode('ascii')
+                long_uuid = h[:5] + encoded[:18]
+                self._long[uuid_id] = long_uuid
+        return long_uuid
+
+    def hitRate(self):
+        """
+        获取转换缓存命中率
+
+        Returns:
+            float: 命中率（0~1）
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def getStats(self):
+        """
+        获取统计信息
+
+        Returns:
+            dict: 统计信息
+        """
+        return {
+            'interned': len(self._hex),
+            'cached': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': self.hitRate()
+        }
+
+    def clear(self):
+        """
+        清空驻留表和缓存
+        """
+        with self._lock:
+            self._clear()
+
+    def trim(self):
+        """
+        驻留表超过容量时清空（在运行开始时调用，已发出的整数 ID 随之失效；
+        常驻的后台服务在任务之间保留驻留表，由此限制其大小）
+
+        Returns:
+            bool: 已清空返回True
+        """
+        with self._lock:
+            if len(self._hex) <= self._max_interned:
+                return False
+            self._clear()
+            return True
+
+    def _clear(self):
+        """
+        清空驻留表和缓存（调用方需持有锁）
+        """
+        self._cache.clear()
+        self._ids.clear()
+        self._hex.clear()
+        self._short.clear()
+        self._long.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _resolve(self, uuid_str):
+        """
+        将 UUID 或整数 ID 解析为整数 ID
+
+        Args:
+            uuid_str (str or int): 任意格式的 UUID 或整数 ID
+
+        Returns:
+            int: 整数 ID
+        """
+        if isinstance(uuid_str, int):
+            return uuid_str if 0 <= uuid_str < len(self._hex) else None
+        return self.intern(uuid_str)
+
+    def _register(self, hex_str):
+        """
+        登记 32 位十六进制 UUID（调用方需持有锁）
+
+        Args:
+            hex_str (str): 32 位十六进制 UUID
+
+        Returns:
+            int: 整数 ID
+        """
+        uuid_id = self._ids.get(hex_str)
+        if uuid_id is None:
+            uuid_id = len(self._hex)
+            self._ids[hex_str] = uuid_id
+            self._hex.append(hex_str)
+            self._short.append(None)
+            self._long.append(None)
+        return uuid_id
+
+    def _remember(self, uuid_str, uuid_id):
+        """
+        写入转换缓存并淘汰最久未使用的项（调用方需持有锁）
+
+        Args:
+            uuid_str (str): 任意格式的 UUID
+            uuid_id (int): 整数 ID
+        """
+        self._cache[uuid_str] = uuid_id
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _toHex(self, uuid_str):
+        """
+        将任意格式的 UUID 转换为 32 位十六进制
+
+        Args:
+            uuid_str (str): 任意格式的 UUID
+
+        Returns:
+            str: 32 位十六进制，无法识别时返回 None
+        """
+        if not isinstance(uuid_str, str):
+            return None
+
+        length = len(uuid_str)
+        try:
+            if length == 36 or length == 32:
+                h = uuid_str.replace('-', '').lower()
+                if len(h) == 32 and not h.translate(HEX_STRICT_DELETE):
+                    return h
+            elif length == 22:
+                header = uuid_str[:2].lower()
+                tail = uuid_str[2:]
+                if not header.translate(HEX_STRICT_DELETE) and not tail.translate(BASE64_STRICT_DELETE):
+                    return header + binascii.a2b_base64(tail).hex()
+            elif length == 23:
+                header = uuid_str[:5].lower()
+                tail = uuid_str[5:]
+                if not header.translate(HEX_STRICT_DELETE) and not tail.translate(BASE64_STRICT_DELETE):
+                    # 18 个字符补齐到 4 的倍数后解码，只取前 27 位十六进制
+                    return header + binascii.a2b_base64(tail + 'AA').hex()[:27]
+        except (binascii.Error, ValueError):
+            return None
+        return None
+
+
+# 创建全局实例
+uuidRegistry = UuidRegistry()
@@ -5,6 +5,7 @@ UUID 工具类
 
 import random
 import base64
+import binascii
 import string
 from src.utils.logger import logger
 
@@ -26,6 +27,15 @@ _t = ['', '', '', '']
 UUID_TEMPLATE = _t + _t + ['-'] + _t + ['-'] + _t + ['-'] + _t + ['-'] + _t + _t + _t
 INDICES = [i for i, x in enumerate(UUID_TEMPLATE) if x != '-']
 
+# 批量转换用的翻译表
+# 合法 Base64 字符（不含填充符）的删除表，用于快速校验输入
+BASE64_STRICT_DELETE = {ord(c): None for c in BASE64_KEYS[:64]}
+# 十六进制字符的删除表
+HEX_STRICT_DELETE = {ord(c): None for c in '0123456789abcdef'}
+
+# 32 位十六进制 UUID 中每组三个字符的起始位置
+TRIPLE_OFFSETS = tuple(range(2, 32, 3))
+
 class UuidUtils:
     """UUID 工具类"""
     
@@ -67,8 +77,8 @@ class UuidUtils:
             uuid_template[0] = base64_str[0]
             uuid_template[1] = base64_str[1]
             
-            # 解码剩余字符
-            j = 0
+            # 解码剩余字符（前两个位置已被填充，从第三个位置开始）
+            j = 2
             for i in range(2, 22, 2):
                 lhs = BASE64_VALUES[ord(base64_str[i])]
                 rhs = BASE64_VALUES[ord(base64_str[i + 1])]
@@ -86,6 +96,93 @@ class UuidUtils:
             logger().error(f"解码 UUID 时出错: {e}")
             return base64_str  # 出错时返回原始值
     
+    def decodeMany(self, base64_list):
+        """
+        批量将 Base64 编码的 UUID 转换为标准 UUID 格式
+        结果与逐个调用 decodeUuid 完全一致：合法输入的 20 位 Base64 部分拼接后
+        一次性交给 binascii 解码，其余输入回退到标量路径
+        
+        Args:
+            base64_list (iterable): Base64 编码的 UUID 序列
+        
+        Returns:
+            list: 标准格式的 UUID 列表
+        """
+        items = list(base64_list)
+        result = [None] * len(items)
+        fast_index = []
+        for index, s in enumerate(items):
+            if isinstance(s, str) and len(s) == 22 and not s[2:].translate(BASE64_STRICT_DELETE):
+                fast_index.append(index)
+            else:
+                result[index] = self.decodeUuid(s)
+        
+        if fast_index:
+            # 每个 UUID 的后 20 位恰好对应 15 个字节，拼接后对齐不变
+            raw = binascii.a2b_base64(''.join([items[i][2:] for i in fast_index]))
+            hex_str = raw.hex()
+            for n, index in enumerate(fast_index):
+                s = items[index]
+                h = hex_str[n * 30:n * 30 + 30]
+                result[index] = s[:2] + h[:6] + '-' + h[6:10] + '-' + h[10:14] + '-' + h[14:18] + '-' + h[18:]
+        return result
+    
+    def compressUuid(self, uuid_str):
+        """
+        将标准 UUID 压缩为 22 位 Base64 格式（decodeUuid 的逆操作）
+        示例: fc991dd7-0033-4b80-9d41-c8a86a702e59 -> fcmR3XADNLgJ1ByKhqcC5Z
+        
+        Args:
+            uuid_str (str): 标准 UUID
+        
+        Returns:
+            str: 22 位 UUID，无法识别时返回原值
+        """
+        if not isinstance(uuid_str, str):
+            return uuid_str
+        
+        hex_str = uuid_str.replace('-', '').lower()
+        if len(hex_str) != 32 or hex_str.translate(HEX_STRICT_DELETE):
+            return uuid_str
+        
+        chars = [hex_str[0], hex_str[1]]
+        for i in TRIPLE_OFFSETS:
+            value = int(hex_str[i:i + 3], 16)
+            chars.append(BASE64_KEYS[value >> 6])
+            chars.append(BASE64_KEYS[value & 0x3F])
+        return ''.join(chars)
+    
+    def compressMany(self, uuid_list):
+        """
+        批量将标准 UUID 压缩为 22 位 Base64 格式
+        结果与逐个调用 compressUuid 完全一致：合法输入的后 30 位十六进制拼接后
+        一次性交给 binascii 编码，其余输入原样返回
+        
+        Args:
+            uuid_list (iterable): 标准 UUID 序列
+        
+        Returns:
+            list: 22 位 UUID 列表
+        """
+        items = list(uuid_list)
+        result = list(items)
+        fast_index = []
+        hex_parts = []
+        for index, s in enumerate(items):
+            if not isinstance(s, str):
+                continue
+            h = s.replace('-', '').lower()
+            if len(h) == 32 and not h.translate(HEX_STRICT_DELETE):
+                fast_index.append(index)
+                hex_parts.append(h)
+        
+        if fast_index:
+            # 每个 UUID 的后 30 位十六进制恰好对应 20 个 Base64 字符
+            encoded = binascii.b2a_base64(bytes.fromhex(''.join([h[2:] for h in hex_parts])), newline=False).decode('ascii')
+            for n, index in enumerate(fast_index):
+                result[index] = hex_parts[n][:2] + encoded[n * 20:n * 20 + 20]
+        return result
+    
     def compress_uuid(self, uuid_str):
         """
         压缩 UUID (23位)
@@ -97,6 +194,13 @@ class UuidUtils:
         Returns:
             str: 压缩后的 UUID
         """
+        # 标准格式的 UUID 直接走驻留表，重复转换只需一次缓存查找
+        if isinstance(uuid_str, str) and len(uuid_str) == 36:
+            from src.utils.uuidRegistry import uuidRegistry
+            result = uuidRegistry.toLong(uuid_str)
+            if result is not None:
+                return result
+        
         try:
             # 分离 UUID 前缀和内容
             header = uuid_str[:5]
@@ -152,6 +256,13 @@ class UuidUtils:
         Returns:
             str: 22位 UUID
         """
+        # 合法的 23 位 UUID 直接走驻留表
+        if isinstance(uuid_str, str) and len(uuid_str) == 23:
+            from src.utils.uuidRegistry import uuidRegistry
+            result = uuidRegistry.toShort(uuid_str)
+            if result is not None:
+                return result
+        
         try:
             # 转换成长的 UUID
             header = uuid_str[:5]
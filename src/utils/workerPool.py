@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+共享工作线程池，以及 CPU 密集任务使用的进程池
+
+进程池不使用 fork：创建进程池时后台写入、指标上报和内存采样线程都在运行，fork 出的子进程可能继承
+处于加锁状态的锁。工作进程由单线程的 forkserver 派生（不支持时使用 spawn），进程池任务只依赖参数。
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 默认线程数（与 ThreadPoolExecutor 的默认值一致，适合 I/O 密集任务）
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# 进程池的启动方式，按优先顺序
+PROCESS_START_METHODS = ('forkserver', 'spawn')
+
+# forkserver 预先导入的模块（包含进程池任务），工作进程不必各自导入
+PRELOAD_MODULES = [
+    'src.core.resourceProcessor',
+    'src.core.converters',
+    'src.core.spriteExtractor',
+    'src.core.pngOptimizer'
+]
+
+_process_context = None
+_context_lock = threading.Lock()
+
+
+def getProcessContext():
+    """
+    获取进程池使用的 multiprocessing 上下文（首次调用时创建）
+
+    Returns:
+        BaseContext: forkserver 上下文，不支持时为 spawn 上下文
+    """
+    global _process_context
+    import multiprocessing
+
+    with _context_lock:
+        if _process_context is None:
+            methods = multiprocessing.get_all_start_methods()
+            method = next(method for method in PROCESS_START_METHODS if method in methods)
+            _process_context = multiprocessing.get_context(method)
+            if method == 'forkserver':
+                _process_context.set_forkserver_preload(PRELOAD_MODULES)
+        return _process_context
+
+
+def processCount():
+    """
+    获取进程池的进程数
+
+    Returns:
+        int: 低内存策略下为限制的进程数，否则为 CPU 数
+    """
+    from src.utils.memoryTracker import memoryTracker
+    return memoryTracker.processWorkers() or os.cpu_count() or 1
+
+
+def createProcessPool(max_workers=None):
+    """
+    创建进程池（进程数不超过 processCount()）
+
+    Args:
+        max_workers (int): 最大进程数（可选）
+
+    Returns:
+        ProcessPoolExecutor: 进程池
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    workers = min(max_workers, processCount()) if max_workers else processCount()
+    return ProcessPoolExecutor(max_workers=workers, mp_context=getProcessContext())
+
+
+class WorkerPool:
+    """
+    共享工作线程池
+
+    资源复制、脚本写入和 meta 生成等 I/O 密集任务共用同一个线程池，
+    避免各阶段各自创建线程。
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        """
+        初始化
+
+        Args:
+            max_workers (int): 最大线程数
+        """
+        self._lock = threading.Lock()
+        self._executor = None
+        self.max_workers = max_workers
+
+    def getExecutor(self):
+        """
+        获取线程池（按需创建）
+
+        Returns:
+            ThreadPoolExecutor: 线程池
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='cc-reverse')
+            return self._executor
+
+    def map(self, func, items):
+        """
+        在线程池中并发执行任务，按输入顺序返回结果
+        任一任务抛出的异常会在此处重新抛出
+
+        Args:
+            func (callable): 任务函数
+            items (iterable): 任务参数序列，每项为参数元组
+
+        Returns:
+            list: 任务结果列表
+        """
+        from src.utils.memoryTracker import memoryTracker
+        
+        items = list(items)
+        if not items:
+            return []
+        if memoryTracker.low_memory:
+            # 低内存策略：串行执行，并在每个任务之间检查内存预算
+            results = []
+            for args in items:
+                memoryTracker.checkBudget()
+                results.append(func(*args))
+            return results
+        if len(items) == 1 or self.max_workers <= 1:
+            return [func(*args) for args in items]
+        return list(self.getExecutor().map(lambda args: func(*args), items))
+
+    def shutdown(self):
+        """
+        关闭线程池
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# 创建全局实例
+workerPool = WorkerPool()